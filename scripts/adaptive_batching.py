@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Adaptive HEC Batch Sizing for SOC Project
+AIMD controller that tunes forwarder batch size and concurrency from observed latency and errors
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Any
+
+# Status passed to record() when the request never got an HTTP response
+CONNECTION_ERROR = 0
+
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease tuning for the HEC forwarder
+
+    Batch size grows by a fixed step after every fast, successful request
+    and is cut by decrease_factor when a request is slower than
+    target_latency, times out, or is rejected as too large (413).
+    Concurrency grows by one after a full window of healthy requests and
+    is cut when the error rate over the window exceeds max_error_rate.
+    After any cut, further cuts wait until roughly one round of in-flight
+    requests has completed, so a single overload event is not punished
+    once per outstanding request.
+    """
+
+    def __init__(self,
+                 min_batch_events: int = 50,
+                 max_batch_events: int = 5000,
+                 min_batch_bytes: int = 64 * 1024,
+                 max_batch_bytes: int = 5 * 1024 * 1024,
+                 min_concurrency: int = 1,
+                 max_concurrency: int = 8,
+                 target_latency: float = 2.0,
+                 event_step: int = 50,
+                 byte_step: int = 64 * 1024,
+                 decrease_factor: float = 0.5,
+                 window: int = 20,
+                 max_error_rate: float = 0.05):
+        """
+        Initialize AIMD controller
+
+        Args:
+            min_batch_events: Lower bound for events per batch
+            max_batch_events: Upper bound for events per batch
+            min_batch_bytes: Lower bound for bytes per batch
+            max_batch_bytes: Upper bound for bytes per batch
+            min_concurrency: Lower bound for concurrent requests
+            max_concurrency: Upper bound for concurrent requests
+            target_latency: Round-trip seconds above which batches shrink
+            event_step: Events added to the batch size after a healthy request
+            byte_step: Bytes added to the batch size after a healthy request
+            decrease_factor: Multiplier applied on a decrease
+            window: Requests per error-rate window
+            max_error_rate: Error rate that triggers a concurrency decrease
+        """
+        self.min_batch_events = min_batch_events
+        self.max_batch_events = max_batch_events
+        self.min_batch_bytes = min_batch_bytes
+        self.max_batch_bytes = max_batch_bytes
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.event_step = event_step
+        self.byte_step = byte_step
+        self.decrease_factor = decrease_factor
+        self.window = window
+        self.max_error_rate = max_error_rate
+
+        self.batch_events = min_batch_events
+        self.batch_bytes = min_batch_bytes
+        self.concurrency = min_concurrency
+
+        self._cond = threading.Condition()
+        self._active = 0
+        self._outcomes: deque = deque(maxlen=window)
+        self._healthy_streak = 0
+        self._since_decrease = 0
+        self._decreases = 0
+        self._increases = 0
+
+    def limits(self):
+        """
+        Get the current batch limits
+
+        Returns:
+            (batch_events, batch_bytes) tuple
+        """
+        with self._cond:
+            return self.batch_events, self.batch_bytes
+
+    def acquire(self):
+        """Wait for a free request slot under the current concurrency limit"""
+        with self._cond:
+            while self._active >= self.concurrency:
+                self._cond.wait()
+            self._active += 1
+
+    def release(self):
+        """Return a request slot"""
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def record(self, latency: float, payload_bytes: int, status: int):
+        """
+        Feed one request outcome into the controller
+
+        Args:
+            latency: Round-trip time in seconds
+            payload_bytes: Uncompressed size of the batch sent
+            status: HTTP status code, or CONNECTION_ERROR
+        """
+        with self._cond:
+            ok = status == 200
+            self._outcomes.append(ok)
+            self._since_decrease += 1
+            can_decrease = self._since_decrease >= self.concurrency
+
+            if status == 413:
+                # Shrink below the size that was just refused
+                if can_decrease:
+                    self.batch_bytes = max(self.min_batch_bytes, int(payload_bytes * self.decrease_factor))
+                    self._shrink_events()
+                    self._mark_decrease()
+                return
+
+            if not ok or latency > self.target_latency:
+                self._healthy_streak = 0
+                if can_decrease:
+                    decreased = False
+                    if latency > self.target_latency or status == CONNECTION_ERROR:
+                        self.batch_bytes = max(self.min_batch_bytes, int(self.batch_bytes * self.decrease_factor))
+                        self._shrink_events()
+                        decreased = True
+                    if self._error_rate() > self.max_error_rate:
+                        self.concurrency = max(self.min_concurrency, int(self.concurrency * self.decrease_factor))
+                        self._outcomes.clear()
+                        decreased = True
+                    # An isolated error below max_error_rate cuts nothing and
+                    # must not hold back the next real cut
+                    if decreased:
+                        self._mark_decrease()
+                return
+
+            self.batch_events = min(self.max_batch_events, self.batch_events + self.event_step)
+            self.batch_bytes = min(self.max_batch_bytes, self.batch_bytes + self.byte_step)
+            self._healthy_streak += 1
+            if self._healthy_streak >= self.window and self._error_rate() <= self.max_error_rate:
+                if self.concurrency < self.max_concurrency:
+                    self.concurrency += 1
+                    self._increases += 1
+                    self._cond.notify_all()
+                self._healthy_streak = 0
+
+    def _shrink_events(self):
+        self.batch_events = max(self.min_batch_events, int(self.batch_events * self.decrease_factor))
+
+    def _mark_decrease(self):
+        self._since_decrease = 0
+        self._decreases += 1
+
+    def _error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot the controller state
+
+        Returns:
+            Metrics dictionary
+        """
+        with self._cond:
+            return {
+                "batch_events": self.batch_events,
+                "batch_bytes": self.batch_bytes,
+                "concurrency": self.concurrency,
+                "active_requests": self._active,
+                "error_rate": round(self._error_rate(), 3),
+                "decreases_total": self._decreases,
+                "concurrency_increases_total": self._increases
+            }
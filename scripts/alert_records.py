@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Alert and Incident Records for SOC Project
+Compact records that normalize alert fields once where alerts enter the pipeline
+"""
+
+from typing import Dict, Any, Optional
+
+DEFAULT_SUMMARY = "Security Alert Detected"
+DEFAULT_DESCRIPTION = "A security alert was triggered by the SOC monitoring system."
+
+# Record field -> alert keys it is read from, first non-empty wins
+FIELD_ALIASES = {
+    "source_ip": ("src_ip", "source_ip"),
+    "affected_user": ("user", "affected_user")
+}
+
+
+def first_value(data: Dict[str, Any], keys) -> Any:
+    """Return the first non-empty value among several keys"""
+    for key in keys:
+        value = data.get(key)
+        if value:
+            return value
+    return None
+
+
+class Alert:
+    """
+    Security alert as received from Splunk or Wazuh
+
+    `raw` is the original alert dictionary (not a copy), kept for keyword
+    matching and the ticket comment; everything the pipeline reads is an
+    attribute.
+    """
+
+    __slots__ = ("summary", "description", "source_ip", "affected_user", "host", "search_name", "raw")
+
+    def __init__(self,
+                 summary: str = DEFAULT_SUMMARY,
+                 description: str = DEFAULT_DESCRIPTION,
+                 source_ip: Optional[str] = None,
+                 affected_user: Optional[str] = None,
+                 host: Optional[str] = None,
+                 search_name: Optional[str] = None,
+                 raw: Optional[Dict[str, Any]] = None):
+        self.summary = summary
+        self.description = description
+        self.source_ip = source_ip
+        self.affected_user = affected_user
+        self.host = host
+        self.search_name = search_name
+        self.raw = raw if raw is not None else {}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Alert":
+        """
+        Normalize a parsed alert dictionary
+
+        Args:
+            data: Alert fields (e.g., from the Splunk alert action's stdin)
+
+        Returns:
+            Alert record
+        """
+        return cls(summary=data.get("summary") or DEFAULT_SUMMARY,
+                   description=data.get("description") or DEFAULT_DESCRIPTION,
+                   source_ip=first_value(data, FIELD_ALIASES["source_ip"]),
+                   affected_user=first_value(data, FIELD_ALIASES["affected_user"]),
+                   host=data.get("host"),
+                   search_name=data.get("search_name"),
+                   raw=data)
+
+    def __repr__(self) -> str:
+        return f"Alert(summary={self.summary!r}, source_ip={self.source_ip!r}, affected_user={self.affected_user!r})"
+
+
+class Incident:
+    """
+    Security incident ticketed in Jira
+
+    `key` is set once the Jira issue exists; `spooled` is set if Jira was
+    unavailable and the issue waits in the local spool instead.
+    `enrichment` holds GeoIP/ASN fields of the source IP, if looked up.
+    """
+
+    __slots__ = ("summary", "description", "severity", "mitre_technique", "source_ip", "affected_user", "key",
+                 "spooled", "enrichment")
+
+    def __init__(self,
+                 summary: str,
+                 description: str,
+                 severity: str = "Medium",
+                 mitre_technique: Optional[str] = None,
+                 source_ip: Optional[str] = None,
+                 affected_user: Optional[str] = None,
+                 key: Optional[str] = None):
+        self.summary = summary
+        self.description = description
+        self.severity = severity
+        self.mitre_technique = mitre_technique
+        self.source_ip = source_ip
+        self.affected_user = affected_user
+        self.key = key
+        self.spooled = False
+        self.enrichment: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_alert(cls, alert: Alert, severity: str = "Medium", mitre_technique: Optional[str] = None) -> "Incident":
+        """
+        Build the incident for an alert
+
+        Args:
+            alert: Normalized alert
+            severity: Incident severity
+            mitre_technique: MITRE ATT&CK technique ID
+
+        Returns:
+            Incident record (not yet created in Jira)
+        """
+        return cls(alert.summary, alert.description, severity, mitre_technique,
+                   alert.source_ip, alert.affected_user)
+
+    def __repr__(self) -> str:
+        return f"Incident(key={self.key!r}, summary={self.summary!r}, severity={self.severity!r})"
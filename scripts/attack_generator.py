@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Synthetic Attack Event Generator for SOC Project
+Generates MITRE-labelled attack and baseline log events as NDJSON files or HEC batches for load and rule testing
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from multiprocessing import get_context
+from typing import Dict, Any, Callable, Optional, Tuple
+
+# Event kinds: name -> (MITRE technique, tactic, sourcetype)
+ATTACKS = {
+    "ssh_bruteforce": ("T1110", "Credential Access", "linux_secure"),
+    "cloud_auth_failure": ("T1110", "Credential Access", "aws:cloudtrail"),
+    "privilege_escalation": ("T1068", "Privilege Escalation", "linux_secure"),
+    "credential_dumping": ("T1003", "Credential Access", "XmlWinEventLog:Microsoft-Windows-Sysmon/Operational"),
+    "lateral_movement": ("T1021", "Lateral Movement", "WinEventLog:Security"),
+    "benign": (None, None, "linux_secure")
+}
+
+DEFAULT_MIX = "ssh_bruteforce=30,cloud_auth_failure=15,privilege_escalation=5,credential_dumping=3,lateral_movement=7,benign=40"
+
+DUMPING_TOOLS = ["C:\\Windows\\Temp\\procdump64.exe", "C:\\Users\\Public\\mimikatz.exe",
+                 "C:\\Windows\\System32\\rundll32.exe"]
+PRIVESC_COMMANDS = ["/bin/bash", "/usr/bin/python3 -c 'import pty;pty.spawn(\"/bin/sh\")'",
+                    "/usr/bin/find . -exec /bin/sh \\;", "/usr/bin/vim -c ':!/bin/sh'"]
+AWS_REGIONS = ["us-east-1", "us-west-2", "eu-west-1", "ap-southeast-2"]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parse an attack mix such as "ssh_bruteforce=30,benign=70"
+
+    Args:
+        mix: Comma-separated kind=weight pairs
+
+    Returns:
+        Kind -> weight
+    """
+    weights = {}
+    for part in mix.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ATTACKS:
+            raise ValueError(f"Unknown event kind: {name} (expected one of {', '.join(ATTACKS)})")
+        weights[name] = float(weight or 1)
+    if not weights or sum(weights.values()) <= 0:
+        raise ValueError("Attack mix has no positive weights")
+    return weights
+
+
+class EventGenerator:
+    """
+    Builds events for one worker
+
+    Entity pools are drawn once, so the configured cardinalities bound the
+    distinct source IPs, users and hosts seen by detections. Attackers come
+    from a small slice of the IP pool so brute force and lateral movement
+    concentrate on repeat offenders, as they do in real traffic.
+    """
+
+    def __init__(self,
+                 mix: Dict[str, float],
+                 ips: int = 5000,
+                 users: int = 500,
+                 hosts: int = 200,
+                 attacker_fraction: float = 0.02,
+                 seed: int = 0):
+        """
+        Initialize event generator
+
+        Args:
+            mix: Event kind -> weight
+            ips: Distinct source IPs
+            users: Distinct user names
+            hosts: Distinct hosts
+            attacker_fraction: Share of the IP pool acting as attackers
+            seed: Random seed (worker number is added by the caller)
+        """
+        self.random = random.Random(seed)
+        pool_random = random.Random(1)  # identical entity pools in every worker
+        self.ips = [f"{pool_random.choice([10, 172, 192, 45, 185, 203])}.{pool_random.randrange(256)}."
+                    f"{pool_random.randrange(256)}.{pool_random.randrange(1, 255)}" for _ in range(ips)]
+        self.attacker_ips = self.ips[:max(1, int(ips * attacker_fraction))]
+        self.users = ["root", "admin", "administrator"] + [f"user{number:05d}" for number in range(max(0, users - 3))]
+        self.hosts = [f"srv-{number:04d}" for number in range(hosts)]
+
+        self.kinds = list(mix)
+        self.builders: Dict[str, Callable[[float], Dict[str, Any]]] = {
+            "ssh_bruteforce": self._ssh_bruteforce,
+            "cloud_auth_failure": self._cloud_auth_failure,
+            "privilege_escalation": self._privilege_escalation,
+            "credential_dumping": self._credential_dumping,
+            "lateral_movement": self._lateral_movement,
+            "benign": self._benign
+        }
+        total = sum(mix.values())
+        cumulative, running = [], 0.0
+        for kind in self.kinds:
+            running += mix[kind] / total
+            cumulative.append(running)
+        self.cumulative = cumulative
+
+    def event(self, now: float) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build one event
+
+        Args:
+            now: Event time in epoch seconds
+
+        Returns:
+            (kind, event)
+        """
+        kind = self.random.choices(self.kinds, cum_weights=self.cumulative)[0]
+        event = self.builders[kind](now)
+        technique, tactic, _sourcetype = ATTACKS[kind]
+        if technique:
+            event["mitre_technique"] = technique
+            event["mitre_tactic"] = tactic
+        return kind, event
+
+    def _ssh_bruteforce(self, now: float) -> Dict[str, Any]:
+        src_ip, user, host = self.random.choice(self.attacker_ips), self.random.choice(self.users), self.random.choice(self.hosts)
+        return {"_time": now, "host": host, "event_type": "authentication_failure", "src_ip": src_ip, "user": user,
+                "app": "sshd", "message": f"sshd[{self.random.randrange(1000, 65000)}]: authentication failure; "
+                                          f"Failed password for {user} from {src_ip} port {self.random.randrange(1024, 65535)} ssh2"}
+
+    def _cloud_auth_failure(self, now: float) -> Dict[str, Any]:
+        src_ip, user = self.random.choice(self.attacker_ips), self.random.choice(self.users)
+        return {"_time": now, "eventSource": "signin.amazonaws.com", "eventName": "ConsoleLogin",
+                "awsRegion": self.random.choice(AWS_REGIONS), "sourceIPAddress": src_ip,
+                "userIdentity": {"type": "IAMUser", "userName": user},
+                "responseElements": {"ConsoleLogin": "Failure"}, "errorMessage": "Failed authentication",
+                "event_type": "authentication_failure", "src_ip": src_ip, "user": user,
+                "message": f"login failed for {user} from {src_ip}"}
+
+    def _privilege_escalation(self, now: float) -> Dict[str, Any]:
+        user, host = self.random.choice(self.users[3:] or self.users), self.random.choice(self.hosts)
+        command = self.random.choice(PRIVESC_COMMANDS)
+        return {"_time": now, "host": host, "event_type": "privilege_escalation", "user": user, "app": "sudo",
+                "message": f"sudo: {user} : TTY=pts/{self.random.randrange(8)} ; PWD=/tmp ; USER=root ; COMMAND={command}"}
+
+    def _credential_dumping(self, now: float) -> Dict[str, Any]:
+        host, user = self.random.choice(self.hosts), self.random.choice(self.users)
+        return {"_time": now, "host": host, "EventCode": 10, "event_type": "credential_dump", "user": user,
+                "SourceImage": self.random.choice(DUMPING_TOOLS),
+                "TargetImage": "C:\\Windows\\System32\\lsass.exe", "GrantedAccess": "0x1010",
+                "message": "Process accessed lsass.exe memory, possible credential dump"}
+
+    def _lateral_movement(self, now: float) -> Dict[str, Any]:
+        src_ip, user = self.random.choice(self.attacker_ips), self.random.choice(self.users)
+        source_host, dest_host = self.random.sample(self.hosts, 2) if len(self.hosts) > 1 else (self.hosts[0],) * 2
+        return {"_time": now, "host": dest_host, "EventCode": 4624, "Logon_Type": self.random.choice([3, 10]),
+                "event_type": "remote_logon", "src_ip": src_ip, "src_host": source_host, "user": user,
+                "message": f"An account was successfully logged on from {source_host} ({src_ip}), lateral movement candidate"}
+
+    def _benign(self, now: float) -> Dict[str, Any]:
+        src_ip, user, host = self.random.choice(self.ips), self.random.choice(self.users), self.random.choice(self.hosts)
+        return {"_time": now, "host": host, "event_type": "authentication_success", "src_ip": src_ip, "user": user,
+                "app": "sshd", "message": f"Accepted publickey for {user} from {src_ip} port {self.random.randrange(1024, 65535)} ssh2"}
+
+
+def to_hec(kind: str, event: Dict[str, Any], index: Optional[str]) -> Dict[str, Any]:
+    """Wrap an event in a HEC envelope with its labels as indexed fields"""
+    technique, _tactic, sourcetype = ATTACKS[kind]
+    envelope = {"time": event["_time"], "host": event.get("host", "generator"), "source": "attack_generator",
+                "sourcetype": sourcetype, "event": event,
+                "fields": {"event_type": event["event_type"], "attack_kind": kind}}
+    if technique:
+        envelope["fields"]["mitre_technique"] = technique
+    if index:
+        envelope["index"] = index
+    return envelope
+
+
+def worker_output_path(path: str, worker: int, workers: int) -> str:
+    """File written by one worker (events.ndjson -> events-3.ndjson when there are several)"""
+    if workers == 1:
+        return path
+    stem, extension = os.path.splitext(path)
+    return f"{stem}-{worker}{extension}"
+
+
+def run_worker(worker: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate this worker's share of events
+
+    Args:
+        worker: Worker number
+        options: Generator options from main()
+
+    Returns:
+        Counts per event kind, bytes written and elapsed seconds
+    """
+    workers = options["workers"]
+    count = options["count"] // workers + (1 if worker < options["count"] % workers else 0) if options["count"] else None
+    rate = options["rate"] / workers if options["rate"] else None
+    deadline = time.monotonic() + options["duration"] if options["duration"] else None
+    generator = EventGenerator(options["mix"], options["ips"], options["users"], options["hosts"],
+                               seed=options["seed"] + worker)
+
+    sender = None
+    handle = None
+    if options["hec_url"]:
+        from hec_forwarder import HECSender
+        sender = HECSender(options["hec_url"], options["hec_token"], verify=options["verify"], max_retries=5)
+    elif options["output"] == "-":
+        handle = sys.stdout
+    else:
+        handle = open(worker_output_path(options["output"], worker, workers), "w", encoding="utf-8")
+
+    counts = {kind: 0 for kind in ATTACKS}
+    produced = 0
+    written = 0
+    failed = 0
+    batch_size = options["batch_events"]
+    started = time.monotonic()
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    try:
+        while True:
+            size = batch_size if count is None else min(batch_size, count - produced)
+            if size <= 0 or (deadline is not None and time.monotonic() >= deadline):
+                break
+
+            now = time.time()
+            lines = []
+            for _ in range(size):
+                kind, event = generator.event(now)
+                counts[kind] += 1
+                lines.append(encode(to_hec(kind, event, options["index"]) if sender else event))
+            payload = "\n".join(lines) + "\n"
+            produced += size
+            written += len(payload)
+
+            if sender:
+                if not sender.send(payload.encode("utf-8")):
+                    failed += size
+            else:
+                handle.write(payload)
+
+            if rate:
+                # Pace to the per-worker rate; sleeping per batch keeps overhead low
+                ahead = produced / rate - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+    finally:
+        if handle is not None and handle is not sys.stdout:
+            handle.close()
+        elif handle is sys.stdout:
+            handle.flush()
+
+    return {"events": produced, "failed": failed, "bytes": written, "kinds": counts,
+            "seconds": time.monotonic() - started}
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Generate synthetic attack and baseline events')
+
+    parser.add_argument('--output', default='-', help='NDJSON output file, split per worker (- for stdout)')
+    parser.add_argument('--hec-url', help='Send to this Splunk HEC instead of writing NDJSON')
+    parser.add_argument('--hec-token', default=os.getenv("SPLUNK_HEC_TOKEN"), help='Splunk HEC token')
+    parser.add_argument('--index', help='Target Splunk index for HEC events')
+    parser.add_argument('--count', type=int, default=100000, help='Total events (0 to run until --duration)')
+    parser.add_argument('--duration', type=float, default=0, help='Stop after this many seconds (0 for no limit)')
+    parser.add_argument('--rate', type=float, default=0, help='Total events per second (0 for as fast as possible)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Generator processes')
+    parser.add_argument('--batch-events', type=int, default=1000, help='Events per write or HEC request')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Event kind weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--ips', type=int, default=5000, help='Distinct source IPs')
+    parser.add_argument('--users', type=int, default=500, help='Distinct users')
+    parser.add_argument('--hosts', type=int, default=200, help='Distinct hosts')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--insecure', action='store_true', help='Skip TLS certificate verification')
+
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    logging.basicConfig(level=logging.WARNING)
+    args = parse_arguments()
+
+    if not args.count and not args.duration:
+        print("Please set --count or --duration")
+        return 1
+    if args.hec_url and not args.hec_token:
+        print("Please set SPLUNK_HEC_TOKEN or pass --hec-token")
+        return 1
+    if not args.hec_url and args.output == "-" and args.workers > 1:
+        # Workers cannot share stdout without interleaving partial writes
+        args.workers = 1
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        return 1
+
+    options = {"mix": mix, "count": args.count, "duration": args.duration, "rate": args.rate,
+               "workers": max(1, args.workers), "batch_events": args.batch_events, "ips": args.ips,
+               "users": args.users, "hosts": args.hosts, "seed": args.seed, "output": args.output,
+               "hec_url": args.hec_url, "hec_token": args.hec_token, "index": args.index,
+               "verify": not args.insecure}
+
+    started = time.monotonic()
+    if options["workers"] == 1:
+        results = [run_worker(0, options)]
+    else:
+        with get_context("spawn").Pool(options["workers"]) as pool:
+            results = pool.starmap(run_worker, [(worker, options) for worker in range(options["workers"])])
+    elapsed = time.monotonic() - started
+
+    events = sum(result["events"] for result in results)
+    kinds: Dict[str, int] = {}
+    for result in results:
+        for kind, value in result["kinds"].items():
+            kinds[kind] = kinds.get(kind, 0) + value
+    summary = {"events": events, "failed": sum(result["failed"] for result in results),
+               "bytes": sum(result["bytes"] for result in results), "seconds": round(elapsed, 3),
+               "events_per_minute": round(events / elapsed * 60) if elapsed else 0,
+               "kinds": {kind: value for kind, value in kinds.items() if value}}
+    print(json.dumps(summary), file=sys.stderr)
+    return 0 if not summary["failed"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+JSON Backend Benchmark for SOC Project
+Compares encode/decode cost of the installed JSON backends on the payloads the pipeline handles
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import Dict, Any
+
+from json_codec import BACKEND, BACKENDS, load_codec
+from benchmark_ticketing import synthetic_alerts
+from fake_jira_server import jira_timestamp
+
+
+def sample_payloads() -> Dict[str, Any]:
+    """
+    Representative documents for each JSON hot spot
+
+    Returns:
+        Payload name -> document
+    """
+    alert = synthetic_alerts(1)[0]
+    issue_body = {"fields": {
+        "project": {"key": "SEC"},
+        "summary": alert["summary"],
+        "description": "Multiple failed SSH logins\n\n**Security Details:**\n- Severity: High\n" * 4,
+        "issuetype": {"name": "Security Incident"},
+        "priority": {"name": "High"},
+        "labels": ["soc-automated", "security-incident"],
+        "customfield_mitre_technique": "T1110"
+    }}
+    search_page = {"startAt": 0, "maxResults": 100, "total": 100, "issues": [
+        {"id": str(10000 + number), "key": f"SEC-{number}", "fields": {
+            "summary": f"{alert['summary']} {number}",
+            "status": {"name": "Open"}, "priority": {"name": "High"},
+            "labels": ["soc-automated", "security-incident"],
+            "created": jira_timestamp(1700000000 + number), "updated": jira_timestamp(1700000100 + number),
+            "customfield_mitre_technique": "T1110"}}
+        for number in range(100)]}
+    hec_event = {"time": 1700000000.123, "host": "srv-01", "source": "aws:cloudtrail",
+                 "sourcetype": "aws:cloudtrail", "index": "security",
+                 "event": {"eventName": "ConsoleLogin", "sourceIPAddress": alert["src_ip"],
+                           "userIdentity": {"type": "IAMUser", "userName": alert["user"]},
+                           "responseElements": {"ConsoleLogin": "Failure"}, "awsRegion": "us-east-1"}}
+    return {"splunk_alert": alert, "jira_issue_create": issue_body,
+            "jira_search_page": search_page, "hec_event": hec_event}
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Benchmark the installed JSON backends')
+
+    parser.add_argument('--backends', default=",".join(BACKENDS), help=f'Comma-separated backends ({", ".join(BACKENDS)})')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions per measurement (best is kept)')
+    parser.add_argument('--output', help='Write results JSON here (stdout if not set)')
+
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+    payloads = sample_payloads()
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "selected_backend": BACKEND,
+        "payloads": {}
+    }
+    for name in (backend.strip() for backend in args.backends.split(",") if backend.strip()):
+        try:
+            codec = load_codec(name)
+        except ImportError:
+            print(f"{name}: not installed, skipped", file=sys.stderr)
+            continue
+        for payload_name, payload in payloads.items():
+            encoded = codec.dumps(payload)
+            results = report["payloads"].setdefault(payload_name, {"bytes": len(encoded), "backends": {}})
+            timings = {}
+            for operation, call in (("dumps", lambda: codec.dumps(payload)),
+                                    ("loads", lambda: codec.loads(encoded))):
+                timer = timeit.Timer(call)
+                # autorange picks a loop count taking at least 0.2 s
+                number, _elapsed = timer.autorange()
+                best = min(timer.repeat(repeat=args.repeat, number=number)) / number
+                timings[f"{operation}_us"] = round(best * 1e6, 3)
+            results["backends"][name] = timings
+            print(f"{name} {payload_name}: dumps {timings['dumps_us']} us, loads {timings['loads_us']} us",
+                  file=sys.stderr)
+
+    # Speedup of each backend relative to stdlib json
+    for results in report["payloads"].values():
+        baseline = results["backends"].get("json")
+        if baseline:
+            for timings in results["backends"].values():
+                timings["speedup"] = {operation: round(baseline[f"{operation}_us"] / timings[f"{operation}_us"], 2)
+                                      for operation in ("dumps", "loads")}
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Alert Script Startup Benchmark for SOC Project
+Measures cold-start time of the alert scripts from source and from their zipapp bundles
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List
+
+from build_alert_bundles import BUNDLE_MODULES, ENTRY_POINTS, build_bundle
+
+SPLUNK_ACTION, WAZUH_ACTION = list(ENTRY_POINTS)
+
+ALERT = {"summary": "Brute Force Attack Detected", "description": "Multiple failed logins",
+         "src_ip": "10.0.0.5", "user": "admin"}
+
+
+def closed_port() -> int:
+    """Find a local port nothing listens on, so Jira calls fail immediately"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def time_runs(command: List[str], env: Dict[str, str], stdin: str, runs: int) -> Dict[str, Any]:
+    """
+    Run a command repeatedly and summarize its wall-clock time
+
+    Args:
+        command: Command line
+        env: Environment
+        stdin: Standard input for each run
+        runs: Number of runs (one extra warm-up run is discarded)
+
+    Returns:
+        Timing summary in milliseconds
+    """
+    samples = []
+    for run in range(runs + 1):
+        started = time.perf_counter()
+        subprocess.run(command, input=stdin, env=env, capture_output=True, text=True)
+        if run:
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {"runs": runs, "mean_ms": round(statistics.mean(samples), 2),
+            "p50_ms": round(samples[len(samples) // 2], 2),
+            "p90_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.9))], 2),
+            "min_ms": round(samples[0], 2)}
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Benchmark alert script cold start')
+
+    parser.add_argument('--runs', type=int, default=30, help='Runs per variant')
+    parser.add_argument('--output', help='Write results JSON here (stdout if not set)')
+
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+    workdir = tempfile.mkdtemp(prefix="startup-bench-")
+    splunk_bundle = os.path.join(workdir, "jira_alert_action.pyz")
+    wazuh_bundle = os.path.join(workdir, "jira_create_ticket.pyz")
+    build_bundle(SPLUNK_ACTION, splunk_bundle, BUNDLE_MODULES, sys.executable)
+    build_bundle(WAZUH_ACTION, wazuh_bundle, BUNDLE_MODULES, sys.executable)
+
+    # Every run imports the full Jira client and fails fast on a refused
+    # connection, so the timings are startup and import cost, not Jira
+    jira_url = f"http://127.0.0.1:{closed_port()}"
+    env = dict(os.environ)
+    env.update({"JIRA_URL": jira_url, "JIRA_USERNAME": "bench", "JIRA_API_TOKEN": "bench",
+                "JIRA_ALERT_ACTION_LOG": os.path.join(workdir, "splunk.log"),
+                "JIRA_ACTIVE_RESPONSE_LOG": os.path.join(workdir, "wazuh.log"),
+                "PYTHONPATH": os.path.dirname(os.path.abspath(__file__))})
+    wazuh_args = ["--jira-url", jira_url, "--username", "bench", "--api-token", "bench",
+                  "--summary", ALERT["summary"], "--description", ALERT["description"]]
+    alert = json.dumps(ALERT)
+
+    variants = {
+        "python-baseline": ([sys.executable, "-c", "pass"], ""),
+        "splunk-source": ([sys.executable, SPLUNK_ACTION], alert),
+        "splunk-bundle": ([sys.executable, splunk_bundle], alert),
+        "wazuh-source": ([sys.executable, WAZUH_ACTION] + wazuh_args, ""),
+        "wazuh-bundle": ([sys.executable, wazuh_bundle] + wazuh_args, "")
+    }
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "variants": {}
+    }
+    for name, (command, stdin) in variants.items():
+        result = time_runs(command, env, stdin, args.runs)
+        report["variants"][name] = result
+        print(f"{name}: p50 {result['p50_ms']} ms, mean {result['mean_ms']} ms", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Ticketing Benchmark for SOC Project
+Drives the alert scripts and JiraIntegration against a local fake Jira and records throughput, latency, CPU and memory
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SCRIPTS_DIR)
+SPLUNK_ACTION = os.path.join(REPO_DIR, "splunk", "bin", "jira_alert_action.py")
+WAZUH_ACTION = os.path.join(REPO_DIR, "wazuh", "bin", "jira_create_ticket.py")
+
+# Alert templates: (summary, description keywords, MITRE-bearing search name)
+ALERT_TEMPLATES = [
+    ("Brute Force Attack Detected", "Multiple failed SSH logins, possible brute force", "SSH Brute Force"),
+    ("Credential Dumping Detected", "lsass memory access consistent with credential dump", "Credential Dumping"),
+    ("Privilege Escalation Attempt", "sudo abuse indicating privilege escalation", "Privilege Escalation"),
+    ("Lateral Movement Observed", "SMB sessions to many hosts suggest lateral movement", "Lateral Movement"),
+    ("Unusual Login Location", "Suspicious login from an unusual country", "Impossible Travel"),
+    ("Informational Policy Notice", "Low severity info notice from audit policy", "Audit Notice")
+]
+
+# Severity the dispatch modes give each alert template
+TEMPLATE_SEVERITIES = {
+    "Brute Force Attack Detected": "High",
+    "Credential Dumping Detected": "Critical",
+    "Privilege Escalation Attempt": "High",
+    "Lateral Movement Observed": "High",
+    "Unusual Login Location": "Medium",
+    "Informational Policy Notice": "Low"
+}
+
+MODES = ["splunk-spawn", "wazuh-spawn", "splunk-resident", "client-sync", "client-concurrent",
+         "close-single", "close-bulk", "dispatch-fifo", "dispatch-priority"]
+
+USERNAME = "bench"
+API_TOKEN = "bench-token"
+
+
+def synthetic_alerts(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """
+    Build a repeatable stream of Splunk-style alert payloads
+
+    Args:
+        count: Number of alerts
+        seed: Random seed
+
+    Returns:
+        Alert dictionaries as the Splunk alert action receives them
+    """
+    rng = random.Random(seed)
+    alerts = []
+    for number in range(count):
+        summary, description, search_name = rng.choice(ALERT_TEMPLATES)
+        alerts.append({
+            "summary": f"{summary} #{number}",
+            "description": description,
+            "search_name": search_name,
+            "src_ip": f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+            "user": rng.choice(["admin", "root", "svc_backup", "jdoe", "asmith"]),
+            "host": f"srv-{rng.randrange(50):02d}",
+            "_time": time.time()
+        })
+    return alerts
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def start_fake_jira(latency: float, jitter: float, error_rate: float, rate_limit_rate: float) -> Tuple[subprocess.Popen, str]:
+    """
+    Run fake_jira_server.py in its own process so its CPU is not billed to the modes
+
+    Returns:
+        (process, base URL)
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-u", os.path.join(SCRIPTS_DIR, "fake_jira_server.py"), "--port", "0",
+         "--username", USERNAME, "--api-token", API_TOKEN, "--latency", str(latency), "--jitter", str(jitter),
+         "--error-rate", str(error_rate), "--rate-limit-rate", str(rate_limit_rate), "--seed", "1"],
+        stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline().strip()
+    return process, line.rsplit(" ", 1)[-1]
+
+
+def child_environment(jira_url: str, log_dir: str) -> Dict[str, str]:
+    """Environment for spawned alert scripts"""
+    env = dict(os.environ)
+    env.update({
+        "JIRA_URL": jira_url,
+        "JIRA_USERNAME": USERNAME,
+        "JIRA_API_TOKEN": API_TOKEN,
+        "JIRA_PROJECT_KEY": "SEC",
+        "JIRA_ALERT_ACTION_LOG": os.path.join(log_dir, "jira_alert_action.log"),
+        "JIRA_ACTIVE_RESPONSE_LOG": os.path.join(log_dir, "jira_active_response.log"),
+        "PYTHONPATH": SCRIPTS_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    })
+    return env
+
+
+def run_mode(mode: str, jira_url: str, alerts: List[Dict[str, Any]], concurrency: int) -> Dict[str, Any]:
+    """
+    Run one benchmark mode; called in a fresh process so CPU and memory are per mode
+
+    Args:
+        mode: One of MODES
+        jira_url: Fake Jira base URL
+        alerts: Alerts to ticket (or tickets to close for the close-* modes)
+        concurrency: Worker threads for client-concurrent, close-bulk and dispatch-*
+
+    Returns:
+        Mode results
+    """
+    logging.basicConfig(level=logging.WARNING)
+    sys.path.insert(0, SCRIPTS_DIR)
+    from alert_records import Alert, Incident
+    from jira_integration import JiraIntegration
+
+    log_dir = tempfile.mkdtemp(prefix="ticketing-bench-")
+    env = child_environment(jira_url, log_dir)
+    os.environ.update(env)
+    jira = JiraIntegration(jira_url, USERNAME, API_TOKEN, "SEC")
+    logging.getLogger("jira_integration").setLevel(logging.WARNING)
+
+    def timed(call: Callable[[], bool]) -> Tuple[bool, float]:
+        started = time.perf_counter()
+        try:
+            ok = bool(call())
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - started
+
+    def spawn(command: List[str], stdin: Optional[str] = None) -> bool:
+        completed = subprocess.run(command, input=stdin, env=env, capture_output=True, text=True)
+        return completed.returncode == 0 and "Jira ticket created" in completed.stdout
+
+    def create_with_comment(alert: Alert) -> bool:
+        issue_key = jira.create_incident(Incident.from_alert(alert, "High", "T1110"))
+        return bool(issue_key) and jira.add_comment(issue_key, json.dumps(alert.raw))
+
+    tasks: List[Callable[[], bool]] = []
+    bulk: Optional[Callable[[], Dict[str, Dict[str, Any]]]] = None
+    burst: List[Incident] = []
+
+    if mode == "splunk-spawn":
+        tasks = [lambda alert=alert: spawn([sys.executable, SPLUNK_ACTION], json.dumps(alert)) for alert in alerts]
+    elif mode == "wazuh-spawn":
+        tasks = [lambda alert=alert: spawn([sys.executable, WAZUH_ACTION,
+                                            "--jira-url", jira_url, "--username", USERNAME,
+                                            "--api-token", API_TOKEN, "--summary", alert["summary"],
+                                            "--description", alert["description"], "--severity", "High",
+                                            "--source-ip", alert["src_ip"], "--affected-user", alert["user"]])
+                 for alert in alerts]
+    elif mode == "splunk-resident":
+        sys.path.insert(0, os.path.dirname(SPLUNK_ACTION))
+        import jira_alert_action
+        tasks = [lambda alert=alert: jira_alert_action.create_jira_ticket(alert) for alert in alerts]
+    elif mode in ("client-sync", "client-concurrent"):
+        tasks = [lambda alert=Alert.from_dict(alert): create_with_comment(alert) for alert in alerts]
+    elif mode in ("close-single", "close-bulk"):
+        keys = [jira.create_security_incident(alert["summary"], alert["description"]) for alert in alerts]
+        keys = [key for key in keys if key]
+        if mode == "close-single":
+            tasks = [lambda key=key: jira.update_incident_status(key, "Resolved", "False positive") for key in keys]
+        else:
+            bulk = lambda: jira.update_incidents_status_bulk(keys, "Resolved", "False positive", concurrency)
+    elif mode in ("dispatch-fifo", "dispatch-priority"):
+        # The whole stream arrives at once; latency includes time queued
+        burst = [Incident.from_alert(Alert.from_dict(alert),
+                                     TEMPLATE_SEVERITIES.get(alert["summary"].rsplit(" #", 1)[0], "Medium"))
+                 for alert in alerts]
+    else:
+        raise ValueError(f"Unknown benchmark mode: {mode}")
+
+    cpu_before = time.process_time()
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    started = time.perf_counter()
+
+    by_severity: Dict[str, List[float]] = {}
+    if bulk is not None:
+        results = bulk()
+        outcomes = [(result["success"], result["seconds"]) for result in results.values()]
+    elif burst:
+        completed: List[Tuple[str, bool, float]] = []
+
+        def record(future, severity):
+            completed.append((severity, future.exception() is None and bool(future.result()),
+                              time.perf_counter() - started))
+
+        if mode == "dispatch-priority":
+            from incident_dispatcher import IncidentDispatcher
+            with IncidentDispatcher(jira, workers=concurrency) as dispatcher:
+                for incident in burst:
+                    dispatcher.submit(incident).add_done_callback(lambda future, severity=incident.severity:
+                                                                  record(future, severity))
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                for incident in burst:
+                    executor.submit(jira.create_incident, incident).add_done_callback(
+                        lambda future, severity=incident.severity: record(future, severity))
+        outcomes = [(ok, seconds) for _severity, ok, seconds in completed]
+        for severity, ok, seconds in completed:
+            if ok:
+                by_severity.setdefault(severity, []).append(seconds * 1000)
+    elif mode == "client-concurrent":
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(timed, tasks))
+    else:
+        outcomes = [timed(task) for task in tasks]
+
+    elapsed = time.perf_counter() - started
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = (time.process_time() - cpu_before
+           + children_after.ru_utime - children_before.ru_utime
+           + children_after.ru_stime - children_before.ru_stime)
+
+    latencies = [seconds * 1000 for ok, seconds in outcomes if ok]
+    spawned = mode.endswith("-spawn")
+    result = {
+        "alerts": len(outcomes),
+        "errors": sum(1 for ok, _seconds in outcomes if not ok),
+        "seconds": round(elapsed, 4),
+        "alerts_per_second": round(len(outcomes) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {"p50": round(percentile(latencies, 0.50), 2),
+                       "p99": round(percentile(latencies, 0.99), 2),
+                       "max": round(max(latencies, default=0.0), 2)},
+        "cpu_ms_per_alert": round(cpu * 1000 / len(outcomes), 3) if outcomes else 0.0,
+        # ru_maxrss is in KiB on Linux; for spawned modes it is the largest alert process
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN if spawned else resource.RUSAGE_SELF)
+                            .ru_maxrss / 1024, 1)
+    }
+    if by_severity:
+        result["latency_ms_by_severity"] = {severity: {"p50": round(percentile(values, 0.50), 2),
+                                                       "p99": round(percentile(values, 0.99), 2)}
+                                            for severity, values in sorted(by_severity.items())}
+    return result
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Benchmark the alert-to-ticket path against a local fake Jira')
+
+    parser.add_argument('--modes', default=",".join(MODES), help=f'Comma-separated modes ({", ".join(MODES)})')
+    parser.add_argument('--alerts', type=int, default=500, help='Alerts per in-process mode')
+    parser.add_argument('--spawn-alerts', type=int, default=50, help='Alerts per process-spawning mode')
+    parser.add_argument('--concurrency', type=int, default=16, help='Workers for concurrent and bulk modes')
+    parser.add_argument('--jira-latency', type=float, default=0.0, help='Fake Jira latency per request (seconds)')
+    parser.add_argument('--jira-jitter', type=float, default=0.0, help='Fake Jira random extra latency (seconds)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of fake Jira requests failing with 503')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of fake Jira requests failing with 429')
+    parser.add_argument('--output', help='Write results JSON here (stdout if not set)')
+
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        print(f"Unknown modes: {', '.join(unknown)}")
+        return 1
+
+    server, jira_url = start_fake_jira(args.jira_latency, args.jira_jitter, args.error_rate, args.rate_limit_rate)
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "modes": {}
+    }
+    try:
+        for mode in modes:
+            count = args.spawn_alerts if mode.endswith("-spawn") else args.alerts
+            alerts = synthetic_alerts(count)
+            # A fresh interpreter per mode keeps CPU and peak memory attributable
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                result = executor.submit(run_mode, mode, jira_url, alerts, args.concurrency).result()
+            report["modes"][mode] = result
+            print(f"{mode}: {result['alerts_per_second']} alerts/s, p50 {result['latency_ms']['p50']} ms, "
+                  f"p99 {result['latency_ms']['p99']} ms, {result['errors']} errors", file=sys.stderr)
+    finally:
+        server.terminate()
+        server.wait()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Alert Script Bundler for SOC Project
+Packs each alert script and the Jira modules it imports into a single precompiled zipapp
+"""
+
+import argparse
+import importlib.util
+import os
+import py_compile
+import stat
+import tempfile
+import zipfile
+from typing import Dict, List
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SCRIPTS_DIR)
+
+# Alert script -> bundle file name
+ENTRY_POINTS = {
+    os.path.join(REPO_DIR, "splunk", "bin", "jira_alert_action.py"): "jira_alert_action.pyz",
+    os.path.join(REPO_DIR, "wazuh", "bin", "jira_create_ticket.py"): "jira_create_ticket.pyz"
+}
+
+# Project modules the alert scripts import, directly or lazily
+BUNDLE_MODULES = ["jira_integration", "alert_records", "jira_cache", "jira_metrics", "incident_templates",
+                  "json_codec", "jira_breaker", "incident_spool", "ip_enrichment",
+                  "ioc_matcher"]
+
+
+def compile_source(source_path: str) -> bytes:
+    """
+    Compile a module to bytecode that zipimport loads without checking the source
+
+    zipimport cannot write __pycache__ entries, so without bundled
+    bytecode every run would recompile the modules from source.
+
+    Args:
+        source_path: Python source file
+
+    Returns:
+        .pyc file contents for the running interpreter
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        pyc_path = os.path.join(workdir, "module.pyc")
+        py_compile.compile(source_path, cfile=pyc_path, doraise=True,
+                           invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+        with open(pyc_path, "rb") as handle:
+            return handle.read()
+
+
+def build_bundle(entry_point: str, output_path: str, modules: List[str], interpreter: str) -> Dict[str, int]:
+    """
+    Write one executable zipapp
+
+    The sources are stored next to their bytecode, so an interpreter
+    with a different bytecode version falls back to compiling them.
+
+    Args:
+        entry_point: Alert script run as __main__
+        output_path: Bundle file to write
+        modules: Project modules (in the scripts directory) to include
+        interpreter: Interpreter for the shebang line
+
+    Returns:
+        Archive member name -> size
+    """
+    members = {"__main__": entry_point}
+    members.update({name: os.path.join(SCRIPTS_DIR, f"{name}.py") for name in modules})
+
+    tmp_path = output_path + ".tmp"
+    sizes = {}
+    with open(tmp_path, "wb") as handle:
+        handle.write(f"#!{interpreter}\n".encode("utf-8"))
+        with zipfile.ZipFile(handle, "w", compression=zipfile.ZIP_STORED) as archive:
+            for name, source_path in members.items():
+                with open(source_path, "rb") as source:
+                    archive.writestr(f"{name}.py", source.read())
+                archive.writestr(f"{name}.pyc", compile_source(source_path))
+            sizes = {info.filename: info.file_size for info in archive.infolist()}
+
+    os.chmod(tmp_path, os.stat(tmp_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    os.replace(tmp_path, output_path)
+    return sizes
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Build single-file zipapp bundles of the alert scripts')
+
+    parser.add_argument('--output-dir', default=os.path.join(REPO_DIR, "dist"), help='Directory for the .pyz files')
+    parser.add_argument('--python', default='/usr/bin/env python3', help='Interpreter for the shebang line')
+
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    for entry_point, bundle_name in ENTRY_POINTS.items():
+        output_path = os.path.join(args.output_dir, bundle_name)
+        sizes = build_bundle(entry_point, output_path, BUNDLE_MODULES, args.python)
+        print(f"Built {output_path} ({len(sizes)} members, {os.path.getsize(output_path)} bytes, "
+              f"bytecode magic {importlib.util.MAGIC_NUMBER.hex()})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Dashboard Rollup Job for SOC Project
+Maintains per-minute incident summary tables that back the Jira dashboard panels
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, List, Optional
+
+import json_codec
+
+# Incident fields summarized per minute; "all" counts every incident
+DIMENSIONS = ("severity", "mitre_technique", "status", "source_ip")
+ALL = "all"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup_counts (
+    dimension TEXT NOT NULL,
+    minute INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (dimension, minute, value)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_incidents (
+    issue_key TEXT PRIMARY KEY,
+    minute INTEGER NOT NULL,
+    severity TEXT,
+    mitre_technique TEXT,
+    status TEXT,
+    source_ip TEXT
+);
+"""
+
+SPAN_SECONDS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def to_epoch(value: Any) -> Optional[float]:
+    """
+    Convert an incident timestamp into epoch seconds
+
+    Args:
+        value: ISO-8601 string (Jira or Splunk style) or epoch seconds
+
+    Returns:
+        Epoch seconds or None if the value cannot be parsed
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def parse_span(span: str) -> int:
+    """
+    Convert a Splunk-style span or relative time (e.g., 1h, 24h, 30m) into seconds
+
+    Args:
+        span: Number followed by m, h or d
+
+    Returns:
+        Seconds
+    """
+    return int(span[:-1]) * SPAN_SECONDS[span[-1]]
+
+
+class IncidentRollup:
+    def __init__(self, db_path: str):
+        """
+        Initialize rollup store
+
+        Args:
+            db_path: SQLite database file for the summary tables
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.logger = logging.getLogger(__name__)
+
+    def apply(self, incidents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Fold new or updated incidents into the summary tables
+
+        Each incident's summarized values are remembered, so an incident
+        seen again (e.g., after a status change) moves its counts from the
+        old values to the new ones instead of being counted twice.
+
+        Args:
+            incidents: Incident dictionaries with issue_key, created_time and
+                the summarized dimensions
+
+        Returns:
+            Number of incidents whose summary contribution changed
+        """
+        changed = 0
+        with self.conn:
+            for incident in incidents:
+                issue_key = incident.get("issue_key")
+                created = to_epoch(incident.get("created_time"))
+                if not issue_key or created is None:
+                    continue
+
+                new = {"minute": int(created // 60) * 60}
+                for dimension in DIMENSIONS:
+                    value = incident.get(dimension)
+                    new[dimension] = str(value) if value not in (None, "") else None
+
+                row = self.conn.execute(
+                    "SELECT minute, severity, mitre_technique, status, source_ip "
+                    "FROM rollup_incidents WHERE issue_key = ?", (issue_key,)).fetchone()
+                if row:
+                    old = dict(zip(("minute",) + DIMENSIONS, row))
+                    if old == new:
+                        continue
+                    self._count(old, -1)
+
+                self._count(new, 1)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO rollup_incidents "
+                    "(issue_key, minute, severity, mitre_technique, status, source_ip) VALUES (?, ?, ?, ?, ?, ?)",
+                    (issue_key, new["minute"]) + tuple(new[dimension] for dimension in DIMENSIONS))
+                changed += 1
+
+            self.conn.execute("DELETE FROM rollup_counts WHERE count <= 0")
+
+        if changed:
+            self.logger.info(f"Rolled up {changed} changed incidents")
+        return changed
+
+    def _count(self, values: Dict[str, Any], delta: int):
+        """Add delta to every bucket an incident contributes to"""
+        minute = values["minute"]
+        self.conn.execute(
+            "INSERT INTO rollup_counts (dimension, minute, value, count) VALUES (?, ?, '*', ?) "
+            "ON CONFLICT (dimension, minute, value) DO UPDATE SET count = count + excluded.count",
+            (ALL, minute, delta))
+        for dimension in DIMENSIONS:
+            if values[dimension] is not None:
+                self.conn.execute(
+                    "INSERT INTO rollup_counts (dimension, minute, value, count) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (dimension, minute, value) DO UPDATE SET count = count + excluded.count",
+                    (dimension, minute, values[dimension], delta))
+
+    def counts(self,
+               dimension: str,
+               since: float,
+               until: Optional[float] = None,
+               exclude: Optional[List[str]] = None,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Sum counts per value of a dimension over a time range
+
+        Args:
+            dimension: One of DIMENSIONS
+            since: Range start in epoch seconds
+            until: Range end in epoch seconds (now if None)
+            exclude: Values to leave out
+            limit: Return only the top values by count
+
+        Returns:
+            List of {dimension: value, "count": n} rows, largest first
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown rollup dimension: {dimension}")
+        until = time.time() if until is None else until
+        exclude = exclude or []
+
+        sql = ("SELECT value, SUM(count) AS total FROM rollup_counts "
+               "WHERE dimension = ? AND minute >= ? AND minute < ?")
+        params: List[Any] = [dimension, int(since // 60) * 60, until]
+        if exclude:
+            sql += f" AND value NOT IN ({','.join('?' * len(exclude))})"
+            params.extend(exclude)
+        sql += " GROUP BY value ORDER BY total DESC, value"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [{dimension: value, "count": total} for value, total in self.conn.execute(sql, params)]
+
+    def timechart(self, since: float, until: Optional[float] = None, span: str = "1h") -> List[Dict[str, Any]]:
+        """
+        Count incidents per time bucket
+
+        Args:
+            since: Range start in epoch seconds
+            until: Range end in epoch seconds (now if None)
+            span: Bucket width (e.g., 1h)
+
+        Returns:
+            List of {"_time": bucket_start, "count": n} rows in time order
+        """
+        until = time.time() if until is None else until
+        width = parse_span(span)
+        rows = self.conn.execute(
+            "SELECT (minute / ?) * ? AS bucket, SUM(count) FROM rollup_counts "
+            "WHERE dimension = ? AND minute >= ? AND minute < ? GROUP BY bucket ORDER BY bucket",
+            (width, width, ALL, int(since // 60) * 60, until))
+        return [{"_time": bucket, "count": total} for bucket, total in rows]
+
+    def run_panel(self, panel: Dict[str, Any], time_range: str = "24h", now: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a dashboard panel from the summary tables
+
+        Args:
+            panel: Panel definition with a "summary" block
+            time_range: Dashboard time range (e.g., 24h for now-24h)
+            now: Range end in epoch seconds (now if None)
+
+        Returns:
+            Panel rows, or None if the panel has no summary block
+        """
+        summary = panel.get("summary")
+        if not summary:
+            return None
+
+        now = time.time() if now is None else now
+        since = now - parse_span(summary.get("range", time_range))
+        if summary.get("dimension") == ALL:
+            return self.timechart(since, now, summary.get("span", "1h"))
+        return self.counts(summary["dimension"], since, now,
+                           exclude=summary.get("exclude"), limit=summary.get("limit"))
+
+    def close(self):
+        self.conn.close()
+
+
+def dashboard_time_range(dashboard: Dict[str, Any]) -> str:
+    """Return a dashboard's time range as a span such as 24h"""
+    start = dashboard.get("time", {}).get("from", "now-24h")
+    return start.replace("now-", "") if start.startswith("now-") else "24h"
+
+
+def load_incidents(path: str) -> Iterable[Dict[str, Any]]:
+    """Yield incidents from a newline-delimited JSON export"""
+    with open(path, "rb") as handle:
+        for line in handle:
+            if line.strip():
+                yield json_codec.loads(line)
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Roll up incidents into dashboard summary tables')
+
+    parser.add_argument('--db', default='soc_rollups.db', help='Summary database file')
+    parser.add_argument('--input', help='Newline-delimited JSON incidents to fold in')
+    parser.add_argument('--dashboard', help='Dashboard JSON whose summary panels should be printed')
+
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    logging.basicConfig(level=logging.INFO)
+    args = parse_arguments()
+    rollup = IncidentRollup(args.db)
+
+    try:
+        if args.input:
+            rollup.apply(load_incidents(args.input))
+
+        if args.dashboard:
+            with open(args.dashboard, "r", encoding="utf-8") as handle:
+                dashboard = json.load(handle)["dashboard"]
+            time_range = dashboard_time_range(dashboard)
+            for panel in dashboard["panels"]:
+                rows = rollup.run_panel(panel, time_range)
+                if rows is not None:
+                    print(json.dumps({"title": panel["title"], "rows": rows}))
+    finally:
+        rollup.close()
+
+
+if __name__ == "__main__":
+    main()
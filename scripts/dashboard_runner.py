@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Dashboard Runner for SOC Project
+Runs each shared base search once per refresh cycle and fans results out to panel post-processing
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import requests
+
+from dashboard_rollup import IncidentRollup, dashboard_time_range
+
+# Search keywords that make splitting a filter clause into independent terms unsafe
+BOOLEAN_KEYWORDS = {"OR", "NOT"}
+
+# Commands whose output is aggregated; a base search ending in one keeps
+# few results, so it needs no field list or result limit
+AGGREGATING_COMMANDS = {"stats", "chart", "timechart", "top", "rare", "tstats"}
+
+# Commands that read the raw event text
+RAW_COMMANDS = {"rex", "regex", "extract", "kv", "spath", "erex"}
+
+# Events a non-aggregating base search keeps for its post-processes
+# (Splunk keeps 10,000 when the job does not set max_count)
+DEFAULT_MAX_BASE_RESULTS = 500000
+
+FIELD_NAME = re.compile(r"\b[A-Za-z_][\w.]*")
+QUOTED = re.compile(r'"(?:[^"\\]|\\.)*"')
+BARE_WILDCARD = re.compile(r"(?<![=\w])\*")
+SPL_KEYWORDS = {"as", "by", "over", "span"}
+
+
+def split_unquoted(text: str, separator: str) -> List[str]:
+    """
+    Split text on a separator that is outside quotes, brackets and parentheses
+
+    Args:
+        text: SPL text
+        separator: Single separator character (| for pipeline stages,
+            space for search terms)
+
+    Returns:
+        Stripped, non-empty parts
+    """
+    parts = []
+    current = []
+    quoted = False
+    depth = 0
+
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char in "([":
+            depth += 1
+        elif not quoted and char in ")]":
+            depth -= 1
+        elif char == separator and not quoted and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def parse_search(search: str) -> Tuple[Optional[List[str]], List[str]]:
+    """
+    Split a panel search into filter terms and pipeline commands
+
+    Args:
+        search: Panel SPL
+
+    Returns:
+        (terms, commands); terms is None if the filter clause cannot be
+        split into independent AND-ed terms
+    """
+    stages = split_unquoted(search, "|")
+    if not stages:
+        return None, []
+
+    terms = split_unquoted(stages[0], " ")
+    if any(term.upper() in BOOLEAN_KEYWORDS or term.startswith("(") for term in terms):
+        return None, stages[1:]
+    return terms, stages[1:]
+
+
+def is_aggregating(search: str) -> bool:
+    """True if any pipeline stage of a search aggregates its input"""
+    return any(stage.split(None, 1)[0].lower() in AGGREGATING_COMMANDS
+               for stage in split_unquoted(search, "|")[1:])
+
+
+def referenced_fields(post_processes: List[str]) -> Optional[List[str]]:
+    """
+    Fields a set of post-processes can read
+
+    Every argument word that could name a field is included, so the list
+    may hold function names too; that only costs a no-op entry in `fields`.
+
+    Args:
+        post_processes: Post-process SPL per panel
+
+    Returns:
+        Sorted field names, or None if a post-process needs every field
+        (raw results or a bare * wildcard)
+    """
+    fields = {"_time"}
+    for search in post_processes:
+        if not search:
+            return None
+        for stage in split_unquoted(search, "|"):
+            command, _space, arguments = stage.partition(" ")
+            if command.lower() in RAW_COMMANDS:
+                fields.add("_raw")
+            if command.lower() == "search":
+                # Comparisons name a field; any other term matches the raw text
+                for term in split_unquoted(arguments, " "):
+                    comparison = re.match(r"([\w.]+)\s*(?:!=|[=<>])", term)
+                    fields.add(comparison.group(1) if comparison else "_raw")
+                continue
+            unquoted = QUOTED.sub(" ", arguments)
+            if BARE_WILDCARD.search(unquoted):
+                return None
+            fields.update(word for word in FIELD_NAME.findall(unquoted) if word.lower() not in SPL_KEYWORDS)
+    return sorted(fields)
+
+
+class SharedSearch:
+    """One base search and the panels post-processing its results"""
+
+    def __init__(self, base: str, panels: List[Dict[str, Any]], post_processes: List[str]):
+        self.base = base
+        self.panels = panels
+        self.post_processes = post_processes
+
+
+def plan_searches(panels: List[Dict[str, Any]]) -> List[SharedSearch]:
+    """
+    Group panels that scan the same indexes under shared base searches
+
+    Panels are grouped by their index= terms. Filter terms and leading
+    commands common to every panel in a group move into the base search;
+    the rest of each panel's search becomes its post-process. Panels whose
+    filter cannot be split safely get a base search of their own. A shared
+    base that does not aggregate ends with `fields`, keeping only what the
+    post-processes read.
+
+    Args:
+        panels: Panel definitions with a "search" key
+
+    Returns:
+        Shared searches covering every panel exactly once
+    """
+    groups: Dict[Tuple[str, ...], List[Tuple[Dict[str, Any], List[str], List[str]]]] = {}
+    plans: List[SharedSearch] = []
+
+    for panel in panels:
+        terms, commands = parse_search(panel["search"])
+        indexes = tuple(sorted(term for term in terms or [] if term.startswith("index=")))
+        if terms is None or not indexes:
+            plans.append(SharedSearch(panel["search"], [panel], [""]))
+            continue
+        groups.setdefault(indexes, []).append((panel, terms, commands))
+
+    for members in groups.values():
+        common_terms = [term for term in members[0][1] if all(term in terms for _p, terms, _c in members)]
+        # Shared leading commands can only move into the base when no panel
+        # has extra filter terms, which must apply before those commands
+        common_commands = []
+        if all(len(terms) == len(common_terms) for _p, terms, _c in members):
+            for stage in zip(*[commands for _p, _t, commands in members]):
+                if len(set(stage)) != 1:
+                    break
+                common_commands.append(stage[0])
+
+        base_stages = [" ".join(common_terms)] + common_commands
+        post_processes = []
+        for _panel, terms, commands in members:
+            stages = []
+            extra_terms = [term for term in terms if term not in common_terms]
+            if extra_terms:
+                stages.append("search " + " ".join(extra_terms))
+            stages.extend(commands[len(common_commands):])
+            post_processes.append(" | ".join(stages))
+
+        base = " | ".join(base_stages)
+        fields = referenced_fields(post_processes)
+        if fields and not is_aggregating(base):
+            base += " | fields " + " ".join(fields)
+        plans.append(SharedSearch(base, [panel for panel, _t, _c in members], post_processes))
+
+    return plans
+
+
+class SplunkSearchExecutor:
+    def __init__(self,
+                 splunk_url: str,
+                 token: str,
+                 verify: bool = True,
+                 timeout: float = 300.0,
+                 max_results: int = DEFAULT_MAX_BASE_RESULTS):
+        """
+        Initialize Splunk search executor
+
+        Args:
+            splunk_url: Splunk management URL (e.g., https://splunk.example.com:8089)
+            token: Splunk authentication token
+            verify: Verify the server TLS certificate
+            timeout: Per-request timeout in seconds
+            max_results: Events a non-aggregating base search keeps for
+                its post-processes
+        """
+        self.splunk_url = splunk_url.rstrip('/')
+        self.timeout = timeout
+        self.max_results = max_results
+        self.logger = logging.getLogger(__name__)
+        self.session = requests.Session()
+        self.session.verify = verify
+        self.session.headers.update({"Authorization": f"Bearer {token}"})
+
+    def run_base(self, search: str, earliest: str, latest: str) -> str:
+        """
+        Run a base search to completion
+
+        A base search that does not aggregate keeps up to max_results
+        events; if it matched more, post-processes only see the first
+        max_results and a warning is logged.
+
+        Args:
+            search: Base search SPL
+            earliest: Earliest time modifier (e.g., -24h)
+            latest: Latest time modifier (e.g., now)
+
+        Returns:
+            Search job ID
+        """
+        response = self.session.post(
+            f"{self.splunk_url}/services/search/jobs",
+            data={
+                "search": search if search.startswith(("search ", "|")) else f"search {search}",
+                "earliest_time": earliest,
+                "latest_time": latest,
+                "exec_mode": "blocking",
+                "max_count": self.max_results,
+                "output_mode": "json"
+            },
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        sid = response.json()["sid"]
+
+        if not is_aggregating(search):
+            status = self.session.get(f"{self.splunk_url}/services/search/jobs/{sid}",
+                                      params={"output_mode": "json"}, timeout=self.timeout)
+            status.raise_for_status()
+            event_count = int(status.json()["entry"][0]["content"].get("eventCount", 0))
+            if event_count > self.max_results:
+                self.logger.warning(f"Base search matched {event_count} events but keeps {self.max_results}; "
+                                    f"panel results are truncated ({search})")
+        return sid
+
+    def post_process(self, sid: str, search: str) -> List[Dict[str, Any]]:
+        """
+        Apply a post-process search to a finished job's results
+
+        Args:
+            sid: Search job ID from run_base()
+            search: Post-process SPL, or "" for the raw results
+
+        Returns:
+            Result rows
+        """
+        params = {"output_mode": "json", "count": 0}
+        if search:
+            params["search"] = search
+        response = self.session.get(
+            f"{self.splunk_url}/services/search/jobs/{sid}/results",
+            params=params,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json().get("results", [])
+
+
+class DashboardRunner:
+    def __init__(self,
+                 dashboard: Dict[str, Any],
+                 executor: SplunkSearchExecutor,
+                 rollup: Optional[IncidentRollup] = None):
+        """
+        Initialize dashboard runner
+
+        Args:
+            dashboard: Dashboard definition (the "dashboard" object)
+            executor: Search executor for base and post-process searches
+            rollup: Optional summary store used for panels with a summary block
+        """
+        self.dashboard = dashboard
+        self.executor = executor
+        self.rollup = rollup
+        self.time_range = dashboard_time_range(dashboard)
+        self.earliest = dashboard.get("time", {}).get("from", "now-24h").replace("now", "", 1) or "0"
+        self.latest = dashboard.get("time", {}).get("to", "now")
+        self.logger = logging.getLogger(__name__)
+
+        default_refresh = dashboard.get("refresh", "60s")
+        self._next_due: Dict[str, float] = {}
+        self._intervals = {panel["title"]: parse_refresh(panel.get("refresh", default_refresh))
+                           for panel in dashboard["panels"]}
+        self.base_searches_run = 0
+
+    def due_panels(self, now: float) -> List[Dict[str, Any]]:
+        """
+        Get panels whose refresh interval has elapsed
+
+        Args:
+            now: Current epoch seconds
+
+        Returns:
+            Panel definitions to refresh
+        """
+        return [panel for panel in self.dashboard["panels"]
+                if self._next_due.get(panel["title"], 0) <= now]
+
+    def run_cycle(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Refresh every due panel, running each shared base search once
+
+        Args:
+            now: Current epoch seconds (time.time() if None)
+
+        Returns:
+            Panel title -> result rows (or None if its search failed)
+        """
+        now = time.time() if now is None else now
+        due = self.due_panels(now)
+        results: Dict[str, Any] = {}
+
+        splunk_panels = []
+        for panel in due:
+            rows = self.rollup.run_panel(panel, self.time_range, now) if self.rollup else None
+            if rows is None:
+                splunk_panels.append(panel)
+            else:
+                results[panel["title"]] = rows
+
+        for plan in plan_searches(splunk_panels):
+            try:
+                sid = self.executor.run_base(plan.base, self.earliest, self.latest)
+                self.base_searches_run += 1
+            except Exception as e:
+                self.logger.error(f"Base search failed ({plan.base}): {str(e)}")
+                for panel in plan.panels:
+                    results[panel["title"]] = None
+                continue
+
+            for panel, post_process in zip(plan.panels, plan.post_processes):
+                try:
+                    results[panel["title"]] = self.executor.post_process(sid, post_process)
+                except Exception as e:
+                    self.logger.error(f"Post-process failed for {panel['title']}: {str(e)}")
+                    results[panel["title"]] = None
+
+        for panel in due:
+            self._next_due[panel["title"]] = now + self._intervals[panel["title"]]
+        return results
+
+    def seconds_until_due(self, now: float) -> float:
+        """Seconds until the next panel is due for refresh"""
+        if not self._next_due:
+            return 0.0
+        return max(0.0, min(self._next_due.values()) - now)
+
+
+def parse_refresh(refresh: str) -> float:
+    """Convert a refresh interval such as 30s or 5m into seconds"""
+    units = {"s": 1, "m": 60, "h": 3600}
+    return float(refresh[:-1]) * units[refresh[-1]]
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Refresh dashboard panels with shared base searches')
+
+    parser.add_argument('--dashboard', required=True, help='Dashboard JSON file')
+    parser.add_argument('--splunk-url', default=os.getenv("SPLUNK_URL"), help='Splunk management URL')
+    parser.add_argument('--splunk-token', default=os.getenv("SPLUNK_TOKEN"), help='Splunk authentication token')
+    parser.add_argument('--rollup-db', help='Summary database for panels with a summary block')
+    parser.add_argument('--once', action='store_true', help='Run a single refresh cycle and exit')
+    parser.add_argument('--insecure', action='store_true', help='Skip TLS certificate verification')
+    parser.add_argument('--max-base-results', type=int, default=DEFAULT_MAX_BASE_RESULTS,
+                        help='Events a non-aggregating base search keeps for its panels')
+
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    logging.basicConfig(level=logging.INFO)
+    args = parse_arguments()
+
+    if not all([args.splunk_url, args.splunk_token]):
+        print("Please set SPLUNK_URL and SPLUNK_TOKEN or pass --splunk-url and --splunk-token")
+        return 1
+
+    with open(args.dashboard, "r", encoding="utf-8") as handle:
+        dashboard = json.load(handle)["dashboard"]
+
+    executor = SplunkSearchExecutor(args.splunk_url, args.splunk_token, verify=not args.insecure,
+                                    max_results=args.max_base_results)
+    rollup = IncidentRollup(args.rollup_db) if args.rollup_db else None
+    runner = DashboardRunner(dashboard, executor, rollup)
+
+    for plan in plan_searches(dashboard["panels"]):
+        logging.getLogger(__name__).info(f"Base search '{plan.base}' shared by {len(plan.panels)} panels")
+
+    while True:
+        results = runner.run_cycle()
+        print(json.dumps(results))
+        if args.once:
+            return 0
+        time.sleep(runner.seconds_until_due(time.time()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Event Normalizer for SOC Project
+Compiles per-source field mappings into specialized extractor functions
+"""
+
+import threading
+from typing import Callable, Dict, Any, List, Tuple
+
+# Shared stand-in for missing or non-dict intermediate values; never mutated
+_EMPTY: Dict[str, Any] = {}
+
+FieldMap = Dict[str, Tuple[Tuple[str, ...], ...]]
+Extractor = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def compile_extractor(field_map: FieldMap, shape: Tuple[str, ...] = None) -> Extractor:
+    """
+    Generate a function that extracts mapped fields from a record
+
+    The generated code looks up every shared key prefix once and then
+    reads each field straight from the prefix variables, so no mapping
+    dictionary is walked per event. When the record shape (its top-level
+    keys) is given, paths whose first key is not part of the shape are
+    left out of the generated code entirely.
+
+    Args:
+        field_map: Common field name -> candidate key paths, first match wins
+        shape: Optional tuple of top-level keys the extractor will see
+
+    Returns:
+        Function taking a record and returning the extracted fields
+    """
+    present = set(shape) if shape is not None else None
+    prefixes: Dict[Tuple[str, ...], str] = {(): "record"}
+    body: List[str] = []
+
+    def prefix_var(prefix: Tuple[str, ...]) -> str:
+        if prefix not in prefixes:
+            parent = prefix_var(prefix[:-1])
+            var = f"p{len(prefixes)}"
+            prefixes[prefix] = var
+            body.append(f"    {var} = {parent}.get({prefix[-1]!r})")
+            body.append(f"    if {var}.__class__ is not dict: {var} = EMPTY")
+        return prefixes[prefix]
+
+    assignments: List[str] = []
+    for field, paths in field_map.items():
+        candidates = [path for path in paths if present is None or path[0] in present]
+        if not candidates:
+            continue
+
+        lookups = [f"{prefix_var(path[:-1])}.get({path[-1]!r})" for path in candidates]
+        assignments.append(f"    value = {lookups[0]}")
+        for lookup in lookups[1:]:
+            assignments.append(f"    if value is None: value = {lookup}")
+        assignments.append(f"    if value is not None: fields[{field!r}] = value")
+
+    source = "\n".join(["def extract(record):", "    fields = {}"] + body + assignments + ["    return fields"])
+    namespace = {"EMPTY": _EMPTY}
+    exec(compile(source, "<field-extractor>", "exec"), namespace)
+    return namespace["extract"]
+
+
+class FieldNormalizer:
+    """
+    Extracts common fields with extractors specialized per record shape
+
+    Records from one source nearly always share a handful of shapes, so
+    the extractor for each shape is compiled on first sight and reused.
+    Once max_shapes distinct shapes have been seen, further shapes use a
+    generic extractor compiled from the full mapping.
+    """
+
+    def __init__(self, field_map: FieldMap, max_shapes: int = 256):
+        """
+        Initialize normalizer
+
+        Args:
+            field_map: Common field name -> candidate key paths
+            max_shapes: Maximum number of shape-specialized extractors to keep
+        """
+        self.field_map = field_map
+        self.max_shapes = max_shapes
+        self.generic = compile_extractor(field_map)
+        self._extractors: Dict[Tuple[str, ...], Extractor] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def extract(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract the mapped fields of a record
+
+        Args:
+            record: Raw log record
+
+        Returns:
+            Dictionary of fields that have a value
+        """
+        shape = tuple(record)
+        extractor = self._extractors.get(shape)
+        if extractor is None:
+            extractor = self._extractor_for(shape)
+        else:
+            self.hits += 1
+        return extractor(record)
+
+    def _extractor_for(self, shape: Tuple[str, ...]) -> Extractor:
+        with self._lock:
+            self.misses += 1
+            extractor = self._extractors.get(shape)
+            if extractor is None:
+                if len(self._extractors) >= self.max_shapes:
+                    return self.generic
+                extractor = compile_extractor(self.field_map, shape)
+                self._extractors[shape] = extractor
+            return extractor
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        Get extractor cache counters
+
+        Returns:
+            Metrics dictionary
+        """
+        return {"shapes": len(self._extractors), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Local Splunk HEC Stand-in for SOC Project
+Accepts HEC event batches on localhost so the forwarder can be tested without Splunk
+"""
+
+import argparse
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+
+
+class FakeHECServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self,
+                 address,
+                 token: str = "test-token",
+                 use_ack: bool = False,
+                 max_content_length: Optional[int] = None,
+                 ack_polls: int = 0):
+        """
+        Initialize HEC stand-in
+
+        Args:
+            address: (host, port) to listen on; port 0 picks a free port
+            token: HEC token clients must present
+            use_ack: Emulate a token with indexer acknowledgment enabled
+            max_content_length: Reject event batches larger than this many
+                (uncompressed) bytes with a 413, like HEC's max_content_length
+            ack_polls: Ack queries answered as pending before an ack is
+                reported complete
+        """
+        super().__init__(address, FakeHECHandler)
+        self.token = token
+        self.use_ack = use_ack
+        self.max_content_length = max_content_length
+        self.ack_polls = ack_polls
+        self.next_ack_id = 0
+        self.ack_queries: Dict[int, int] = {}
+        # Set to simulate an indexer outage; every request gets a 503
+        self.unavailable = False
+        self.lock = threading.Lock()
+        self.events: List[Dict[str, Any]] = []
+        self.requests = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        """Serve requests from a background thread"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class FakeHECHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: Dict[str, Any]):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+
+        if self.server.unavailable:
+            self._reply(503, {"text": "Server is busy", "code": 9})
+            return
+        if self.headers.get("Authorization") != f"Splunk {self.server.token}":
+            self._reply(401, {"text": "Invalid token", "code": 4})
+            return
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+
+        if self.path.startswith("/services/collector/ack"):
+            # Events are stored synchronously; an ack only reads as pending
+            # for the first ack_polls queries
+            acks = json.loads(body).get("acks", [])
+            status = {}
+            with self.server.lock:
+                for ack_id in acks:
+                    queries = self.server.ack_queries.get(ack_id, 0) + 1
+                    self.server.ack_queries[ack_id] = queries
+                    status[str(ack_id)] = ack_id < self.server.next_ack_id and queries > self.server.ack_polls
+            self._reply(200, {"acks": status})
+            return
+        if not self.path.startswith("/services/collector/event"):
+            self._reply(404, {"text": "Not found", "code": 404})
+            return
+        if self.server.use_ack and not self.headers.get("X-Splunk-Request-Channel"):
+            self._reply(400, {"text": "Data channel is missing", "code": 10})
+            return
+
+        if self.server.max_content_length is not None and len(body) > self.server.max_content_length:
+            self._reply(413, {"text": "Content too large", "code": 413})
+            return
+
+        try:
+            events = [json.loads(line) for line in body.splitlines() if line.strip()]
+        except json.JSONDecodeError:
+            self._reply(400, {"text": "Invalid data format", "code": 6})
+            return
+
+        with self.server.lock:
+            self.server.events.extend(events)
+            self.server.requests += 1
+            ack_id = self.server.next_ack_id
+            self.server.next_ack_id += 1
+
+        reply = {"text": "Success", "code": 0}
+        if self.server.use_ack:
+            reply["ackId"] = ack_id
+        self._reply(200, reply)
+
+
+def main():
+    """Run the HEC stand-in until interrupted"""
+    parser = argparse.ArgumentParser(description='Run a local Splunk HEC stand-in')
+    parser.add_argument('--host', default='127.0.0.1', help='Listen address')
+    parser.add_argument('--port', type=int, default=8088, help='Listen port')
+    parser.add_argument('--token', default='test-token', help='Accepted HEC token')
+    parser.add_argument('--use-ack', action='store_true', help='Enable indexer acknowledgment')
+    parser.add_argument('--max-content-length', type=int, help='Reject larger batches with a 413')
+    args = parser.parse_args()
+
+    server = FakeHECServer((args.host, args.port), token=args.token, use_ack=args.use_ack,
+                           max_content_length=args.max_content_length)
+    print(f"Fake HEC listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"Received {len(server.events)} events in {server.requests} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Local Jira REST Stand-in for SOC Project
+In-memory Jira issue API with injectable latency, errors and rate limiting for load tests
+"""
+
+import argparse
+import base64
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from dashboard_rollup import to_epoch
+
+# Workflow statuses and the transition leading to each
+WORKFLOW = [("11", "Open"), ("21", "In Progress"), ("31", "Resolved"), ("41", "Closed")]
+
+# Jira caps search pages and bulk creates at these sizes
+MAX_SEARCH_RESULTS = 100
+MAX_BULK_CREATE = 50
+
+ISSUE_PATH = re.compile(r"^/rest/api/2/issue/([A-Za-z][A-Za-z0-9_]*-\d+)(/transitions|/comment)?$")
+JQL_CLAUSE = re.compile(r"^(\w+)\s*(not in|in|!=|>=|<=|=|>|<)\s*(.+)$", re.IGNORECASE)
+JQL_ORDER = re.compile(r"\s+ORDER\s+BY\s+(\w+)(?:\s+(ASC|DESC))?\s*$", re.IGNORECASE)
+RELATIVE_TIME = re.compile(r"^-(\d+)([mhd])$")
+
+DATE_FIELDS = ("created", "updated", "resolutiondate")
+TIME_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def jira_timestamp(epoch: float) -> str:
+    """Format epoch seconds the way Jira does (e.g., 2024-01-01T12:00:00.000+0000)"""
+    moment = datetime.fromtimestamp(epoch, timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}+0000"
+
+
+class JQLError(ValueError):
+    pass
+
+
+def parse_jql(jql: str) -> Tuple[List[Tuple[str, str, Any]], Optional[Tuple[str, bool]]]:
+    """
+    Parse the AND-ed subset of JQL the SOC scripts use
+
+    Supports field = / != / > / >= / < / <= value, field in (...) and
+    field not in (...), with quoted values, relative dates such as -15m,
+    and a trailing ORDER BY.
+
+    Args:
+        jql: JQL query
+
+    Returns:
+        (clauses, order); each clause is (field, operator, value) and order
+        is (field, descending) or None
+    """
+    order = None
+    match = JQL_ORDER.search(jql)
+    if match:
+        order = (match.group(1).lower(), (match.group(2) or "ASC").upper() == "DESC")
+        jql = jql[:match.start()]
+
+    clauses = []
+    for text in re.split(r"\s+AND\s+", jql.strip(), flags=re.IGNORECASE):
+        if not text:
+            continue
+        clause = JQL_CLAUSE.match(text.strip())
+        if not clause:
+            raise JQLError(f"Unsupported JQL clause: {text}")
+        field, operator, value = clause.group(1).lower(), clause.group(2).lower(), clause.group(3).strip()
+        if operator in ("in", "not in"):
+            if not (value.startswith("(") and value.endswith(")")):
+                raise JQLError(f"Expected a list after {operator}: {text}")
+            value = [item.strip().strip('"\'') for item in value[1:-1].split(",") if item.strip()]
+        else:
+            value = value.strip('"\'')
+        clauses.append(("key" if field == "issuekey" else field, operator, value))
+    return clauses, order
+
+
+class FakeJiraServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self,
+                 address,
+                 username: str = "test",
+                 api_token: str = "test-token",
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0,
+                 retry_after: int = 1,
+                 seed: Optional[int] = None):
+        """
+        Initialize Jira stand-in
+
+        Args:
+            address: (host, port) to listen on; port 0 picks a free port
+            username: Username clients must present
+            api_token: API token clients must present
+            latency: Seconds added to every request
+            jitter: Extra random latency, uniform between 0 and this many seconds
+            error_rate: Fraction of requests answered with 503
+            rate_limit_rate: Fraction of requests answered with 429
+            retry_after: Retry-After seconds sent with 429 replies
+            seed: Random seed for repeatable fault injection
+        """
+        super().__init__(address, FakeJiraHandler)
+        self.credentials = "Basic " + base64.b64encode(f"{username}:{api_token}".encode()).decode()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        # Set to simulate an outage; every request gets a 503
+        self.unavailable = False
+        self.lock = threading.Lock()
+        self.issues: Dict[str, Dict[str, Any]] = {}
+        self.versions: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self.next_id = 10000
+        self.requests = 0
+        self.status_counts: Dict[int, int] = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        """Serve requests from a background thread"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def fault(self) -> Optional[int]:
+        """Pick an injected failure status for a request, if any"""
+        with self.lock:
+            roll = self.random.random()
+        if self.unavailable:
+            return 503
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 503
+        return None
+
+    def delay(self):
+        """Sleep for the configured latency"""
+        if self.latency or self.jitter:
+            with self.lock:
+                extra = self.random.uniform(0, self.jitter) if self.jitter else 0.0
+            time.sleep(self.latency + extra)
+
+    def create_issue(self, fields: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Dict[str, str]]:
+        """
+        Store a new issue
+
+        Args:
+            fields: Issue fields from a create request
+
+        Returns:
+            (created reference, field errors); the reference is None on errors
+        """
+        errors = {}
+        project = (fields.get("project") or {}).get("key")
+        if not project:
+            errors["project"] = "project is required"
+        if not fields.get("summary"):
+            errors["summary"] = "You must specify a summary of the issue."
+        if not (fields.get("issuetype") or {}).get("name"):
+            errors["issuetype"] = "issue type is required"
+        if errors:
+            return None, errors
+
+        now = jira_timestamp(time.time())
+        with self.lock:
+            self.counters[project] = self.counters.get(project, 0) + 1
+            key = f"{project}-{self.counters[project]}"
+            issue_id = str(self.next_id)
+            self.next_id += 1
+            stored = dict(fields)
+            stored.update({"status": {"name": WORKFLOW[0][1]}, "created": now, "updated": now,
+                           "resolutiondate": None, "comment": {"comments": [], "total": 0}})
+            stored.setdefault("priority", {"name": "Medium"})
+            stored.setdefault("labels", [])
+            self.issues[key] = {"id": issue_id, "key": key, "fields": stored}
+            self.versions[key] = 1
+        return {"id": issue_id, "key": key, "self": f"{self.url}/rest/api/2/issue/{issue_id}"}, {}
+
+    def touch(self, key: str):
+        """Mark an issue changed; caller holds the lock"""
+        self.issues[key]["fields"]["updated"] = jira_timestamp(time.time())
+        self.versions[key] += 1
+
+    def add_comment(self, key: str, body: str) -> Dict[str, Any]:
+        """Append a comment to an issue; caller holds the lock"""
+        comments = self.issues[key]["fields"]["comment"]
+        with_id = {"id": str(self.next_id), "body": body, "created": jira_timestamp(time.time())}
+        self.next_id += 1
+        comments["comments"].append(with_id)
+        comments["total"] = len(comments["comments"])
+        self.touch(key)
+        return with_id
+
+    def search(self, jql: str, validate: str = "strict") -> List[Dict[str, Any]]:
+        """
+        Find issues matching a JQL query
+
+        Args:
+            jql: JQL query (see parse_jql for the supported subset)
+            validate: "strict" rejects unknown issue keys like Jira does;
+                "warn" ignores them
+
+        Returns:
+            Matching issues in result order
+        """
+        clauses, order = parse_jql(jql)
+        now = time.time()
+        with self.lock:
+            if validate == "strict":
+                for field, operator, value in clauses:
+                    if field == "key":
+                        for key in (value if isinstance(value, list) else [value]):
+                            if key not in self.issues:
+                                raise JQLError(f"An issue with key '{key}' does not exist for field 'key'.")
+            matches = [issue for issue in self.issues.values()
+                       if all(self._matches(issue, clause, now) for clause in clauses)]
+
+        if order:
+            field, descending = order
+            matches.sort(key=lambda issue: self._sort_value(issue, field), reverse=descending)
+        return matches
+
+    @staticmethod
+    def _field_values(issue: Dict[str, Any], field: str) -> List[str]:
+        """Comparable string values of an issue field"""
+        if field == "key":
+            return [issue["key"]]
+        fields = issue["fields"]
+        if field == "project":
+            return [(fields.get("project") or {}).get("key", "")]
+        value = fields.get(field)
+        if isinstance(value, dict):
+            return [str(value.get("name", value.get("key", "")))]
+        if isinstance(value, list):
+            return [str(item) for item in value]
+        return [] if value is None else [str(value)]
+
+    def _matches(self, issue: Dict[str, Any], clause: Tuple[str, str, Any], now: float) -> bool:
+        field, operator, value = clause
+        if field in DATE_FIELDS:
+            actual = to_epoch(issue["fields"].get(field))
+            relative = RELATIVE_TIME.match(value) if isinstance(value, str) else None
+            bound = now - int(relative.group(1)) * TIME_UNITS[relative.group(2)] if relative else to_epoch(value)
+            if actual is None or bound is None:
+                return False
+            return {">=": actual >= bound, ">": actual > bound, "<=": actual <= bound,
+                    "<": actual < bound, "=": actual == bound, "!=": actual != bound}.get(operator, False)
+
+        actual = [item.lower() for item in self._field_values(issue, field)]
+        if operator == "=":
+            return value.lower() in actual
+        if operator == "!=":
+            return value.lower() not in actual
+        if operator == "in":
+            return any(item.lower() in actual for item in value)
+        if operator == "not in":
+            return not any(item.lower() in actual for item in value)
+        raise JQLError(f"Operator {operator} is not supported for field {field}")
+
+    def _sort_value(self, issue: Dict[str, Any], field: str):
+        if field in DATE_FIELDS:
+            return to_epoch(issue["fields"].get(field)) or 0.0
+        if field == "key":
+            return int(issue["id"])
+        values = self._field_values(issue, field)
+        return values[0] if values else ""
+
+
+def project_issue(issue: Dict[str, Any], fields: Optional[List[str]], base_url: str) -> Dict[str, Any]:
+    """Copy an issue with only the requested fields"""
+    stored = issue["fields"]
+    if not fields or "*all" in fields or "*navigable" in fields:
+        selected = dict(stored)
+    else:
+        selected = {name: stored.get(name) for name in fields if name in stored}
+    return {"id": issue["id"], "key": issue["key"],
+            "self": f"{base_url}/rest/api/2/issue/{issue['id']}", "fields": selected}
+
+
+class FakeJiraHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY every
+    # keep-alive response stalls on the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.status_counts[status] = self.server.status_counts.get(status, 0) + 1
+        self.send_response(status)
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str, errors: Optional[Dict[str, str]] = None,
+               headers: Optional[Dict[str, str]] = None):
+        self._reply(status, {"errorMessages": [message] if message else [], "errors": errors or {}}, headers)
+
+    def _admit(self) -> bool:
+        """Apply latency, authentication and fault injection; False if already answered"""
+        self.server.delay()
+        if self.headers.get("Authorization") != self.server.credentials:
+            self._error(401, "You are not authenticated.")
+            return False
+        status = self.server.fault()
+        if status == 429:
+            self._error(429, "Rate limit exceeded.", headers={"Retry-After": str(self.server.retry_after)})
+            return False
+        if status == 503:
+            self._error(503, "Service unavailable.")
+            return False
+        return True
+
+    def _body(self) -> Optional[Dict[str, Any]]:
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._error(400, "Unexpected character in request body.")
+            return None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if not self._admit():
+            return
+
+        if url.path == "/rest/api/2/search":
+            self._search(query.get("jql", ""), int(query.get("startAt", 0)),
+                         int(query.get("maxResults", 50)), query.get("fields", "").split(",") if query.get("fields") else None,
+                         query.get("validateQuery", "strict"))
+            return
+
+        match = ISSUE_PATH.match(url.path)
+        if not match:
+            self._error(404, "Not found.")
+            return
+        key, action = match.groups()
+        with self.server.lock:
+            issue = self.server.issues.get(key)
+            version = self.server.versions.get(key)
+            current = issue["fields"]["status"]["name"] if issue else None
+        if issue is None:
+            self._error(404, "Issue does not exist or you do not have permission to see it.")
+            return
+
+        if action == "/transitions":
+            transitions = [{"id": transition_id, "name": name, "to": {"name": name}}
+                           for transition_id, name in WORKFLOW if name != current]
+            self._reply(200, {"expand": "transitions", "transitions": transitions})
+        elif action == "/comment":
+            comments = issue["fields"]["comment"]
+            self._reply(200, {"startAt": 0, "maxResults": comments["total"],
+                              "total": comments["total"], "comments": comments["comments"]})
+        else:
+            etag = f'"{issue["id"]}-{version}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._reply(304, headers={"ETag": etag})
+                return
+            fields = query["fields"].split(",") if query.get("fields") else None
+            projected = project_issue(issue, fields, self.server.url)
+            if "changelog" in query.get("expand", ""):
+                projected["changelog"] = {"startAt": 0, "maxResults": 0, "total": 0, "histories": []}
+            self._reply(200, projected, headers={"ETag": etag})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = self._body()
+        if body is None or not self._admit():
+            return
+
+        if url.path == "/rest/api/2/search":
+            self._search(body.get("jql", ""), body.get("startAt", 0), body.get("maxResults", 50),
+                         body.get("fields"), body.get("validateQuery", "strict"))
+        elif url.path == "/rest/api/2/issue":
+            created, errors = self.server.create_issue(body.get("fields") or {})
+            if errors:
+                self._error(400, "", errors)
+            else:
+                self._reply(201, created)
+        elif url.path == "/rest/api/2/issue/bulk":
+            updates = body.get("issueUpdates") or []
+            if len(updates) > MAX_BULK_CREATE:
+                self._error(400, f"Bulk create is limited to {MAX_BULK_CREATE} issues.")
+                return
+            issues, failures = [], []
+            for position, update in enumerate(updates):
+                created, errors = self.server.create_issue(update.get("fields") or {})
+                if errors:
+                    failures.append({"status": 400, "failedElementNumber": position,
+                                     "elementErrors": {"errorMessages": [], "errors": errors}})
+                else:
+                    issues.append(created)
+            self._reply(201, {"issues": issues, "errors": failures})
+        else:
+            match = ISSUE_PATH.match(url.path)
+            if not match or not match.group(2):
+                self._error(404, "Not found.")
+                return
+            key, action = match.groups()
+            if action == "/comment":
+                self._comment(key, body)
+            else:
+                self._transition(key, body)
+
+    def _comment(self, key: str, body: Dict[str, Any]):
+        with self.server.lock:
+            if key not in self.server.issues:
+                comment = None
+            else:
+                comment = self.server.add_comment(key, body.get("body", ""))
+        if comment is None:
+            self._error(404, "Issue does not exist or you do not have permission to see it.")
+        else:
+            self._reply(201, comment)
+
+    def _transition(self, key: str, body: Dict[str, Any]):
+        transition_id = str((body.get("transition") or {}).get("id"))
+        target = dict(WORKFLOW).get(transition_id)
+        with self.server.lock:
+            issue = self.server.issues.get(key)
+            valid = issue is not None and target is not None and target != issue["fields"]["status"]["name"]
+            if valid:
+                fields = issue["fields"]
+                fields["status"] = {"name": target}
+                fields["resolutiondate"] = jira_timestamp(time.time()) if target in ("Resolved", "Closed") else None
+                for comment in ((body.get("update") or {}).get("comment") or []):
+                    self.server.add_comment(key, (comment.get("add") or {}).get("body", ""))
+                self.server.touch(key)
+
+        if issue is None:
+            self._error(404, "Issue does not exist or you do not have permission to see it.")
+        elif not valid:
+            self._error(400, f"Transition id '{transition_id}' is not valid for this issue.")
+        else:
+            self._reply(204)
+
+    def _search(self, jql: str, start_at: int, max_results: int, fields: Optional[List[str]], validate: str):
+        try:
+            matches = self.server.search(jql, validate)
+        except JQLError as e:
+            self._error(400, str(e))
+            return
+        max_results = min(max_results, MAX_SEARCH_RESULTS)
+        page = [project_issue(issue, fields, self.server.url) for issue in matches[start_at:start_at + max_results]]
+        self._reply(200, {"startAt": start_at, "maxResults": max_results, "total": len(matches), "issues": page})
+
+
+def main():
+    """Run the Jira stand-in until interrupted"""
+    parser = argparse.ArgumentParser(description='Run a local Jira REST stand-in')
+    parser.add_argument('--host', default='127.0.0.1', help='Listen address')
+    parser.add_argument('--port', type=int, default=8080, help='Listen port')
+    parser.add_argument('--username', default='test', help='Accepted username')
+    parser.add_argument('--api-token', default='test-token', help='Accepted API token')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--seed', type=int, help='Random seed for repeatable fault injection')
+    args = parser.parse_args()
+
+    server = FakeJiraServer((args.host, args.port), username=args.username, api_token=args.api_token,
+                            latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                            rate_limit_rate=args.rate_limit_rate, seed=args.seed)
+    print(f"Fake Jira listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"Stored {len(server.issues)} issues after {server.requests} requests")
+
+
+if __name__ == "__main__":
+    main()
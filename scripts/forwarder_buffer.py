@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Forwarder Buffer for SOC Project
+Bounded in-memory batch queue that spills to size-capped disk segments
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+FRAME = struct.Struct(">II")
+SEGMENT_SUFFIX = ".spool"
+
+# (payload, source name, position, seq) as produced by the forwarder
+Batch = Tuple[bytes, str, Dict[str, Any], int]
+
+
+def encode_batch(batch: Batch) -> bytes:
+    """Serialize a batch into one length-prefixed spool record"""
+    payload, source_name, position, seq = batch
+    header = json.dumps({"source": source_name, "position": position, "seq": seq}).encode("utf-8")
+    return FRAME.pack(len(header), len(payload)) + header + payload
+
+
+class SegmentLog:
+    """
+    Append-only FIFO of records stored in fixed-size segment files
+
+    Records are appended to the tail segment and read back from the head
+    segment; a head segment is deleted as soon as it has been read in full.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        # The checkpoint store is the durable record of progress; anything
+        # left in the spool by a previous run will be re-read from source
+        for name in os.listdir(directory):
+            if name.endswith(SEGMENT_SUFFIX):
+                os.remove(os.path.join(directory, name))
+
+        self._head_id = 0
+        self._tail_id = 0
+        self._writer = open(self._segment_path(0), "ab")
+        self._reader = open(self._segment_path(0), "rb")
+
+    def _segment_path(self, segment_id: int) -> str:
+        return os.path.join(self.directory, f"segment-{segment_id:012d}{SEGMENT_SUFFIX}")
+
+    def append(self, record: bytes):
+        if self._writer.tell() and self._writer.tell() + len(record) > self.segment_bytes:
+            self._writer.close()
+            self._tail_id += 1
+            self._writer = open(self._segment_path(self._tail_id), "ab")
+        self._writer.write(record)
+        self._writer.flush()
+
+    def pop(self) -> Tuple[Batch, int]:
+        """Read the oldest record and its size; the caller guarantees one is available"""
+        frame = self._reader.read(FRAME.size)
+        while not frame and self._head_id < self._tail_id:
+            self._reader.close()
+            os.remove(self._segment_path(self._head_id))
+            self._head_id += 1
+            self._reader = open(self._segment_path(self._head_id), "rb")
+            frame = self._reader.read(FRAME.size)
+
+        header_len, payload_len = FRAME.unpack(frame)
+        header = json.loads(self._reader.read(header_len))
+        payload = self._reader.read(payload_len)
+        return (payload, header["source"], header["position"], header["seq"]), FRAME.size + header_len + payload_len
+
+    def close(self):
+        self._writer.close()
+        self._reader.close()
+        for segment_id in range(self._head_id, self._tail_id + 1):
+            path = self._segment_path(segment_id)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class SpillQueue:
+    """
+    FIFO of forwarder batches with bounded memory
+
+    Batches are held in memory up to max_memory_bytes. Beyond that they
+    spill to disk segments up to max_disk_bytes, and once both are full
+    put() blocks, which stalls the reader instead of dropping data. While
+    anything is on disk, new batches also go to disk so that get() always
+    returns batches in the order they were queued.
+    """
+
+    def __init__(self,
+                 spool_dir: str,
+                 max_memory_bytes: int = 64 * 1024 * 1024,
+                 max_disk_bytes: int = 1024 * 1024 * 1024,
+                 segment_bytes: int = 16 * 1024 * 1024,
+                 rate_window: float = 60.0):
+        """
+        Initialize spill queue
+
+        Args:
+            spool_dir: Directory for disk segments
+            max_memory_bytes: Payload bytes held in memory before spilling
+            max_disk_bytes: Spooled bytes allowed on disk before blocking
+            segment_bytes: Target size of each segment file
+            rate_window: Seconds of history used for the drain rate
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.rate_window = rate_window
+
+        self._cond = threading.Condition()
+        self._memory: deque = deque()
+        self._memory_bytes = 0
+        self._disk = SegmentLog(spool_dir, segment_bytes)
+        self._disk_batches = 0
+        self._disk_bytes = 0
+        self._closed = False
+
+        self._enqueued = 0
+        self._dequeued = 0
+        self._spilled = 0
+        self._blocked_seconds = 0.0
+        self._started = time.monotonic()
+        self._drained: deque = deque()
+
+    def put(self, batch: Batch):
+        """
+        Queue a batch, blocking while memory and disk are both full
+
+        Args:
+            batch: (payload, source name, position, seq) tuple
+        """
+        payload = batch[0]
+        with self._cond:
+            if not self._disk_batches and self._memory_bytes + len(payload) <= self.max_memory_bytes:
+                self._memory.append(batch)
+                self._memory_bytes += len(payload)
+            else:
+                record = encode_batch(batch)
+                blocked_at = None
+                # An oversized record is still admitted into an empty
+                # spool so that it cannot block the reader forever
+                while self._disk_bytes and self._disk_bytes + len(record) > self.max_disk_bytes:
+                    if blocked_at is None:
+                        blocked_at = time.monotonic()
+                    self._cond.wait()
+                if blocked_at is not None:
+                    self._blocked_seconds += time.monotonic() - blocked_at
+
+                if not self._disk_batches and self._memory_bytes + len(payload) <= self.max_memory_bytes:
+                    self._memory.append(batch)
+                    self._memory_bytes += len(payload)
+                else:
+                    self._disk.append(record)
+                    self._disk_batches += 1
+                    self._disk_bytes += len(record)
+                    self._spilled += 1
+
+            self._enqueued += 1
+            self._cond.notify_all()
+
+    def get(self, block: bool = True) -> Optional[Batch]:
+        """
+        Take the oldest batch
+
+        Args:
+            block: Wait until a batch is available
+
+        Returns:
+            (payload, source name, position, seq) tuple, or None if the queue is empty
+            and either closed or block is False
+        """
+        with self._cond:
+            while not self._memory and not self._disk_batches:
+                if self._closed or not block:
+                    return None
+                self._cond.wait()
+
+            if self._memory:
+                batch = self._memory.popleft()
+                self._memory_bytes -= len(batch[0])
+            else:
+                batch, size = self._disk.pop()
+                self._disk_batches -= 1
+                self._disk_bytes -= size
+
+            self._dequeued += 1
+            now = time.monotonic()
+            self._drained.append((now, len(batch[0])))
+            while self._drained and self._drained[0][0] < now - self.rate_window:
+                self._drained.popleft()
+
+            self._cond.notify_all()
+            return batch
+
+    def close(self):
+        """Stop accepting batches; get() returns None once the queue drains"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def cleanup(self):
+        """Remove spool files once all consumers have stopped"""
+        self._disk.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot queue depth and drain rate
+
+        Returns:
+            Metrics dictionary
+        """
+        with self._cond:
+            now = time.monotonic()
+            window = min(self.rate_window, max(now - self._started, 1e-9))
+            recent = [entry for entry in self._drained if entry[0] >= now - window]
+            return {
+                "memory_batches": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_batches": self._disk_batches,
+                "disk_bytes": self._disk_bytes,
+                "depth": len(self._memory) + self._disk_batches,
+                "enqueued_total": self._enqueued,
+                "dequeued_total": self._dequeued,
+                "spilled_total": self._spilled,
+                "blocked_seconds": round(self._blocked_seconds, 3),
+                "drain_batches_per_sec": round(len(recent) / window, 3),
+                "drain_bytes_per_sec": round(sum(size for _t, size in recent) / window, 1)
+            }
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Forwarder Checkpoint Store for SOC Project
+Persists per-source read positions so the HEC forwarder resumes where it left off
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+
+class CheckpointStore:
+    def __init__(self, path: str):
+        """
+        Initialize checkpoint store
+
+        Args:
+            path: JSON file holding checkpoints for all sources
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        self._sources: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load checkpoints from disk, starting fresh if the file is missing or unreadable"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                return json.load(handle).get("sources", {})
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Ignoring unreadable checkpoint file {self.path}: {str(e)}")
+            return {}
+
+    def get(self, source_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the last committed position for a source
+
+        Args:
+            source_name: Log source name
+
+        Returns:
+            Position dictionary (cursor, offset, last_event_id) or None
+        """
+        with self._lock:
+            checkpoint = self._sources.get(source_name)
+            return dict(checkpoint) if checkpoint else None
+
+    def update(self, source_name: str, position: Dict[str, Any]):
+        """
+        Commit a new position for a source and persist it
+
+        Args:
+            source_name: Log source name
+            position: Position dictionary (cursor, offset, last_event_id)
+        """
+        with self._lock:
+            self._sources[source_name] = dict(position, updated=time.time())
+            self._save()
+
+    def _save(self):
+        """Write checkpoints atomically so a crash never leaves a torn file"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"version": 1, "sources": self._sources}, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class CheckpointTracker:
+    """
+    Advances one source's checkpoint as batches are delivered
+
+    Batches are sent in parallel and can complete out of order, so the
+    checkpoint only moves past a batch once every earlier batch has also
+    been delivered. A failed batch holds the checkpoint back; on restart
+    the forwarder resumes from it and resends the batches that followed.
+    """
+
+    def __init__(self, store: CheckpointStore, source_name: str):
+        self.store = store
+        self.source_name = source_name
+        self._lock = threading.Lock()
+        self._next_seq = 0
+        self._commit_seq = 0
+        self._delivered: Dict[int, Dict[str, Any]] = {}
+
+    def register(self) -> int:
+        """
+        Reserve a sequence number for the next batch
+
+        Returns:
+            Batch sequence number
+        """
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            return seq
+
+    def complete(self, seq: int, position: Dict[str, Any], delivered: bool):
+        """
+        Record the outcome of a batch
+
+        Args:
+            seq: Batch sequence number from register()
+            position: Source position just after the batch's last record
+            delivered: Whether HEC durably accepted the batch
+        """
+        if not delivered:
+            return
+
+        with self._lock:
+            self._delivered[seq] = position
+            latest = None
+            while self._commit_seq in self._delivered:
+                latest = self._delivered.pop(self._commit_seq)
+                self._commit_seq += 1
+
+            # Persist under the lock so concurrent completions cannot
+            # write an older position over a newer one
+            if latest is not None:
+                self.store.update(self.source_name, latest)
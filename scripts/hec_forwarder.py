@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""
+Splunk HEC Log Forwarder for SOC Project
+Streams cloud log records to Splunk via the HTTP Event Collector (HEC)
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from adaptive_batching import AIMDController, CONNECTION_ERROR
+from forwarder_buffer import SpillQueue
+from forwarder_checkpoint import CheckpointStore, CheckpointTracker
+import json_codec
+from log_sources import LogSource, CloudTrailFileSource, AzureActivityFileSource, GCPAuditFileSource
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def parse_event_time(value: Any) -> Optional[float]:
+    """
+    Convert a record timestamp into epoch seconds for the HEC envelope
+
+    Args:
+        value: ISO-8601 string, epoch seconds, or None
+
+    Returns:
+        Epoch seconds or None if the value cannot be parsed
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def build_hec_event(record: Dict[str, Any],
+                    source: LogSource,
+                    index: Optional[str] = None,
+                    host: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Wrap a raw record in a HEC event envelope
+
+    The raw record is sent as the event body and the source's normalized
+    common fields as HEC indexed fields, so detections can search on
+    src_ip, user and event_type regardless of cloud.
+
+    Args:
+        record: Raw log record
+        source: Source the record was read from
+        index: Optional target Splunk index
+        host: Optional host field value
+
+    Returns:
+        HEC event dictionary
+    """
+    envelope = {
+        "event": record,
+        "source": source.name,
+        "sourcetype": source.sourcetype,
+        "fields": {field: value for field, value in source.normalize(record).items() if value is not None}
+    }
+
+    event_time = parse_event_time(source.event_time(record))
+    if event_time is not None:
+        envelope["time"] = event_time
+    if index:
+        envelope["index"] = index
+    if host:
+        envelope["host"] = host
+
+    return envelope
+
+
+class HECSender:
+    def __init__(self,
+                 hec_url: str,
+                 token: str,
+                 verify: bool = True,
+                 timeout: float = 30.0,
+                 max_retries: Optional[int] = None,
+                 max_backoff: float = 30.0,
+                 compress_level: int = 6,
+                 ack_timeout: float = 60.0,
+                 observer: Optional[AIMDController] = None):
+        """
+        Initialize HEC sender
+
+        Args:
+            hec_url: HEC base URL (e.g., https://splunk.example.com:8088)
+            token: HEC token
+            verify: Verify the server TLS certificate
+            timeout: Per-request timeout in seconds
+            max_retries: Retries for throttled or failed requests; None
+                retries until HEC accepts or rejects the batch
+            max_backoff: Maximum seconds between retries
+            compress_level: gzip compression level for request bodies
+            ack_timeout: Seconds to wait for an indexer acknowledgment
+            observer: Optional controller fed with every request's latency and status
+        """
+        self.hec_url = hec_url.rstrip('/')
+        self.endpoint = f"{self.hec_url}/services/collector/event"
+        self.ack_endpoint = f"{self.hec_url}/services/collector/ack"
+        self.token = token
+        self.verify = verify
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        self.compress_level = compress_level
+        self.ack_timeout = ack_timeout
+        self.observer = observer
+        # A channel is required when the HEC token has indexer
+        # acknowledgment enabled and is ignored otherwise
+        self.channel = str(uuid.uuid4())
+        self._local = threading.local()
+        self.logger = logging.getLogger(__name__)
+
+    def _session(self) -> requests.Session:
+        """Return the calling thread's keep-alive session"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            session.verify = self.verify
+            session.headers.update({
+                "Authorization": f"Splunk {self.token}",
+                "Content-Type": "application/json",
+                "Content-Encoding": "gzip",
+                "X-Splunk-Request-Channel": self.channel
+            })
+            self._local.session = session
+        return session
+
+    def send(self, payload: bytes) -> bool:
+        """
+        Send one batch of newline-delimited HEC events
+
+        Args:
+            payload: Uncompressed batch body
+
+        Returns:
+            True if HEC accepted the batch (and, when indexer acknowledgment
+            is enabled, the indexers confirmed it), False otherwise
+        """
+        body = gzip.compress(payload, compresslevel=self.compress_level)
+        session = self._session()
+
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                response = session.post(self.endpoint, data=body, timeout=self.timeout)
+                self._observe(started, payload, response.status_code)
+                if response.status_code == 200:
+                    ack_id = self._ack_id(response)
+                    if ack_id is None:
+                        return True
+                    return self._wait_for_ack(session, ack_id)
+                if response.status_code == 413 and b"\n" in payload:
+                    # Batch exceeds the HEC max_content_length; send it in halves
+                    self.logger.warning("HEC rejected batch as too large, splitting")
+                    lines = payload.split(b"\n")
+                    half = len(lines) // 2
+                    return self.send(b"\n".join(lines[:half])) and self.send(b"\n".join(lines[half:]))
+                if response.status_code not in RETRY_STATUS_CODES:
+                    self.logger.error(f"HEC rejected batch: {response.status_code} - {response.text}")
+                    return False
+                self.logger.warning(f"HEC returned {response.status_code}, retrying")
+            except requests.RequestException as e:
+                self._observe(started, payload, CONNECTION_ERROR)
+                self.logger.warning(f"HEC request failed: {str(e)}")
+
+            if self.max_retries is not None and attempt >= self.max_retries:
+                self.logger.error("Giving up on batch after retries")
+                return False
+            # Keep retrying through an outage; the forwarder's buffer absorbs
+            # new batches and eventually pauses the reader meanwhile
+            time.sleep(min(2 ** attempt, self.max_backoff))
+            attempt += 1
+
+    def _observe(self, started: float, payload: bytes, status: int):
+        """Report a request outcome to the observer, if any"""
+        if self.observer:
+            self.observer.record(time.monotonic() - started, len(payload), status)
+
+    def _ack_id(self, response: requests.Response) -> Optional[int]:
+        """Return the ackId of an accepted batch, or None if acknowledgment is disabled"""
+        try:
+            return json_codec.loads(response.content).get("ackId")
+        except ValueError:
+            return None
+
+    def _wait_for_ack(self, session: requests.Session, ack_id: int) -> bool:
+        """
+        Poll HEC until the indexers acknowledge a batch
+
+        Args:
+            session: Session of the thread that sent the batch
+            ack_id: ackId returned for the batch
+
+        Returns:
+            True if acknowledged before ack_timeout, False otherwise
+        """
+        deadline = time.monotonic() + self.ack_timeout
+        interval = 0.1
+
+        while time.monotonic() < deadline:
+            try:
+                response = session.post(
+                    self.ack_endpoint,
+                    params={"channel": self.channel},
+                    data=gzip.compress(json_codec.dumps({"acks": [ack_id]})),
+                    timeout=self.timeout
+                )
+                if response.status_code == 200 and json_codec.loads(response.content).get("acks", {}).get(str(ack_id)):
+                    return True
+            except (requests.RequestException, ValueError) as e:
+                self.logger.warning(f"HEC ack poll failed: {str(e)}")
+
+            time.sleep(interval)
+            interval = min(interval * 2, 2.0)
+
+        self.logger.error(f"Timed out waiting for HEC ack {ack_id}")
+        return False
+
+
+class HECForwarder:
+    def __init__(self,
+                 sender: HECSender,
+                 batch_events: int = 500,
+                 batch_bytes: int = 1_000_000,
+                 workers: int = 4,
+                 index: Optional[str] = None,
+                 host: Optional[str] = None,
+                 checkpoints: Optional[CheckpointStore] = None,
+                 spool_dir: Optional[str] = None,
+                 max_memory_bytes: int = 64 * 1024 * 1024,
+                 max_disk_bytes: int = 1024 * 1024 * 1024,
+                 metrics_interval: float = 30.0,
+                 controller: Optional[AIMDController] = None):
+        """
+        Initialize HEC forwarder
+
+        Args:
+            sender: HEC sender used by all worker threads
+            batch_events: Maximum events per batch
+            batch_bytes: Maximum uncompressed bytes per batch
+            workers: Number of parallel sender threads
+            index: Optional target Splunk index
+            host: Optional host field value
+            checkpoints: Optional store used to resume sources across runs
+            spool_dir: Directory for the disk buffer (temporary if None)
+            max_memory_bytes: Batch bytes buffered in memory before spilling to disk
+            max_disk_bytes: Batch bytes buffered on disk before the reader is paused
+            metrics_interval: Seconds between buffer metrics log lines
+            controller: Optional AIMD controller that overrides batch_events,
+                batch_bytes and workers at run time; the sender should use
+                the same controller as its observer
+        """
+        self.sender = sender
+        self.batch_events = batch_events
+        self.batch_bytes = batch_bytes
+        self.workers = workers
+        self.index = index
+        self.host = host
+        self.checkpoints = checkpoints
+        self.spool_dir = spool_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.metrics_interval = metrics_interval
+        self.controller = controller
+        self.logger = logging.getLogger(__name__)
+
+        self.queue: Optional[SpillQueue] = None
+        self._stats_lock = threading.Lock()
+        self.stats = {"events": 0, "batches": 0, "failed_batches": 0, "bytes": 0, "source_errors": 0}
+
+    def _drain(self, queue: SpillQueue, trackers: Dict[str, CheckpointTracker]):
+        """Worker loop: send queued batches until the queue is closed and empty"""
+        while True:
+            batch = queue.get()
+            if batch is None:
+                return
+
+            payload, source_name, position, seq = batch
+            completions = [(source_name, seq, position)]
+            if self.controller:
+                payload = self._coalesce(queue, payload, completions)
+                self.controller.acquire()
+            try:
+                ok = self.sender.send(payload)
+            finally:
+                if self.controller:
+                    self.controller.release()
+            for source_name, seq, position in completions:
+                if source_name in trackers:
+                    trackers[source_name].complete(seq, position, ok)
+            with self._stats_lock:
+                if ok:
+                    self.stats["events"] += payload.count(b"\n") + 1
+                    self.stats["batches"] += 1
+                    self.stats["bytes"] += len(payload)
+                else:
+                    self.stats["failed_batches"] += 1
+
+    def _coalesce(self, queue: SpillQueue, payload: bytes, completions: List) -> bytes:
+        """
+        Merge queued batches into one request up to the controller's limits
+
+        Batches are cut when they are queued, which may be long before they
+        are sent; merging at send time lets a backlog that was queued with
+        small limits drain at the size the controller has since grown to.
+        """
+        max_events, max_bytes = self.controller.limits()
+        parts = [payload]
+        events = payload.count(b"\n") + 1
+        size = len(payload)
+
+        while events < max_events and size < max_bytes:
+            batch = queue.get(block=False)
+            if batch is None:
+                break
+            completions.append((batch[1], batch[3], batch[2]))
+            parts.append(batch[0])
+            events += batch[0].count(b"\n") + 1
+            size += len(batch[0]) + 1
+
+        return b"\n".join(parts)
+
+    def _batch_limits(self):
+        """Return the (events, bytes) limits for the next batch"""
+        if self.controller:
+            return self.controller.limits()
+        return self.batch_events, self.batch_bytes
+
+    def _report_metrics(self, stop: threading.Event):
+        """Log buffer metrics periodically while forwarding"""
+        while not stop.wait(self.metrics_interval):
+            self.logger.info(f"Forwarder buffer: {json.dumps(self.buffer_metrics())}")
+            if self.controller:
+                self.logger.info(f"Forwarder batching: {json.dumps(self.controller.metrics())}")
+
+    def buffer_metrics(self) -> Dict[str, Any]:
+        """
+        Get queue depth and drain rate of the active buffer
+
+        Returns:
+            Metrics dictionary, empty when no forwarding is in progress
+        """
+        return self.queue.metrics() if self.queue else {}
+
+    def forward(self, source: LogSource) -> Dict[str, Any]:
+        """
+        Stream all records from a single source to HEC
+
+        Args:
+            source: Log source to read from
+
+        Returns:
+            Forwarding statistics
+        """
+        return self.forward_all([source])
+
+    def _read_source(self,
+                     source: LogSource,
+                     queue: SpillQueue,
+                     tracker: Optional[CheckpointTracker],
+                     checkpoint: Optional[Dict[str, Any]]):
+        """Reader thread: batch one source's records into the shared queue"""
+        lines: List[bytes] = []
+        size = 0
+        last_position: Dict[str, Any] = {}
+        batch_events, batch_bytes = self._batch_limits()
+
+        try:
+            for position, record in source.read_from(checkpoint):
+                event = build_hec_event(record, source, self.index, self.host)
+                line = json_codec.dumps(event)
+
+                if lines and (len(lines) >= batch_events or size + len(line) > batch_bytes):
+                    seq = tracker.register() if tracker else 0
+                    queue.put((b"\n".join(lines), source.name, last_position, seq))
+                    lines, size = [], 0
+                    batch_events, batch_bytes = self._batch_limits()
+
+                lines.append(line)
+                size += len(line) + 1
+                last_position = position
+        except Exception as e:
+            # Records read before the error are still queued below; the
+            # checkpoint stops there and the next run retries the rest
+            self.logger.error(f"Error reading {source.name}: {str(e)}")
+            with self._stats_lock:
+                self.stats["source_errors"] += 1
+
+        if lines:
+            seq = tracker.register() if tracker else 0
+            queue.put((b"\n".join(lines), source.name, last_position, seq))
+
+    def forward_all(self, sources: List[LogSource]) -> Dict[str, Any]:
+        """
+        Stream records from several sources to HEC in parallel
+
+        Each source is read and normalized in its own thread; all of them
+        feed one spill queue drained by a shared pool of sender threads.
+        Sender threads drain the queue while HEC is healthy, and while HEC
+        is slow or down the queue grows into the disk buffer and then
+        pauses the readers. When a checkpoint store is configured, each
+        source resumes after its last delivered record and its checkpoint
+        advances as batches are delivered.
+
+        Args:
+            sources: Log sources to read from; names must be unique
+
+        Returns:
+            Forwarding statistics
+        """
+        trackers: Dict[str, CheckpointTracker] = {}
+        checkpoints: Dict[str, Optional[Dict[str, Any]]] = {}
+        for source in sources:
+            checkpoints[source.name] = None
+            if self.checkpoints:
+                trackers[source.name] = CheckpointTracker(self.checkpoints, source.name)
+                checkpoint = self.checkpoints.get(source.name)
+                checkpoints[source.name] = checkpoint
+                if checkpoint:
+                    self.logger.info(f"Resuming {source.name} from {checkpoint.get('cursor')} "
+                                     f"offset {checkpoint.get('offset')}")
+
+        spool_dir = self.spool_dir or tempfile.mkdtemp(prefix="hec_spool_")
+        queue = SpillQueue(spool_dir, self.max_memory_bytes, self.max_disk_bytes)
+        self.queue = queue
+
+        # With a controller, start enough threads for its upper bound and
+        # let its concurrency limit decide how many send at once
+        workers = self.controller.max_concurrency if self.controller else self.workers
+        senders = [threading.Thread(target=self._drain, args=(queue, trackers), daemon=True)
+                   for _ in range(workers)]
+        for thread in senders:
+            thread.start()
+        stop_reporting = threading.Event()
+        reporter = threading.Thread(target=self._report_metrics, args=(stop_reporting,), daemon=True)
+        reporter.start()
+
+        readers = [threading.Thread(target=self._read_source,
+                                    args=(source, queue, trackers.get(source.name), checkpoints[source.name]),
+                                    name=f"reader-{source.name}", daemon=True)
+                   for source in sources]
+        try:
+            for thread in readers:
+                thread.start()
+            for thread in readers:
+                thread.join()
+        finally:
+            queue.close()
+            for thread in senders:
+                thread.join()
+            stop_reporting.set()
+            reporter.join()
+
+            stats = dict(self.stats, buffer=queue.metrics())
+            if self.controller:
+                stats["batching"] = self.controller.metrics()
+            queue.cleanup()
+            if not self.spool_dir:
+                shutil.rmtree(spool_dir, ignore_errors=True)
+            self.queue = None
+
+        self.logger.info(f"Forwarded {stats['events']} events from {len(sources)} sources "
+                         f"in {stats['batches']} batches ({stats['failed_batches']} failed)")
+        return stats
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Forward cloud audit log exports to Splunk HEC')
+
+    parser.add_argument('--cloudtrail-path', '--path', help='AWS CloudTrail log file or directory')
+    parser.add_argument('--azure-path', help='Azure Activity Log export file or directory')
+    parser.add_argument('--gcp-path', help='GCP Cloud Audit Log export file or directory')
+    parser.add_argument('--hec-url', default=os.getenv("SPLUNK_HEC_URL"), help='Splunk HEC base URL')
+    parser.add_argument('--hec-token', default=os.getenv("SPLUNK_HEC_TOKEN"), help='Splunk HEC token')
+    parser.add_argument('--index', help='Target Splunk index')
+    parser.add_argument('--batch-events', type=int, default=500, help='Maximum events per batch')
+    parser.add_argument('--batch-bytes', type=int, default=1_000_000, help='Maximum bytes per batch')
+    parser.add_argument('--workers', type=int, default=4, help='Parallel sender threads')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Tune batch size and concurrency from observed latency and errors')
+    parser.add_argument('--max-batch-events', type=int, default=5000, help='Upper bound for adaptive batch events')
+    parser.add_argument('--max-batch-bytes', type=int, default=5 * 1024 * 1024, help='Upper bound for adaptive batch bytes')
+    parser.add_argument('--max-workers', type=int, default=8, help='Upper bound for adaptive concurrency')
+    parser.add_argument('--target-latency', type=float, default=2.0, help='Adaptive target round-trip seconds')
+    parser.add_argument('--checkpoint-file', default=os.getenv("HEC_CHECKPOINT_FILE", "hec_forwarder_checkpoint.json"),
+                        help='File used to resume forwarding across runs')
+    parser.add_argument('--spool-dir', default='hec_forwarder_spool', help='Directory for the disk buffer')
+    parser.add_argument('--max-memory-mb', type=int, default=64, help='In-memory buffer size before spilling to disk')
+    parser.add_argument('--max-disk-mb', type=int, default=1024, help='Disk buffer size before pausing the reader')
+    parser.add_argument('--insecure', action='store_true', help='Skip TLS certificate verification')
+
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    logging.basicConfig(level=logging.INFO)
+    args = parse_arguments()
+
+    if not all([args.hec_url, args.hec_token]):
+        print("Please set SPLUNK_HEC_URL and SPLUNK_HEC_TOKEN or pass --hec-url and --hec-token")
+        return 1
+
+    sources = []
+    if args.cloudtrail_path:
+        sources.append(CloudTrailFileSource(args.cloudtrail_path))
+    if args.azure_path:
+        sources.append(AzureActivityFileSource(args.azure_path))
+    if args.gcp_path:
+        sources.append(GCPAuditFileSource(args.gcp_path))
+    if not sources:
+        print("Please pass at least one of --cloudtrail-path, --azure-path or --gcp-path")
+        return 1
+
+    controller = None
+    if args.adaptive:
+        controller = AIMDController(
+            min_batch_events=min(args.batch_events, args.max_batch_events),
+            max_batch_events=args.max_batch_events,
+            min_batch_bytes=min(64 * 1024, args.max_batch_bytes),
+            max_batch_bytes=args.max_batch_bytes,
+            max_concurrency=args.max_workers,
+            target_latency=args.target_latency
+        )
+
+    sender = HECSender(args.hec_url, args.hec_token, verify=not args.insecure, observer=controller)
+    forwarder = HECForwarder(
+        sender,
+        batch_events=args.batch_events,
+        batch_bytes=args.batch_bytes,
+        workers=args.workers,
+        index=args.index,
+        checkpoints=CheckpointStore(args.checkpoint_file),
+        spool_dir=args.spool_dir,
+        max_memory_bytes=args.max_memory_mb * 1024 * 1024,
+        max_disk_bytes=args.max_disk_mb * 1024 * 1024,
+        controller=controller
+    )
+
+    stats = forwarder.forward_all(sources)
+    print(json.dumps(stats))
+    return 0 if stats["failed_batches"] == 0 and stats["source_errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
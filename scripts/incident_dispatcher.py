@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Incident Dispatcher for SOC Project
+Severity-ordered dispatch queue with aging and reserved workers in front of JiraIntegration
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+
+from alert_records import Incident
+
+if TYPE_CHECKING:
+    from jira_integration import JiraIntegration
+
+# Dispatch rank per severity; lower goes first
+SEVERITY_RANKS = {"Critical": 0, "High": 1, "Medium": 2, "Low": 3}
+DEFAULT_RANK = SEVERITY_RANKS["Medium"]
+
+# Workers held back for a severity, so a backlog of lower severities
+# cannot take every worker
+DEFAULT_RESERVATIONS = {"Critical": 2, "High": 1}
+
+
+class IncidentDispatcher:
+    """
+    Create incidents in Jira by severity instead of arrival order
+
+    Each queued incident is keyed by enqueue time + rank * aging, so a
+    Critical incident goes ahead of Low ones that arrived up to 3 * aging
+    seconds earlier, and anything that has waited that long goes ahead
+    of new arrivals (no starvation). Every severity has its own heap; a
+    free worker takes the lowest key among the heads it may run.
+
+    `workers - sum(reservations)` workers are shared by all severities;
+    the rest only run incidents of the severity they are reserved for.
+
+    Args:
+        jira: Jira integration used by the workers
+        workers: Worker threads (concurrent Jira requests)
+        reservations: Severity -> workers reserved for it
+        aging: Seconds of waiting worth one severity level
+    """
+
+    def __init__(self,
+                 jira: "JiraIntegration",
+                 workers: int = 8,
+                 reservations: Optional[Dict[str, int]] = None,
+                 aging: float = 30.0):
+        self.jira = jira
+        self.workers = workers
+        self.reservations = dict(DEFAULT_RESERVATIONS if reservations is None else reservations)
+        self.shared_slots = workers - sum(self.reservations.values())
+        if self.shared_slots < 1:
+            raise ValueError(f"Reservations ({sum(self.reservations.values())}) must leave at least one of "
+                             f"{workers} workers shared")
+        self.aging = aging
+
+        self._queues: Dict[str, List[Tuple[float, int, float, Incident, Optional[str], Future]]] = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._shared_active = 0
+        self._reserved_active = {severity: 0 for severity in self.reservations}
+        self._closed = False
+        self._stats = {"submitted": 0, "created": 0, "failed": 0, "cancelled": 0}
+        self._waits: Dict[str, Tuple[int, float, float]] = {}
+
+        self.logger = logging.getLogger(__name__)
+        self._threads = [threading.Thread(target=self._worker, name=f"incident-dispatch-{number}", daemon=True)
+                         for number in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, incident: Incident, comment: Optional[str] = None) -> Future:
+        """
+        Queue an incident for creation
+
+        Args:
+            incident: Incident to create
+            comment: Optional comment added once the issue exists
+
+        Returns:
+            Future resolving to the issue key (None if creation failed)
+        """
+        future: Future = Future()
+        now = time.monotonic()
+        key = now + SEVERITY_RANKS.get(incident.severity, DEFAULT_RANK) * self.aging
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Dispatcher is closed")
+            heapq.heappush(self._queues.setdefault(incident.severity, []),
+                           (key, next(self._sequence), now, incident, comment, future))
+            self._stats["submitted"] += 1
+            self._condition.notify()
+        return future
+
+    def _next(self) -> Optional[Tuple[str, bool, Tuple[float, int, float, Incident, Optional[str], Future]]]:
+        """Pop the next runnable entry; called with the condition held"""
+        best = None
+        for severity, queue in self._queues.items():
+            if not queue:
+                continue
+            reserved = self._reserved_active.get(severity, 0) < self.reservations.get(severity, 0)
+            if not reserved and self._shared_active >= self.shared_slots:
+                continue
+            if best is None or queue[0] < self._queues[best[0]][0]:
+                best = (severity, reserved)
+        if best is None:
+            return None
+
+        severity, reserved = best
+        # Prefer the reserved slot, keeping shared slots for other severities
+        if reserved:
+            self._reserved_active[severity] += 1
+        else:
+            self._shared_active += 1
+        return severity, reserved, heapq.heappop(self._queues[severity])
+
+    def _worker(self):
+        """Worker thread: create queued incidents until closed and drained"""
+        while True:
+            with self._condition:
+                selected = self._next()
+                while selected is None:
+                    if self._closed and not any(self._queues.values()):
+                        # Let every other idle worker see the drained queue too
+                        self._condition.notify_all()
+                        return
+                    self._condition.wait()
+                    selected = self._next()
+
+            severity, reserved, (_key, _sequence, queued_at, incident, comment, future) = selected
+            started = time.monotonic()
+            outcome = "failed"
+            try:
+                if future.set_running_or_notify_cancel():
+                    issue_key = self.jira.create_incident(incident, comment)
+                    future.set_result(issue_key)
+                    if issue_key:
+                        outcome = "created"
+                else:
+                    # Cancelled by the caller while queued; never sent to Jira
+                    outcome = "cancelled"
+            except Exception as e:
+                self.logger.error(f"Error dispatching incident: {str(e)}")
+                future.set_exception(e)
+            finally:
+                with self._condition:
+                    if reserved:
+                        self._reserved_active[severity] -= 1
+                    else:
+                        self._shared_active -= 1
+                    self._stats[outcome] += 1
+                    if outcome != "cancelled":
+                        count, total, longest = self._waits.get(severity, (0, 0.0, 0.0))
+                        wait = started - queued_at
+                        self._waits[severity] = (count + 1, total + wait, max(longest, wait))
+                    # A freed slot may let any idle worker run a different
+                    # severity, or exit once closed and drained
+                    self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue and dispatch statistics
+
+        Returns:
+            Counts (incidents cancelled while queued are counted as
+            "cancelled", not "failed"), queue depth per severity, active
+            workers and queue wait (mean/max seconds) per severity of the
+            incidents dispatched
+        """
+        with self._condition:
+            return {
+                **self._stats,
+                "queued": {severity: len(queue) for severity, queue in self._queues.items() if queue},
+                "active": {"shared": self._shared_active, **self._reserved_active},
+                "wait_seconds": {severity: {"mean": round(total / count, 4), "max": round(longest, 4)}
+                                 for severity, (count, total, longest) in self._waits.items()}
+            }
+
+    def close(self, wait: bool = True):
+        """
+        Stop accepting incidents; queued incidents are still created
+
+        Args:
+            wait: Block until the queue is drained
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self) -> "IncidentDispatcher":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Incident Spool for SOC Project
+Local append-only spool of incidents that could not reach Jira, replayed once Jira is back
+"""
+
+import argparse
+import fcntl
+import logging
+import os
+import time
+from typing import Dict, Any, Callable, List, Optional
+
+import json_codec
+
+
+class IncidentSpool:
+    """
+    Newline-delimited JSON spool of pending Jira issues
+
+    Appends from concurrent alert processes are serialized with a lock
+    file. A replay first moves the spool aside, so new incidents keep
+    being spooled while it runs, and a replay interrupted halfway is
+    resumed by the next one.
+
+    Args:
+        path: Spool file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.replay_path = path + ".replaying"
+        self.rejected_path = path + ".rejected"
+        self.logger = logging.getLogger(__name__)
+
+    def _append(self, path: str, entries: List[Dict[str, Any]]):
+        """Append entries to a spool file under the lock"""
+        if not entries:
+            return
+        data = b"".join(json_codec.dumps(entry) + b"\n" for entry in entries)
+        with open(self.path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            with open(path, "ab") as handle:
+                handle.write(data)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def _restore(self, entries: List[Dict[str, Any]]):
+        """Put unreplayed entries back at the head of the spool and end the replay"""
+        with open(self.path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if entries:
+                try:
+                    with open(self.path, "rb") as handle:
+                        newer = handle.read()
+                except FileNotFoundError:
+                    newer = b""
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as handle:
+                    handle.write(b"".join(json_codec.dumps(entry) + b"\n" for entry in entries) + newer)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(tmp_path, self.path)
+            if os.path.exists(self.replay_path):
+                os.remove(self.replay_path)
+
+    def append(self, issue: Dict[str, Any], comment: Optional[str] = None):
+        """
+        Spool one issue
+
+        Args:
+            issue: Jira create-issue request body
+            comment: Comment to add once the issue exists
+        """
+        self._append(self.path, [{"spooled_at": time.time(), "issue": issue, "comment": comment}])
+
+    def pending(self) -> int:
+        """Count spooled entries, including an unfinished replay"""
+        count = 0
+        for path in (self.path, self.replay_path):
+            try:
+                with open(path, "rb") as handle:
+                    count += sum(1 for line in handle if line.strip())
+            except FileNotFoundError:
+                continue
+        return count
+
+    def replay(self, handler: Callable[[Dict[str, Any]], Optional[bool]]) -> Dict[str, int]:
+        """
+        Hand spooled entries to a handler, oldest first
+
+        The handler returns True once the entry is in Jira, False if Jira
+        is still unavailable (the replay stops and the rest stays spooled)
+        and None if Jira rejected it (it moves to the .rejected file).
+
+        Args:
+            handler: Function creating one entry in Jira
+
+        Returns:
+            Counts of created, rejected and remaining entries
+        """
+        counts = {"created": 0, "rejected": 0, "remaining": 0}
+        with open(self.path + ".replay.lock", "w") as replay_lock:
+            try:
+                fcntl.flock(replay_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self.logger.info("Spool replay already running")
+                counts["remaining"] = self.pending()
+                return counts
+
+            with open(self.path + ".lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                if not os.path.exists(self.replay_path) and os.path.exists(self.path):
+                    os.replace(self.path, self.replay_path)
+
+            try:
+                with open(self.replay_path, "rb") as handle:
+                    entries = [json_codec.loads(line) for line in handle if line.strip()]
+            except FileNotFoundError:
+                entries = []
+
+            rejected = []
+            for position, entry in enumerate(entries):
+                outcome = handler(entry)
+                if outcome is False:
+                    break
+                if outcome is None:
+                    rejected.append(entry)
+                    counts["rejected"] += 1
+                else:
+                    counts["created"] += 1
+            else:
+                position = len(entries)
+
+            self._append(self.rejected_path, rejected)
+            self._restore(entries[position:])
+
+        counts["remaining"] = self.pending()
+        return counts
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Replay spooled incidents into Jira')
+
+    parser.add_argument('--spool', default=os.getenv("JIRA_SPOOL"), help='Spool file (default: $JIRA_SPOOL)')
+    parser.add_argument('--jira-url', default=os.getenv("JIRA_URL"), help='Jira instance URL')
+    parser.add_argument('--username', default=os.getenv("JIRA_USERNAME"), help='Jira username')
+    parser.add_argument('--api-token', default=os.getenv("JIRA_API_TOKEN"), help='Jira API token')
+    parser.add_argument('--project-key', default=os.getenv("JIRA_PROJECT_KEY", "SEC"), help='Jira project key')
+    parser.add_argument('--breaker-state', default=os.getenv("JIRA_BREAKER_STATE"),
+                        help='Shared circuit breaker state file (default: $JIRA_BREAKER_STATE)')
+
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+    if not all([args.spool, args.jira_url, args.username, args.api_token]):
+        print("Error: --spool, --jira-url, --username and --api-token (or JIRA_* variables) are required")
+        return 1
+
+    from jira_breaker import CircuitBreaker
+    from jira_integration import JiraIntegration
+
+    metrics_file = os.getenv("JIRA_METRICS_TEXTFILE")
+    metrics = None
+    if metrics_file:
+        from jira_metrics import JiraMetrics
+        metrics = JiraMetrics()
+
+    spool = IncidentSpool(args.spool)
+    breaker = CircuitBreaker(args.breaker_state) if args.breaker_state else None
+    jira = JiraIntegration(args.jira_url, args.username, args.api_token, args.project_key,
+                           metrics=metrics, breaker=breaker, spool=spool)
+    counts = jira.replay_spool()
+    if metrics:
+        metrics.write_textfile(metrics_file)
+    print(json_codec.dumps(counts).decode("utf-8"))
+    return 0 if counts["remaining"] == 0 else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
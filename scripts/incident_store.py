@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Local Incident Store for SOC Project
+SQLite mirror of Jira security incidents kept current with incremental JQL delta syncs
+"""
+
+import argparse
+import logging
+import math
+import os
+import re
+import sqlite3
+import time
+from typing import Dict, Any, Iterator, List, Optional
+
+from dashboard_rollup import IncidentRollup, to_epoch
+from jira_integration import JiraIntegration
+import json_codec
+
+# Fields requested from Jira during a sync
+SYNC_FIELDS = ["summary", "status", "priority", "labels", "created", "updated",
+               "resolutiondate", "description", "customfield_mitre_technique"]
+
+# Sync passes run before giving up on issues that keep being updated
+MAX_SYNC_PASSES = 5
+
+# Inverse of the severity -> priority map used by create_security_incident
+PRIORITY_SEVERITY = {"Lowest": "Low", "Low": "Low", "Medium": "Medium", "High": "High", "Highest": "Critical"}
+
+# Values create_security_incident writes into the description
+DETAIL_PATTERNS = {
+    "severity": re.compile(r"^- Severity: (.+)$", re.MULTILINE),
+    "mitre_technique": re.compile(r"^- MITRE ATT&CK Technique: (.+)$", re.MULTILINE),
+    "source_ip": re.compile(r"^- Source IP: (.+)$", re.MULTILINE),
+    "affected_user": re.compile(r"^- Affected User: (.+)$", re.MULTILINE)
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    issue_key TEXT PRIMARY KEY,
+    summary TEXT,
+    status TEXT,
+    severity TEXT,
+    mitre_technique TEXT,
+    source_ip TEXT,
+    affected_user TEXT,
+    created_time REAL,
+    updated_time REAL,
+    resolved_time REAL,
+    fields TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_incidents_status ON incidents (status);
+CREATE INDEX IF NOT EXISTS idx_incidents_severity ON incidents (severity);
+CREATE INDEX IF NOT EXISTS idx_incidents_technique ON incidents (mitre_technique);
+CREATE INDEX IF NOT EXISTS idx_incidents_source_ip ON incidents (source_ip);
+CREATE INDEX IF NOT EXISTS idx_incidents_created ON incidents (created_time);
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+COLUMNS = ("issue_key", "summary", "status", "severity", "mitre_technique", "source_ip",
+           "affected_user", "created_time", "updated_time", "resolved_time")
+
+
+def incident_from_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten a Jira issue into an incident row
+
+    Args:
+        issue: Issue from a Jira search or issue response
+
+    Returns:
+        Incident dictionary keyed by COLUMNS plus "fields"
+    """
+    fields = issue.get("fields", {})
+    description = fields.get("description") or ""
+
+    details = {}
+    for name, pattern in DETAIL_PATTERNS.items():
+        match = pattern.search(description)
+        details[name] = match.group(1).strip() if match else None
+
+    priority = (fields.get("priority") or {}).get("name")
+    return {
+        "issue_key": issue["key"],
+        "summary": fields.get("summary"),
+        "status": (fields.get("status") or {}).get("name"),
+        "severity": details["severity"] or PRIORITY_SEVERITY.get(priority),
+        "mitre_technique": fields.get("customfield_mitre_technique") or details["mitre_technique"],
+        "source_ip": details["source_ip"],
+        "affected_user": details["affected_user"],
+        "created_time": to_epoch(fields.get("created")),
+        "updated_time": to_epoch(fields.get("updated")),
+        "resolved_time": to_epoch(fields.get("resolutiondate")),
+        "fields": fields
+    }
+
+
+class IncidentStore:
+    def __init__(self, db_path: str):
+        """
+        Initialize incident store
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.logger = logging.getLogger(__name__)
+
+    def upsert(self, incidents: List[Dict[str, Any]]):
+        """
+        Insert or replace incident rows
+
+        Args:
+            incidents: Incident dictionaries from incident_from_issue()
+        """
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO incidents ({', '.join(COLUMNS)}, fields) "
+                f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+                [tuple(incident[column] for column in COLUMNS) + (json_codec.dumps(incident["fields"]).decode("utf-8"),)
+                 for incident in incidents])
+
+    def cursor(self) -> Optional[float]:
+        """
+        Get the sync cursor
+
+        Returns:
+            Latest Jira "updated" time already mirrored, in epoch seconds
+        """
+        row = self.conn.execute("SELECT value FROM sync_state WHERE name = 'updated_cursor'").fetchone()
+        return float(row[0]) if row else None
+
+    def sync(self,
+             jira: JiraIntegration,
+             page_size: int = 100,
+             overlap: float = 120.0,
+             max_passes: int = MAX_SYNC_PASSES) -> List[Dict[str, Any]]:
+        """
+        Pull incidents created or updated since the last sync
+
+        JQL compares dates in the Jira user's time zone at minute
+        precision, so the cursor is expressed as a relative "-Nm" bound
+        with an overlap. Issues fetched twice are simply replaced.
+
+        The search is paged by offset, so an issue updated mid-sync moves
+        to the end of the "ORDER BY updated" result and shifts the issues
+        behind it back by one, past a page already read. Such an issue
+        shows up twice in the same pass; the search is then re-run from
+        its earlier "updated" time until a pass sees nothing move. After
+        `max_passes` (an issue automation keeps updating) the sync stops
+        and sets the cursor back to where the next pass would have
+        started, so the next sync picks up from there.
+
+        An issue deleted or moved out of the project mid-sync shifts the
+        result the same way but cannot be seen in it, so the issue that
+        slips past the page boundary is not noticed. It is mirrored once
+        it is next updated, or by a full sync into a new database.
+
+        Args:
+            jira: Jira client used for the searches
+            page_size: Issues fetched per search request
+            overlap: Seconds re-read before the cursor to cover clock skew
+            max_passes: Passes run before giving up on issues still being updated
+
+        Returns:
+            Incidents inserted or updated by this sync
+        """
+        cursor = self.cursor()
+        since = cursor
+        stored: Dict[str, Optional[float]] = {}
+        synced: List[Dict[str, Any]] = []
+        for sync_pass in range(1, max_passes + 1):
+            jql = f"project = {jira.project_key}"
+            if since is not None:
+                minutes = math.ceil((time.time() - since + overlap) / 60)
+                jql += f" AND updated >= -{minutes}m"
+            jql += " ORDER BY updated ASC"
+
+            passed: Dict[str, Optional[float]] = {}
+            moved: Optional[float] = None
+            pending: List[Dict[str, Any]] = []
+            for issue in jira.iter_incidents(jql, fields=SYNC_FIELDS, page_size=page_size):
+                incident = incident_from_issue(issue)
+                key, updated = incident["issue_key"], incident["updated_time"]
+                if passed.get(key, updated) != updated:
+                    previous = passed[key] or 0.0
+                    moved = previous if moved is None else min(moved, previous)
+                passed[key] = updated
+                if key in stored and stored[key] == updated:
+                    continue
+                stored[key] = updated
+                pending.append(incident)
+                if len(pending) >= page_size:
+                    cursor = self._store_chunk(pending, cursor)
+                    synced.extend(pending)
+                    pending = []
+            if pending:
+                cursor = self._store_chunk(pending, cursor)
+                synced.extend(pending)
+
+            if moved is None:
+                break
+            since = moved
+            if sync_pass == max_passes:
+                self.logger.warning(f"Incidents still being updated after {max_passes} sync passes; "
+                                    "the next sync re-reads from the earliest change")
+                self._set_cursor(since)
+            else:
+                self.logger.info("Incidents were updated during the sync, re-reading from the earliest one")
+
+        self.logger.info(f"Synced {len(synced)} incidents from Jira")
+        return synced
+
+    def _store_chunk(self, incidents: List[Dict[str, Any]], cursor: Optional[float]) -> Optional[float]:
+        """Store synced incidents and advance the cursor past them"""
+        self.upsert(incidents)
+        latest = max(incident["updated_time"] or 0 for incident in incidents)
+        if cursor is None or latest > cursor:
+            cursor = latest
+            self._set_cursor(cursor)
+        return cursor
+
+    def _set_cursor(self, cursor: float):
+        """Store the sync cursor"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_state (name, value) VALUES ('updated_cursor', ?)",
+                (str(cursor),))
+
+    def get(self, issue_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a mirrored incident
+
+        Args:
+            issue_key: Jira ticket key
+
+        Returns:
+            Incident dictionary with the stored Jira fields, or None
+        """
+        row = self.conn.execute("SELECT * FROM incidents WHERE issue_key = ?", (issue_key,)).fetchone()
+        if row is None:
+            return None
+        incident = dict(row)
+        incident["fields"] = json_codec.loads(incident["fields"])
+        return incident
+
+    def query(self,
+              status: Optional[str] = None,
+              severity: Optional[str] = None,
+              mitre_technique: Optional[str] = None,
+              source_ip: Optional[str] = None,
+              since: Optional[float] = None,
+              exclude_status: Optional[List[str]] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find incidents by indexed attributes
+
+        Args:
+            status: Exact status
+            severity: Exact severity
+            mitre_technique: Exact MITRE ATT&CK technique ID
+            source_ip: Exact source IP
+            since: Only incidents created at or after this epoch time
+            exclude_status: Statuses to leave out (e.g., ["Resolved", "Closed"])
+            limit: Maximum rows, newest first
+
+        Returns:
+            Incident dictionaries without the stored Jira fields
+        """
+        clauses = []
+        params: List[Any] = []
+        for column, value in (("status", status), ("severity", severity),
+                              ("mitre_technique", mitre_technique), ("source_ip", source_ip)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("created_time >= ?")
+            params.append(since)
+        if exclude_status:
+            clauses.append(f"status NOT IN ({', '.join('?' * len(exclude_status))})")
+            params.extend(exclude_status)
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM incidents"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_time DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def iter_incidents(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every mirrored incident in the shape the rollup job expects
+
+        Returns:
+            Iterator of incident dictionaries
+        """
+        for row in self.conn.execute(f"SELECT {', '.join(COLUMNS)} FROM incidents"):
+            yield dict(row)
+
+    def close(self):
+        self.conn.close()
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Mirror Jira security incidents into a local store')
+
+    parser.add_argument('--db', default='soc_incidents.db', help='Incident store database file')
+    parser.add_argument('--rollup-db', help='Also fold synced incidents into this summary database')
+    parser.add_argument('--page-size', type=int, default=100, help='Issues per Jira search request')
+
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+
+    jira_url = os.getenv("JIRA_URL")
+    username = os.getenv("JIRA_USERNAME")
+    api_token = os.getenv("JIRA_API_TOKEN")
+    project_key = os.getenv("JIRA_PROJECT_KEY", "SEC")
+
+    if not all([jira_url, username, api_token]):
+        print("Please set JIRA_URL, JIRA_USERNAME, and JIRA_API_TOKEN environment variables")
+        return 1
+
+    jira = JiraIntegration(jira_url, username, api_token, project_key)
+    store = IncidentStore(args.db)
+    try:
+        synced = store.sync(jira, page_size=args.page_size)
+        if args.rollup_db:
+            rollup = IncidentRollup(args.rollup_db)
+            rollup.apply(synced)
+            rollup.close()
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Incident Description Templates for SOC Project
+Precompiled per-severity, per-issue-type description templates for Jira security incidents
+"""
+
+import string
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Default description; $severity and $issue_type are fixed when a template
+# is compiled, the other placeholders are filled per incident
+DEFAULT_TEMPLATE = """
+$description
+
+**Security Details:**
+- Severity: $severity
+- Detection Time: $detection_time
+$details
+**Response Actions Required:**
+- [ ] Investigate the incident
+- [ ] Determine root cause
+- [ ] Implement remediation
+- [ ] Update detection rules if needed
+- [ ] Document lessons learned
+
+**Automated Response:**
+This ticket was automatically created by the SOC monitoring system.
+"""
+
+SYNTAXES = ("template", "format", "jinja")
+
+# Severities compiled into their own template; any other severity string
+# is filled in per render so callers cannot grow the compiled set
+SEVERITIES = ("Critical", "High", "Medium", "Low")
+
+
+class DetectionClock:
+    """Detection timestamp formatted at most once per second"""
+
+    def __init__(self, fmt: str = '%Y-%m-%d %H:%M:%S UTC'):
+        self.fmt = fmt
+        self._cached = (None, "")
+
+    def now(self) -> str:
+        # Swapping one tuple keeps concurrent readers consistent without a lock
+        second = int(time.time())
+        cached = self._cached
+        if cached[0] != second:
+            cached = (second, datetime.now().strftime(self.fmt))
+            self._cached = cached
+        return cached[1]
+
+
+def split_template(source: str, syntax: str) -> List[Tuple[bool, str]]:
+    """
+    Split template text into literal chunks and placeholder names
+
+    Args:
+        source: Template text
+        syntax: "template" ($name / ${name}) or "format" ({name})
+
+    Returns:
+        List of (is_placeholder, text) parts; literal $$ / {{ }} are unescaped
+    """
+    parts: List[Tuple[bool, str]] = []
+    if syntax == "template":
+        position = 0
+        for match in string.Template.pattern.finditer(source):
+            parts.append((False, source[position:match.start()]))
+            if match.group("escaped") is not None:
+                parts.append((False, "$"))
+            elif match.group("invalid") is not None:
+                raise ValueError(f"Invalid placeholder in template at offset {match.start()}")
+            else:
+                parts.append((True, match.group("named") or match.group("braced")))
+            position = match.end()
+        parts.append((False, source[position:]))
+    else:
+        for literal, name, _spec, _conversion in string.Formatter().parse(source):
+            parts.append((False, literal))
+            if name is not None:
+                parts.append((True, name))
+    return [part for part in parts if part[1]]
+
+
+def compile_template(source: str, syntax: str = "template", **static: str) -> Callable[[Dict[str, str]], str]:
+    """
+    Compile a template with its static fields filled in
+
+    Literal text and static values are merged once, so rendering is a
+    single string formatting operation over the per-incident values.
+
+    Args:
+        source: Template text
+        syntax: One of SYNTAXES; "jinja" requires the jinja2 package
+        static: Values fixed for this template (e.g., severity)
+
+    Returns:
+        Function rendering the template from a dictionary of dynamic values
+    """
+    if syntax not in SYNTAXES:
+        raise ValueError(f"Unknown template syntax: {syntax} (expected one of {', '.join(SYNTAXES)})")
+
+    if syntax == "jinja":
+        try:
+            import jinja2
+        except ImportError:
+            raise ValueError("Jinja templates require the jinja2 package") from None
+        template = jinja2.Environment(autoescape=False, keep_trailing_newline=True).from_string(source)
+        static_values = dict(static)
+        return lambda values: template.render(static_values, **values)
+
+    # Literal text and static values become one printf-style string with
+    # a %(name)s slot per dynamic placeholder
+    pieces: List[str] = []
+    for is_placeholder, text in split_template(source, syntax):
+        if is_placeholder and text not in static:
+            pieces.append(f"%({text})s")
+        else:
+            pieces.append((static[text] if is_placeholder else text).replace("%", "%%"))
+    compiled = "".join(pieces)
+    return lambda values: compiled % values
+
+
+class IncidentTemplates:
+    """
+    Description templates compiled once per (issue type, severity)
+
+    Args:
+        templates: Issue type -> template text; "*" is used for issue
+            types without their own template
+        syntax: Template syntax for every template (see SYNTAXES)
+    """
+
+    def __init__(self, templates: Optional[Dict[str, str]] = None, syntax: str = "template"):
+        self.templates = dict(templates or {"*": DEFAULT_TEMPLATE})
+        self.syntax = syntax
+        self.clock = DetectionClock()
+        self._compiled: Dict[Tuple[str, str], Callable[[Dict[str, str]], str]] = {}
+
+    def _renderer(self, issue_type: str, severity: Optional[str]) -> Callable[[Dict[str, str]], str]:
+        # severity is None for the per-issue-type template that takes the
+        # severity as a dynamic value
+        key = (issue_type, severity)
+        renderer = self._compiled.get(key)
+        if renderer is None:
+            source = self.templates.get(issue_type, self.templates.get("*", DEFAULT_TEMPLATE))
+            static = {"issue_type": issue_type}
+            if severity is not None:
+                static["severity"] = severity
+            renderer = compile_template(source, self.syntax, **static)
+            self._compiled[key] = renderer
+        return renderer
+
+    def render(self,
+               description: str,
+               severity: str,
+               issue_type: str = "Security Incident",
+               mitre_technique: Optional[str] = None,
+               source_ip: Optional[str] = None,
+               affected_user: Optional[str] = None,
+               enrichment: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Render an incident description
+
+        Args:
+            description: Alert description
+            severity: Incident severity
+            issue_type: Jira issue type
+            mitre_technique: MITRE ATT&CK technique ID
+            source_ip: Source IP address
+            affected_user: Affected username
+            enrichment: GeoIP/ASN fields of the source IP
+
+        Returns:
+            Full Jira description
+        """
+        details = ""
+        if mitre_technique:
+            details += f"- MITRE ATT&CK Technique: {mitre_technique}\n"
+        if source_ip:
+            details += f"- Source IP: {source_ip}\n"
+        if enrichment:
+            location = ", ".join(filter(None, (enrichment.get("city"), enrichment.get("country"))))
+            if enrichment.get("country_code"):
+                location = f"{location} ({enrichment['country_code']})" if location else enrichment["country_code"]
+            if location:
+                details += f"- Source Location: {location}\n"
+            if enrichment.get("asn"):
+                as_org = f" ({enrichment['as_org']})" if enrichment.get("as_org") else ""
+                details += f"- Source ASN: AS{enrichment['asn']}{as_org}\n"
+        if affected_user:
+            details += f"- Affected User: {affected_user}\n"
+        values = {
+            "description": description,
+            "detection_time": self.clock.now(),
+            "details": details
+        }
+        if severity in SEVERITIES:
+            return self._renderer(issue_type, severity)(values)
+        values["severity"] = severity
+        return self._renderer(issue_type, None)(values)
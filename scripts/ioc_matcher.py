@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+IOC Matcher for SOC Project
+Threat-intel indicator matching against local CSV/STIX feeds, with a Bloom filter prefilter
+"""
+
+import argparse
+import bisect
+import csv
+import hashlib
+import ipaddress
+import itertools
+import logging
+import math
+import mmap
+import os
+import random
+import re
+import socket
+import struct
+import sys
+import time
+from array import array
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import json_codec
+
+# Compiled snapshot for the alert scripts
+IOC_DB_ENV = "SOC_IOC_DB"
+
+SEVERITIES = ("Critical", "High", "Medium", "Low")
+DEFAULT_SEVERITY = "High"
+
+# Indicator type -> alert fields it is read from
+ALERT_FIELDS = {
+    "ip": ("src_ip", "source_ip", "dest_ip", "dst_ip"),
+    "domain": ("domain", "query", "dest_host", "url"),
+    "hash": ("md5", "sha1", "sha256", "file_hash", "hash")
+}
+
+HASH_LENGTHS = (32, 40, 64)
+HEX_DIGITS = frozenset("0123456789abcdef")
+
+# STIX 2.x pattern comparisons: object type, property path, quoted value
+STIX_COMPARISON = re.compile(
+    r"(ipv4-addr|ipv6-addr|domain-name|url|file):(value|hashes\.(?:'[^']+'|[\w-]+))\s*=\s*'((?:[^'\\]|\\.)*)'")
+STIX_TYPES = {"ipv4-addr": "ip", "ipv6-addr": "ip", "domain-name": "domain", "url": "domain", "file": "hash"}
+
+# magic, Bloom filter bits, Bloom filter hashes, indicator count
+SNAPSHOT_MAGIC = b"SOCIOC1\n"
+SNAPSHOT_HEADER = struct.Struct("<8sQIQ")
+FINGERPRINT = struct.Struct("<QQ")
+
+
+def normalize(value: str, kind: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """
+    Canonical (type, value) of an indicator
+
+    Args:
+        value: Indicator as written in a feed or alert
+        kind: "ip", "domain" or "hash"; inferred if None
+
+    Returns:
+        (type, value), or None if the value is not a valid indicator
+    """
+    value = str(value).strip().lower()
+    if not value:
+        return None
+
+    if kind in (None, "ip"):
+        # inet_pton/inet_ntop canonicalize like ipaddress at a fraction of the cost
+        family = socket.AF_INET6 if ":" in value else socket.AF_INET
+        try:
+            return "ip", socket.inet_ntop(family, socket.inet_pton(family, value))
+        except (OSError, ValueError):
+            if kind == "ip":
+                return None
+    if kind in (None, "hash") and len(value) in HASH_LENGTHS and HEX_DIGITS.issuperset(value):
+        return "hash", value
+    if kind == "hash":
+        return None
+
+    if "://" in value:
+        value = urlsplit(value).hostname or ""
+    value = value.rstrip(".")
+    if "." not in value or " " in value or value.rsplit(".", 1)[-1].isdigit():
+        return None
+    return "domain", value
+
+
+def fingerprint(kind: str, value: str) -> Tuple[int, int]:
+    """Two 64-bit hashes of a normalized indicator"""
+    h1, h2 = FINGERPRINT.unpack(hashlib.blake2b(f"{kind}:{value}".encode("utf-8"), digest_size=16).digest())
+    return h1, h2 | 1
+
+
+class BloomFilter:
+    """
+    Bloom filter over a buffer (bytearray, or a slice of a mapped snapshot)
+
+    Bit positions are h1 + i * h2 for the two fingerprint hashes
+    (Kirsch-Mitzenmacher double hashing).
+
+    Args:
+        size_bits: Filter size in bits
+        hashes: Bit positions per indicator
+        buffer: Buffer holding the bits, or None for a new empty filter
+        offset: Offset of the bits in the buffer
+    """
+
+    def __init__(self, size_bits: int, hashes: int, buffer=None, offset: int = 0):
+        self.size_bits = size_bits
+        self.hashes = hashes
+        self.buffer = bytearray((size_bits + 7) // 8) if buffer is None else buffer
+        self.offset = offset
+
+    @staticmethod
+    def size_for(capacity: int, error_rate: float = 0.001) -> Tuple[int, int]:
+        """
+        (bits, hashes) for `capacity` indicators at a false positive rate
+
+        Bits are rounded up to a power of two, so the size only changes
+        when the indicator count doubles or halves.
+        """
+        size_bits = max(64, math.ceil(-max(capacity, 1) * math.log(error_rate) / math.log(2) ** 2))
+        return 1 << (size_bits - 1).bit_length(), max(1, round(-math.log2(error_rate)))
+
+    def add_entries(self, entries: Iterable[Tuple]):
+        """Add prepared entries (h1, h2, ...)"""
+        buffer, offset, size_bits, hashes = self.buffer, self.offset, self.size_bits, self.hashes
+        for entry in entries:
+            h1, h2 = entry[0], entry[1]
+            for i in range(hashes):
+                bit = (h1 + i * h2) % size_bits
+                buffer[offset + (bit >> 3)] |= 1 << (bit & 7)
+
+    def might_contain(self, h1: int, h2: int) -> bool:
+        """False if the indicator is certainly absent"""
+        buffer = self.buffer
+        offset = self.offset
+        size_bits = self.size_bits
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % size_bits
+            if not buffer[offset + (bit >> 3)] & (1 << (bit & 7)):
+                return False
+        return True
+
+
+def load_csv_feed(path: str, severity: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read a CSV feed
+
+    Columns: `indicator` (or `value`), and optionally `type`, `severity`
+    and `description`. Lines starting with # are comments.
+    """
+    with open(path, "r", newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(line for line in handle if not line.startswith("#")):
+            normalized = normalize(row.get("indicator") or row.get("value") or "", row.get("type") or None)
+            if normalized:
+                yield {"type": normalized[0], "value": normalized[1],
+                       "severity": row.get("severity") if row.get("severity") in SEVERITIES else severity,
+                       "feed": os.path.basename(path), "description": row.get("description") or ""}
+
+
+def load_stix_feed(path: str, severity: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read a STIX 2.x bundle
+
+    Equality comparisons on IP, domain, URL and file hash properties in
+    indicator patterns are loaded; revoked and expired indicators are
+    skipped. `x_soc_severity` overrides the feed severity.
+    """
+    with open(path, "rb") as handle:
+        bundle = json_codec.loads(handle.read())
+    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    for entry in bundle.get("objects", []):
+        if entry.get("type") != "indicator" or entry.get("revoked"):
+            continue
+        if entry.get("valid_until") and entry["valid_until"][:19] < now[:19]:
+            continue
+        entry_severity = entry.get("x_soc_severity") if entry.get("x_soc_severity") in SEVERITIES else severity
+        for stix_type, _property, value in STIX_COMPARISON.findall(entry.get("pattern", "")):
+            normalized = normalize(value.replace("\\'", "'").replace("\\\\", "\\"), STIX_TYPES[stix_type])
+            if normalized:
+                yield {"type": normalized[0], "value": normalized[1], "severity": entry_severity,
+                       "feed": os.path.basename(path), "description": entry.get("name") or ""}
+
+
+def load_feed(path: str, severity: str = DEFAULT_SEVERITY) -> List[Dict[str, Any]]:
+    """Read a feed file; .json files are STIX bundles, anything else CSV"""
+    loader = load_stix_feed if path.endswith(".json") else load_csv_feed
+    return list(loader(path, severity))
+
+
+def prepare(indicators: Iterable[Dict[str, Any]]) -> List[Tuple[int, int, int, str, bytes]]:
+    """
+    Hash and encode indicators for compile_snapshot
+
+    IOCFeeds keeps the result per feed, so a reload only hashes and
+    encodes the feeds that changed.
+
+    Returns:
+        (h1, h2, severity rank, "type:value", JSON record) per indicator
+    """
+    return [(*fingerprint(indicator["type"], indicator["value"]), SEVERITIES.index(indicator["severity"]),
+             f"{indicator['type']}:{indicator['value']}", json_codec.dumps(indicator))
+            for indicator in indicators]
+
+
+def compile_snapshot(entries: List[Tuple[int, int, int, str, bytes]],
+                     error_rate: float = 0.001,
+                     bloom: Optional[BloomFilter] = None) -> bytes:
+    """
+    Compile prepared indicators into a snapshot
+
+    Layout: header, Bloom filter bits, sorted 64-bit fingerprints,
+    record offsets, then one JSON record per indicator. Duplicate
+    indicators keep their highest severity.
+
+    Args:
+        entries: Output of prepare, possibly concatenated across feeds
+        error_rate: Bloom filter false positive rate
+        bloom: Bloom filter already holding every entry, if the caller
+            built it (IOCFeeds merges per-feed filters)
+
+    Returns:
+        Snapshot bytes for IOCIndex
+    """
+    # Sorting by (h1, h2, rank) puts duplicates next to each other, highest severity first
+    entries = sorted(entries)
+    unique = [entry for position, entry in enumerate(entries)
+              if not position or entry[3] != entries[position - 1][3]]
+
+    if bloom is None:
+        bloom = BloomFilter(*BloomFilter.size_for(len(unique), error_rate))
+        bloom.add_entries(unique)
+    bits, size_bits, hashes = bloom.buffer, bloom.size_bits, bloom.hashes
+    fingerprints = array("Q", (entry[0] for entry in unique))
+    offsets = array("I", [0])
+    offsets.extend(itertools.accumulate(len(entry[4]) for entry in unique))
+    if sys.byteorder != "little":
+        fingerprints.byteswap()
+        offsets.byteswap()
+
+    return b"".join((SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, size_bits, hashes, len(unique)),
+                     b"\0" * (-SNAPSHOT_HEADER.size % 8), bits, b"\0" * (-len(bits) % 8),
+                     fingerprints.tobytes(), offsets.tobytes(), *(entry[4] for entry in unique)))
+
+
+def build_snapshot(indicators: Iterable[Dict[str, Any]], error_rate: float = 0.001) -> bytes:
+    """
+    Compile indicator records into a snapshot
+
+    Args:
+        indicators: Indicator records (type, value, severity, feed, description)
+        error_rate: Bloom filter false positive rate
+
+    Returns:
+        Snapshot bytes for IOCIndex
+    """
+    return compile_snapshot(prepare(indicators), error_rate)
+
+
+class IOCIndex:
+    """
+    Read-only indicator index over a snapshot
+
+    The Bloom filter rejects almost every benign indicator after a few
+    bit tests; only candidates are binary-searched in the fingerprint
+    array and have their record decoded. Opened with `open`, the
+    snapshot is memory-mapped, so per-alert processes read only the
+    pages they touch.
+
+    Args:
+        buffer: Snapshot bytes or mapping
+    """
+
+    def __init__(self, buffer):
+        if len(buffer) < SNAPSHOT_HEADER.size:
+            raise ValueError("Not an IOC snapshot")
+        magic, size_bits, hashes, count = SNAPSHOT_HEADER.unpack_from(buffer, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not an IOC snapshot")
+        if not size_bits or not hashes:
+            raise ValueError("Corrupt IOC snapshot: empty Bloom filter")
+        offset = SNAPSHOT_HEADER.size + (-SNAPSHOT_HEADER.size % 8)
+        self.bloom = BloomFilter(size_bits, hashes, buffer, offset)
+        offset += (size_bits + 7) // 8
+        offset += -offset % 8
+        # A truncated file must fail here rather than on the first lookup
+        if len(buffer) < offset + count * 8 + (count + 1) * 4:
+            raise ValueError(f"Truncated IOC snapshot: {len(buffer)} bytes for {count} indicators")
+
+        view = memoryview(buffer)
+        self._fingerprints = view[offset:offset + count * 8]
+        offset += count * 8
+        self._offsets = view[offset:offset + (count + 1) * 4]
+        self._records_start = offset + (count + 1) * 4
+        if sys.byteorder == "little":
+            self._fingerprints = self._fingerprints.cast("Q")
+            self._offsets = self._offsets.cast("I")
+        else:
+            self._fingerprints = array("Q", self._fingerprints.tobytes())
+            self._offsets = array("I", self._offsets.tobytes())
+            self._fingerprints.byteswap()
+            self._offsets.byteswap()
+        if len(buffer) < self._records_start + self._offsets[count]:
+            raise ValueError(f"Truncated IOC snapshot: {len(buffer)} bytes for {count} indicators")
+        self._buffer = buffer
+        self.count = count
+
+    @classmethod
+    def open(cls, path: str) -> "IOCIndex":
+        """Memory-map a snapshot file"""
+        with open(path, "rb") as handle:
+            return cls(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def lookup(self, value: str, kind: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up one indicator
+
+        Args:
+            value: Indicator value
+            kind: "ip", "domain" or "hash"; inferred if None
+
+        Returns:
+            Indicator record, or None if no feed lists it
+        """
+        normalized = normalize(value, kind)
+        if normalized is None:
+            return None
+        if normalized[0] == "domain":
+            # A listed domain also covers its subdomains
+            labels = normalized[1].split(".")
+            for start in range(len(labels) - 1):
+                record = self._find("domain", ".".join(labels[start:]))
+                if record:
+                    return record
+            return None
+        return self._find(*normalized)
+
+    def _find(self, kind: str, value: str) -> Optional[Dict[str, Any]]:
+        h1, h2 = fingerprint(kind, value)
+        if not self.bloom.might_contain(h1, h2):
+            return None
+        fingerprints = self._fingerprints
+        index = bisect.bisect_left(fingerprints, h1)
+        while index < self.count and fingerprints[index] == h1:
+            start = self._records_start + self._offsets[index]
+            record = json_codec.loads(self._buffer[start:self._records_start + self._offsets[index + 1]])
+            if record["type"] == kind and record["value"] == value:
+                return record
+            index += 1
+        return None
+
+    def match_alert(self, alert_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Match the indicator fields of an alert (see ALERT_FIELDS)
+
+        Returns:
+            Records of the listed indicators, each with the alert field it came from
+        """
+        matches = []
+        for kind, fields in ALERT_FIELDS.items():
+            for field in fields:
+                value = alert_data.get(field)
+                if value:
+                    record = self.lookup(str(value), kind)
+                    if record:
+                        matches.append({**record, "field": field})
+        return matches
+
+
+def highest_severity(severity: str, matches: List[Dict[str, Any]]) -> str:
+    """Raise a severity to the highest severity among IOC matches"""
+    candidates = [severity] + [match["severity"] for match in matches if match.get("severity") in SEVERITIES]
+    return min(candidates, key=lambda name: SEVERITIES.index(name) if name in SEVERITIES else len(SEVERITIES))
+
+
+def describe_matches(matches: List[Dict[str, Any]]) -> str:
+    """Comment lines listing IOC matches"""
+    return "".join(f"- IOC Match: {match['value']} ({match['type']}, {match['severity']}, feed {match['feed']})\n"
+                   for match in matches)
+
+
+class IOCFeeds:
+    """
+    Feed set reloaded incrementally into a fresh index
+
+    `reload` re-reads only feed files whose size, mtime or inode changed
+    (directories are scanned for .csv and .json files) and then swaps in
+    a new index in one assignment, so concurrent lookups see either the
+    old or the new index and never wait. A feed that fails to parse keeps
+    its previous indicators.
+
+    Args:
+        paths: Feed files or directories
+        severity: Severity of indicators whose feed does not set one
+        error_rate: Bloom filter false positive rate
+    """
+
+    def __init__(self, paths: List[str], severity: str = DEFAULT_SEVERITY, error_rate: float = 0.001):
+        self.paths = list(paths)
+        self.severity = severity
+        self.error_rate = error_rate
+        self.snapshot = build_snapshot([], error_rate)
+        self.index = IOCIndex(self.snapshot)
+        self._feeds: Dict[str, Tuple[Tuple[int, int, int], List[Tuple[int, int, int, str, bytes]]]] = {}
+        # Feed -> ((bits, hashes), Bloom filter bits as an integer, entries they were built from)
+        self._blooms: Dict[str, Tuple[Tuple[int, int], int, list]] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def _feed_files(self) -> List[str]:
+        files = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                             if name.endswith((".csv", ".json")))
+            else:
+                files.append(path)
+        return files
+
+    def reload(self) -> bool:
+        """
+        Re-read changed feeds
+
+        Returns:
+            True if the index was rebuilt
+        """
+        changed = False
+        seen = set()
+        for path in self._feed_files():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            seen.add(path)
+            stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            if path in self._feeds and self._feeds[path][0] == stamp:
+                continue
+            try:
+                self._feeds[path] = (stamp, prepare(load_feed(path, self.severity)))
+            except (OSError, ValueError, KeyError) as e:
+                self.logger.error(f"Error loading IOC feed {path}: {str(e)}")
+                continue
+            changed = True
+
+        for path in set(self._feeds) - seen:
+            del self._feeds[path]
+            changed = True
+
+        if changed:
+            entries = [entry for _stamp, feed_entries in self._feeds.values() for entry in feed_entries]
+            snapshot = compile_snapshot(entries, self.error_rate, self._merged_bloom(len(entries)))
+            self.snapshot, self.index = snapshot, IOCIndex(snapshot)
+            self.logger.info(f"IOC index rebuilt: {len(self.index)} indicators from {len(self._feeds)} feeds")
+        return changed
+
+    def _merged_bloom(self, capacity: int) -> BloomFilter:
+        """
+        Bloom filter of every feed, ORed from per-feed filters
+
+        Only feeds that changed (or all, if the filter size changed) have
+        their bits recomputed.
+        """
+        size = BloomFilter.size_for(capacity, self.error_rate)
+        merged = 0
+        for path, (_stamp, entries) in self._feeds.items():
+            cached = self._blooms.get(path)
+            if cached is None or cached[0] != size or cached[2] is not entries:
+                feed_bloom = BloomFilter(*size)
+                feed_bloom.add_entries(entries)
+                cached = (size, int.from_bytes(feed_bloom.buffer, "little"), entries)
+                self._blooms[path] = cached
+            merged |= cached[1]
+        for path in set(self._blooms) - set(self._feeds):
+            del self._blooms[path]
+        return BloomFilter(*size, bytearray(merged.to_bytes(size[0] // 8, "little")))
+
+    def write(self, path: str):
+        """Write the current snapshot; readers keep their old mapping until they reopen"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(self.snapshot)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Compile threat-intel feeds and match indicators against them')
+
+    parser.add_argument('--feed', action='append', default=[],
+                        help='CSV or STIX feed file, or a directory of them; repeatable')
+    parser.add_argument('--severity', choices=SEVERITIES, default=DEFAULT_SEVERITY,
+                        help='Severity of indicators whose feed does not set one')
+    parser.add_argument('--output', help='Write the compiled snapshot here (e.g., the $SOC_IOC_DB file)')
+    parser.add_argument('--watch', type=float, default=0, metavar='SECONDS',
+                        help='Keep checking feeds for changes and rewrite --output when they change')
+    parser.add_argument('--db', default=os.getenv(IOC_DB_ENV),
+                        help='Compiled snapshot to match against (default: $SOC_IOC_DB)')
+    parser.add_argument('--benchmark', type=int, default=0, metavar='N',
+                        help='Time N lookups of random IP addresses')
+    parser.add_argument('indicators', nargs='*', help='Indicators to look up')
+
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.feed:
+        feeds = IOCFeeds(args.feed, args.severity)
+        feeds.reload()
+        if args.output:
+            feeds.write(args.output)
+        while args.watch and args.output:
+            time.sleep(args.watch)
+            if feeds.reload():
+                feeds.write(args.output)
+        index = feeds.index
+    elif args.db:
+        index = IOCIndex.open(args.db)
+    else:
+        print(f"Error: --feed or --db (or {IOC_DB_ENV}) is required")
+        return 1
+
+    if args.benchmark:
+        rng = random.Random(1)
+        addresses = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _lookup in range(args.benchmark)]
+        started = time.perf_counter()
+        matches = sum(1 for ip in addresses if index.lookup(ip, "ip"))
+        elapsed = time.perf_counter() - started
+        print(json_codec.dumps({"indicators": len(index), "lookups": args.benchmark, "matches": matches,
+                                "us_per_lookup": round(elapsed * 1e6 / args.benchmark, 3)}).decode("utf-8"))
+        return 0
+
+    for indicator in args.indicators:
+        print(json_codec.dumps({"indicator": indicator, "match": index.lookup(indicator)}).decode("utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+IP Enrichment for SOC Project
+Offline GeoIP and ASN lookups from local MaxMind DB (.mmdb) or CSV databases
+"""
+
+import argparse
+import bisect
+import csv
+import functools
+import ipaddress
+import mmap
+import os
+import random
+import struct
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import json_codec
+
+METADATA_MARKER = b"\xab\xcd\xefMaxMind.com"
+# Metadata the search tree cannot be read without
+METADATA_KEYS = ("node_count", "record_size", "ip_version")
+
+# Database files for the alert scripts, separated by os.pathsep
+GEOIP_DB_ENV = "SOC_GEOIP_DB"
+
+# Flat field -> record keys it is read from (CSV columns, or top-level keys
+# of ASN databases)
+FIELD_ALIASES = {
+    "country_code": ("country_code", "country_iso_code"),
+    "country": ("country", "country_name"),
+    "city": ("city", "city_name"),
+    "latitude": ("latitude",),
+    "longitude": ("longitude",),
+    "asn": ("asn", "autonomous_system_number"),
+    "as_org": ("as_org", "autonomous_system_organization")
+}
+
+
+class MMDBReader:
+    """
+    Memory-mapped MaxMind DB reader
+
+    The file is mapped read-only, so opening it per alert process costs
+    no parsing and the page cache is shared between processes. Used when
+    the maxminddb package is not installed.
+
+    Args:
+        path: .mmdb file
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as handle:
+            self._buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        marker = self._buffer.rfind(METADATA_MARKER, max(0, len(self._buffer) - 128 * 1024))
+        if marker < 0:
+            raise ValueError(f"{path} is not a MaxMind DB file")
+        metadata_start = marker + len(METADATA_MARKER)
+        try:
+            self.metadata, _offset = self._decode(metadata_start, metadata_start)
+        except (IndexError, RecursionError, UnicodeDecodeError, struct.error) as e:
+            raise ValueError(f"{path} has a corrupt MaxMind DB metadata section: {str(e)}") from None
+        if not isinstance(self.metadata, dict):
+            raise ValueError(f"{path} has a corrupt MaxMind DB metadata section")
+        for key in METADATA_KEYS:
+            if not isinstance(self.metadata.get(key), int):
+                raise ValueError(f"{path} has no valid '{key}' in its MaxMind DB metadata")
+
+        self.node_count = self.metadata["node_count"]
+        self.record_size = self.metadata["record_size"]
+        self.ip_version = self.metadata["ip_version"]
+        if self.record_size not in (24, 28, 32):
+            raise ValueError(f"Unsupported MaxMind DB record size: {self.record_size}")
+        if self.ip_version not in (4, 6):
+            raise ValueError(f"Unsupported MaxMind DB IP version: {self.ip_version}")
+        self.tree_size = self.node_count * self.record_size // 4
+        self.data_start = self.tree_size + 16
+        if self.data_start > marker:
+            raise ValueError(f"{path} is truncated: search tree of {self.node_count} nodes does not fit")
+
+        # IPv4 addresses live under ::/96 in IPv6 databases
+        self._ipv4_start = 0
+        if self.ip_version == 6:
+            node = 0
+            for _bit in range(96):
+                if node >= self.node_count:
+                    break
+                node = self._read_node(node, 0)
+            self._ipv4_start = node
+
+    def _read_node(self, node: int, bit: int) -> int:
+        """Read the left (0) or right (1) record of a search tree node"""
+        buffer = self._buffer
+        if self.record_size == 24:
+            offset = node * 6 + bit * 3
+            return int.from_bytes(buffer[offset:offset + 3], "big")
+        if self.record_size == 28:
+            base = node * 7
+            if bit:
+                return ((buffer[base + 3] & 0x0F) << 24) | int.from_bytes(buffer[base + 4:base + 7], "big")
+            return ((buffer[base + 3] & 0xF0) << 20) | int.from_bytes(buffer[base:base + 3], "big")
+        offset = node * 8 + bit * 4
+        return int.from_bytes(buffer[offset:offset + 4], "big")
+
+    def _decode(self, offset: int, base: int) -> Tuple[Any, int]:
+        """
+        Decode one data section value
+
+        Args:
+            offset: File offset of the value
+            base: File offset pointers are relative to
+
+        Returns:
+            (value, offset after the value)
+        """
+        buffer = self._buffer
+        control = buffer[offset]
+        offset += 1
+        kind = control >> 5
+
+        if kind == 1:
+            size = (control >> 3) & 0x3
+            prefix = control & 0x7
+            if size == 0:
+                pointer = (prefix << 8) | buffer[offset]
+            elif size == 1:
+                pointer = ((prefix << 16) | int.from_bytes(buffer[offset:offset + 2], "big")) + 2048
+            elif size == 2:
+                pointer = ((prefix << 24) | int.from_bytes(buffer[offset:offset + 3], "big")) + 526336
+            else:
+                pointer = int.from_bytes(buffer[offset:offset + 4], "big")
+            value, _end = self._decode(base + pointer, base)
+            return value, offset + size + 1
+
+        if kind == 0:
+            kind = 7 + buffer[offset]
+            offset += 1
+
+        size = control & 0x1F
+        if size == 29:
+            size = 29 + buffer[offset]
+            offset += 1
+        elif size == 30:
+            size = 285 + int.from_bytes(buffer[offset:offset + 2], "big")
+            offset += 2
+        elif size == 31:
+            size = 65821 + int.from_bytes(buffer[offset:offset + 3], "big")
+            offset += 3
+
+        if kind == 2:
+            return buffer[offset:offset + size].decode("utf-8"), offset + size
+        if kind == 7:
+            result = {}
+            for _entry in range(size):
+                key, offset = self._decode(offset, base)
+                result[key], offset = self._decode(offset, base)
+            return result, offset
+        if kind == 11:
+            items = []
+            for _entry in range(size):
+                item, offset = self._decode(offset, base)
+                items.append(item)
+            return items, offset
+        if kind in (5, 6, 9, 10):
+            return int.from_bytes(buffer[offset:offset + size], "big"), offset + size
+        if kind == 8:
+            value = int.from_bytes(buffer[offset:offset + size], "big")
+            return (value - (1 << 32) if size == 4 and value >= 1 << 31 else value), offset + size
+        if kind == 3:
+            return struct.unpack(">d", buffer[offset:offset + 8])[0], offset + 8
+        if kind == 15:
+            return struct.unpack(">f", buffer[offset:offset + 4])[0], offset + 4
+        if kind == 4:
+            return bytes(buffer[offset:offset + size]), offset + size
+        if kind == 14:
+            return bool(size), offset
+        raise ValueError(f"Unsupported MaxMind DB data type {kind} at offset {offset}")
+
+    def get(self, ip: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the record of an address
+
+        Args:
+            ip: IPv4 or IPv6 address
+
+        Returns:
+            Record, or None if the database has none for the address
+        """
+        address = ipaddress.ip_address(ip)
+        if address.version == 6 and self.ip_version == 4:
+            return None
+
+        integer = int(address)
+        node = self._ipv4_start if address.version == 4 else 0
+        node_count = self.node_count
+        for shift in range(address.max_prefixlen - 1, -1, -1):
+            if node >= node_count:
+                break
+            node = self._read_node(node, (integer >> shift) & 1)
+
+        if node <= node_count:
+            return None
+        value, _offset = self._decode(self.tree_size + node - node_count, self.data_start)
+        return value
+
+    def close(self):
+        self._buffer.close()
+
+
+class CSVDatabase:
+    """
+    Network table loaded from CSV
+
+    The first column is `network` (CIDR); every other column is kept as a
+    record field (e.g., GeoLite2 ASN blocks, or country_code, country,
+    city, latitude, longitude, asn, as_org). Networks must not overlap.
+
+    Args:
+        path: CSV file with a header row
+    """
+
+    def __init__(self, path: str):
+        rows: Dict[int, List[Tuple[int, int, Dict[str, str]]]] = {4: [], 6: []}
+        with open(path, "r", newline="", encoding="utf-8") as handle:
+            reader = csv.DictReader(handle)
+            if "network" not in (reader.fieldnames or []):
+                raise ValueError(f"{path} has no network column")
+            for row in reader:
+                network = ipaddress.ip_network((row.pop("network") or "").strip(), strict=False)
+                record = {key: value for key, value in row.items() if value not in (None, "")}
+                rows[network.version].append((int(network.network_address), int(network.broadcast_address), record))
+
+        self._tables = {}
+        for version, entries in rows.items():
+            entries.sort(key=lambda entry: entry[0])
+            self._tables[version] = ([entry[0] for entry in entries], [entry[1] for entry in entries],
+                                     [entry[2] for entry in entries])
+
+    def get(self, ip: str) -> Optional[Dict[str, Any]]:
+        """Look up the record of an address (None if no network contains it)"""
+        address = ipaddress.ip_address(ip)
+        starts, ends, records = self._tables[address.version]
+        value = int(address)
+        index = bisect.bisect_right(starts, value) - 1
+        if index >= 0 and value <= ends[index]:
+            return records[index]
+        return None
+
+    def close(self):
+        pass
+
+
+def open_database(path: str):
+    """
+    Open a GeoIP/ASN database by file type
+
+    .mmdb files use the maxminddb package when installed (it memory-maps
+    the file too, through its C extension if built) and MMDBReader
+    otherwise; .csv files are loaded into a CSVDatabase.
+    """
+    if path.endswith(".csv"):
+        return CSVDatabase(path)
+    try:
+        import maxminddb
+    except ImportError:
+        return MMDBReader(path)
+    return maxminddb.open_database(path, maxminddb.MODE_AUTO)
+
+
+def enrichment_fields(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten a GeoIP2/GeoLite2 or CSV record into enrichment fields
+
+    Args:
+        record: Database record
+
+    Returns:
+        Subset of country_code, country, city, latitude, longitude, asn, as_org
+    """
+    fields: Dict[str, Any] = {}
+    country = record.get("country") or record.get("registered_country")
+    if isinstance(country, dict):
+        fields["country_code"] = country.get("iso_code")
+        fields["country"] = (country.get("names") or {}).get("en")
+    if isinstance(record.get("city"), dict):
+        fields["city"] = (record["city"].get("names") or {}).get("en")
+    if isinstance(record.get("location"), dict):
+        fields["latitude"] = record["location"].get("latitude")
+        fields["longitude"] = record["location"].get("longitude")
+
+    for field, keys in FIELD_ALIASES.items():
+        if fields.get(field) is not None:
+            continue
+        for key in keys:
+            value = record.get(key)
+            if value not in (None, "") and not isinstance(value, (dict, list)):
+                fields[field] = value
+                break
+
+    if isinstance(fields.get("asn"), str) and fields["asn"].upper().lstrip("AS").isdigit():
+        fields["asn"] = int(fields["asn"].upper().lstrip("AS"))
+    for field in ("latitude", "longitude"):
+        if isinstance(fields.get(field), str):
+            try:
+                fields[field] = float(fields[field])
+            except ValueError:
+                del fields[field]
+    return {field: value for field, value in fields.items() if value is not None}
+
+
+class IPEnricher:
+    """
+    GeoIP and ASN enrichment with an LRU cache of recent addresses
+
+    Args:
+        paths: Database files (.mmdb or .csv); fields from earlier
+            databases win, so a City database and an ASN database can
+            be combined
+        cache_size: Addresses kept in the LRU cache
+    """
+
+    def __init__(self, paths: List[str], cache_size: int = 65536):
+        self.paths = list(paths)
+        self.databases = [open_database(path) for path in self.paths]
+        # Cached results are shared between callers and must not be modified
+        self.lookup = functools.lru_cache(maxsize=cache_size)(self._lookup)
+
+    @classmethod
+    def from_env(cls) -> Optional["IPEnricher"]:
+        """Enricher for the databases in $SOC_GEOIP_DB, or None if unset"""
+        paths = [path for path in os.getenv(GEOIP_DB_ENV, "").split(os.pathsep) if path]
+        return cls(paths) if paths else None
+
+    def _lookup(self, ip: str) -> Dict[str, Any]:
+        """Merge the enrichment fields of every database for one address"""
+        fields: Dict[str, Any] = {}
+        try:
+            ipaddress.ip_address(ip)
+        except ValueError:
+            return fields
+        for database in self.databases:
+            record = database.get(ip)
+            if record:
+                for field, value in enrichment_fields(record).items():
+                    fields.setdefault(field, value)
+        return fields
+
+    def enrich_incident(self, incident) -> Dict[str, Any]:
+        """
+        Attach enrichment for an incident's source IP
+
+        Args:
+            incident: Incident record; its `enrichment` is set
+
+        Returns:
+            Enrichment fields (empty if unknown or no source IP)
+        """
+        incident.enrichment = self.lookup(incident.source_ip) if incident.source_ip else {}
+        return incident.enrichment
+
+    def cache_info(self) -> Dict[str, int]:
+        """LRU cache hits, misses and size"""
+        info = self.lookup.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+    def close(self):
+        for database in self.databases:
+            database.close()
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Look up GeoIP and ASN data for IP addresses offline')
+
+    parser.add_argument('--db', action='append', default=[],
+                        help='Database file (.mmdb or .csv); repeat to combine (default: $SOC_GEOIP_DB)')
+    parser.add_argument('--benchmark', type=int, default=0, metavar='N',
+                        help='Time N lookups of random addresses instead of printing results')
+    parser.add_argument('--distinct', type=int, default=10000,
+                        help='Distinct random addresses in the benchmark')
+    parser.add_argument('ips', nargs='*', help='Addresses to look up')
+
+    return parser.parse_args()
+
+
+def main():
+    """Main function"""
+    args = parse_arguments()
+    enricher = IPEnricher(args.db) if args.db else IPEnricher.from_env()
+    if enricher is None:
+        print(f"Error: no database given (use --db or {GEOIP_DB_ENV})")
+        return 1
+
+    if args.benchmark:
+        rng = random.Random(1)
+        pool = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ip in range(args.distinct)]
+        addresses = [rng.choice(pool) for _lookup in range(args.benchmark)]
+        started = time.perf_counter()
+        for ip in addresses:
+            enricher.lookup(ip)
+        elapsed = time.perf_counter() - started
+        print(json_codec.dumps({"lookups": args.benchmark, "distinct": args.distinct,
+                                "us_per_lookup": round(elapsed * 1e6 / args.benchmark, 3),
+                                "cache": enricher.cache_info()}).decode("utf-8"))
+        return 0
+
+    for ip in args.ips:
+        print(json_codec.dumps({"ip": ip, **enricher.lookup(ip)}).decode("utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Jira Circuit Breaker for SOC Project
+Request timeouts and a circuit breaker, shared between alert processes through a state file
+"""
+
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# (connect, read) timeout in seconds for Jira requests that do not set one
+DEFAULT_TIMEOUT = (3.05, 10.0)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request while the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests fail immediately. Once `reset_timeout` seconds have passed it
+    goes half-open and lets one probe request through at a time; after
+    `probe_successes` successful probes it closes, and a failed probe
+    opens it again.
+
+    With `state_path` the state lives in a small JSON file guarded by a
+    lock file, so the per-alert processes of Splunk and Wazuh share one
+    breaker; without it the state is per process.
+
+    Args:
+        state_path: Shared state file, or None for process-local state
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds the circuit stays open before probing
+        probe_successes: Successful probes needed to close the circuit
+        probe_timeout: Seconds after which an unfinished probe is
+            abandoned and another caller may probe
+    """
+
+    def __init__(self,
+                 state_path: Optional[str] = None,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0,
+                 probe_successes: int = 2,
+                 probe_timeout: float = 15.0):
+        self.state_path = state_path
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_successes = probe_successes
+        self.probe_timeout = probe_timeout
+        self._local = self.initial_state()
+        self._lock = threading.Lock()
+        # Last state seen, so successes in the closed state skip the file
+        self._seen = dict(self._local)
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def initial_state() -> Dict[str, Any]:
+        return {"state": CLOSED, "failures": 0, "opened_at": 0.0, "probe_started": 0.0, "successes": 0}
+
+    @contextmanager
+    def _state(self) -> Iterator[Dict[str, Any]]:
+        """Lock and yield the current state; changes are saved on exit"""
+        with self._lock:
+            if not self.state_path:
+                yield self._local
+                self._seen = dict(self._local)
+                return
+
+            with open(self.state_path + ".lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    with open(self.state_path, "r", encoding="utf-8") as handle:
+                        state = {**self.initial_state(), **json.load(handle)}
+                except (OSError, ValueError):
+                    state = self.initial_state()
+                before = dict(state)
+
+                yield state
+
+                if state != before:
+                    tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "w", encoding="utf-8") as handle:
+                        json.dump(state, handle)
+                    os.replace(tmp_path, self.state_path)
+                self._seen = dict(state)
+
+    def allow(self) -> bool:
+        """
+        Decide whether a request may be sent
+
+        Returns:
+            True if the circuit is closed or this caller is the half-open probe
+        """
+        now = time.time()
+        with self._state() as state:
+            if state["state"] == CLOSED:
+                return True
+            if state["state"] == OPEN:
+                if now - state["opened_at"] < self.reset_timeout:
+                    return False
+                state.update(state=HALF_OPEN, successes=0, probe_started=0.0)
+                self.logger.info("Jira circuit half-open, probing")
+            if now - state["probe_started"] < self.probe_timeout:
+                return False
+            state["probe_started"] = now
+            return True
+
+    def record_success(self):
+        """Record a request that reached a healthy Jira"""
+        seen = self._seen
+        if seen["state"] == CLOSED and not seen["failures"]:
+            return
+        with self._state() as state:
+            if state["state"] == HALF_OPEN:
+                state["successes"] += 1
+                state["probe_started"] = 0.0
+                if state["successes"] >= self.probe_successes:
+                    state.update(self.initial_state())
+                    self.logger.info("Jira circuit closed")
+            elif state["state"] == CLOSED:
+                state["failures"] = 0
+
+    def record_failure(self):
+        """Record a connection error, timeout, rate limit or server error"""
+        now = time.time()
+        with self._state() as state:
+            if state["state"] == HALF_OPEN:
+                state.update(state=OPEN, opened_at=now, probe_started=0.0, successes=0)
+                self.logger.warning("Jira probe failed, circuit open again")
+            elif state["state"] == CLOSED:
+                state["failures"] += 1
+                if state["failures"] >= self.failure_threshold:
+                    state.update(state=OPEN, opened_at=now)
+                    self.logger.warning(f"Jira circuit open after {state['failures']} consecutive failures")
+
+    def status(self) -> Dict[str, Any]:
+        """Return a copy of the current state"""
+        with self._state() as state:
+            return dict(state)
+
+
+class BreakerAdapter(HTTPAdapter):
+    """
+    HTTPAdapter applying a default timeout and an optional circuit breaker
+
+    Connection errors, timeouts, 429 and 5xx responses count as failures,
+    matching what the incident spool treats as Jira being unavailable;
+    every other response counts as a success.
+
+    Args:
+        breaker: Circuit breaker, or None for timeouts only
+        timeout: Timeout for requests that do not set one, as seconds
+            or a (connect, read) tuple
+        kwargs: Passed to HTTPAdapter (e.g., pool_maxsize)
+    """
+
+    def __init__(self,
+                 breaker: Optional[CircuitBreaker] = None,
+                 timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 **kwargs):
+        self.breaker = breaker
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        breaker = self.breaker
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError("Jira circuit open, request not sent", request=request)
+
+        try:
+            response = super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+        except requests.RequestException:
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+
+        if breaker is not None:
+            if response.status_code >= 500 or response.status_code == 429:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        return response
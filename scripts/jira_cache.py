@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Jira Issue Cache for SOC Project
+LRU cache of issue reads with TTL eviction and conditional revalidation
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class CacheEntry:
+    __slots__ = ("value", "etag", "last_modified", "updated", "stored_at", "validated_at")
+
+    def __init__(self, value: Any, etag: Optional[str], last_modified: Optional[str], updated: Optional[str]):
+        self.value = value
+        self.etag = etag
+        self.last_modified = last_modified
+        self.updated = updated
+        self.stored_at = time.monotonic()
+        self.validated_at = self.stored_at
+
+    def validators(self) -> Dict[str, str]:
+        """
+        Build conditional request headers for revalidation
+
+        Returns:
+            If-None-Match / If-Modified-Since headers (empty if the server
+            sent no validators)
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class IssueCache:
+    """
+    Least-recently-used cache of issue responses
+
+    Entries younger than fresh_ttl are served without contacting Jira.
+    Older entries are revalidated: with If-None-Match/If-Modified-Since
+    when Jira sent validators, otherwise by comparing the issue's
+    "updated" timestamp. Entries older than max_age are dropped.
+    """
+
+    def __init__(self, max_entries: int = 1024, fresh_ttl: float = 5.0, max_age: float = 300.0):
+        """
+        Initialize issue cache
+
+        Args:
+            max_entries: Maximum cached responses
+            fresh_ttl: Seconds an entry is served without revalidation
+            max_age: Seconds after which an entry is evicted
+        """
+        self.max_entries = max_entries
+        self.fresh_ttl = fresh_ttl
+        self.max_age = max_age
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def lookup(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Find an entry that has not yet reached max_age
+
+        Args:
+            key: Cache key (issue key, fields, expand)
+
+        Returns:
+            Cache entry or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.stored_at > self.max_age:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Whether an entry can be served without revalidation"""
+        return time.monotonic() - entry.validated_at <= self.fresh_ttl
+
+    def mark_validated(self, entry: CacheEntry):
+        """Record that Jira confirmed an entry is still current"""
+        with self._lock:
+            entry.validated_at = time.monotonic()
+            self.revalidated += 1
+
+    def record_hit(self):
+        """Count an entry served without contacting Jira"""
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        """Count a response that had to be fetched in full"""
+        with self._lock:
+            self.misses += 1
+
+    def store(self, key: Hashable, entry: CacheEntry):
+        """
+        Add or replace an entry, evicting the least recently used if full
+
+        Args:
+            key: Cache key
+            entry: Entry to store
+        """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, issue_key: str):
+        """
+        Drop every entry for an issue, e.g., after changing it
+
+        Args:
+            issue_key: Jira ticket key
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == issue_key]:
+                del self._entries[key]
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        Get cache counters
+
+        Returns:
+            Metrics dictionary
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits,
+                    "revalidated": self.revalidated, "misses": self.misses}
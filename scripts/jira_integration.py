@@ -5,14 +5,107 @@ Creates and manages Jira tickets from security alerts
 """
 
 import requests
-import json
 import os
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional
+import time
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional, Tuple
+
+from alert_records import Incident
+from jira_breaker import DEFAULT_TIMEOUT, BreakerAdapter, CircuitBreaker
+from jira_cache import CacheEntry, IssueCache
+from incident_templates import IncidentTemplates
+import json_codec
+
+# Alert scripts import this module once per alert, so modules only some
+# callers need (thread pools, metrics export) are imported where used
+if TYPE_CHECKING:
+    from incident_spool import IncidentSpool
+    from jira_metrics import JiraMetrics
+
+# Fields the SOC scripts read; pass as get_incident_details(fields=...) to
+# fetch only these instead of every field
+INCIDENT_DETAIL_FIELDS = ["summary", "status", "priority", "labels", "created", "updated",
+                         "description", "customfield_mitre_technique"]
+
+# Incident severity -> Jira priority
+PRIORITY_MAP = {
+    "Low": "Low",
+    "Medium": "Medium",
+    "High": "High",
+    "Critical": "Highest"
+}
+
+# Issue type of tickets created by create_security_incident
+INCIDENT_ISSUE_TYPE = "Security Incident"
+
+# Templates shared by integrations that do not bring their own, so each
+# (issue type, severity) is compiled once per process
+DEFAULT_TEMPLATES = IncidentTemplates()
+
+# Concurrent transitions used by update_incidents_status_bulk (also the HTTP pool size)
+BULK_CONCURRENCY = 16
+
+# Issue keys per JQL "key in (...)" lookup (Jira caps search pages at 100)
+BULK_LOOKUP_KEYS = 100
+
+class IncidentDetails:
+    """
+    Projected view of a Jira issue
+
+    Common fields are unpacked into attributes; every other requested
+    field stays in `fields`, and expanded sections (e.g., changelog,
+    renderedFields) in `expanded`.
+    """
+
+    __slots__ = ("key", "id", "summary", "status", "priority", "updated", "fields", "expanded")
+
+    def __init__(self, issue: Dict[str, Any]):
+        fields = issue.get("fields") or {}
+        self.key = issue.get("key")
+        self.id = issue.get("id")
+        self.summary = fields.get("summary")
+        self.status = (fields.get("status") or {}).get("name")
+        self.priority = (fields.get("priority") or {}).get("name")
+        self.updated = fields.get("updated")
+        self.fields = fields
+        self.expanded = {name: value for name, value in issue.items()
+                         if name in ("renderedFields", "changelog", "names", "schema", "transitions")}
+
+    def get(self, field: str, default: Any = None) -> Any:
+        """Return a raw field value"""
+        return self.fields.get(field, default)
+
+    def __repr__(self) -> str:
+        return f"IncidentDetails(key={self.key!r}, status={self.status!r}, priority={self.priority!r})"
+
+def find_transition(transitions: List[Dict[str, Any]], status: str) -> Optional[str]:
+    """
+    Pick the transition leading to a status
+
+    Args:
+        transitions: Transitions from the issue transitions endpoint
+        status: Target status (matched case-insensitively as a substring)
+
+    Returns:
+        Transition ID or None if no transition leads there
+    """
+    for transition in transitions:
+        if status.lower() in transition["to"]["name"].lower():
+            return transition["id"]
+    return None
 
 class JiraIntegration:
-    def __init__(self, jira_url: str, username: str, api_token: str, project_key: str):
+    def __init__(self,
+                 jira_url: str,
+                 username: str,
+                 api_token: str,
+                 project_key: str,
+                 cache: Optional[IssueCache] = None,
+                 metrics: Optional["JiraMetrics"] = None,
+                 templates: Optional[IncidentTemplates] = None,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+                 breaker: Optional[CircuitBreaker] = None,
+                 spool: Optional["IncidentSpool"] = None):
         """
         Initialize Jira integration
         
@@ -21,14 +114,36 @@ class JiraIntegration:
             username: Jira username or email
             api_token: Jira API token
             project_key: Jira project key for creating tickets
+            cache: Optional cache for get_incident_details responses
+            metrics: Optional registry recording latency, status codes and
+                bytes for every Jira request
+            templates: Optional incident description templates
+                (DEFAULT_TEMPLATES if not set)
+            timeout: (connect, read) timeout in seconds for every request
+            breaker: Optional circuit breaker; while it is open, requests
+                fail immediately instead of waiting on Jira
+            spool: Optional local spool for incidents created with
+                create_incident while Jira is unavailable
         """
         self.jira_url = jira_url.rstrip('/')
         self.username = username
         self.api_token = api_token
         self.project_key = project_key
-        self.session = requests.Session()
+        self.cache = cache
+        self.metrics = metrics
+        self.templates = templates or DEFAULT_TEMPLATES
+        self.breaker = breaker
+        self.spool = spool
+        if metrics:
+            from jira_metrics import InstrumentedSession
+            self.session = InstrumentedSession(metrics)
+        else:
+            self.session = requests.Session()
         self.session.auth = (username, api_token)
         self.session.headers.update({'Content-Type': 'application/json'})
+        adapter = BreakerAdapter(breaker, timeout, pool_maxsize=BULK_CONCURRENCY)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
@@ -55,76 +170,125 @@ class JiraIntegration:
         Returns:
             Jira ticket key (e.g., SEC-123) or None if failed
         """
-        try:
-            # Map severity to Jira priority
-            priority_map = {
-                "Low": "Low",
-                "Medium": "Medium", 
-                "High": "High",
-                "Critical": "Highest"
-            }
-            priority = priority_map.get(severity, "Medium")
-            
-            # Build description with structured information
-            full_description = f"""
-{description}
-
-**Security Details:**
-- Severity: {severity}
-- Detection Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
-"""
-            
-            if mitre_technique:
-                full_description += f"- MITRE ATT&CK Technique: {mitre_technique}\n"
-            if source_ip:
-                full_description += f"- Source IP: {source_ip}\n"
-            if affected_user:
-                full_description += f"- Affected User: {affected_user}\n"
-            
-            full_description += f"""
-**Response Actions Required:**
-- [ ] Investigate the incident
-- [ ] Determine root cause
-- [ ] Implement remediation
-- [ ] Update detection rules if needed
-- [ ] Document lessons learned
-
-**Automated Response:**
-This ticket was automatically created by the SOC monitoring system.
-"""
-            
-            # Create Jira issue
-            issue_data = {
-                "fields": {
-                    "project": {"key": self.project_key},
-                    "summary": summary,
-                    "description": full_description,
-                    "issuetype": {"name": "Security Incident"},
-                    "priority": {"name": priority},
-                    "labels": ["soc-automated", "security-incident"]
-                }
+        issue_key, _unavailable = self._post_issue(self._issue_body(summary, description, severity, mitre_technique,
+                                                                     source_ip, affected_user))
+        return issue_key
+    
+    def _issue_body(self,
+                    summary: str,
+                    description: str,
+                    severity: str,
+                    mitre_technique: Optional[str],
+                    source_ip: Optional[str],
+                    affected_user: Optional[str],
+                    enrichment: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build the create-issue request body for a security incident"""
+        priority = PRIORITY_MAP.get(severity, "Medium")
+        
+        # Build description with structured information
+        full_description = self.templates.render(description, severity, INCIDENT_ISSUE_TYPE,
+                                                 mitre_technique, source_ip, affected_user, enrichment)
+        
+        issue_data = {
+            "fields": {
+                "project": {"key": self.project_key},
+                "summary": summary,
+                "description": full_description,
+                "issuetype": {"name": INCIDENT_ISSUE_TYPE},
+                "priority": {"name": priority},
+                "labels": ["soc-automated", "security-incident"]
             }
-            
-            # Add custom fields if available
-            if mitre_technique:
-                issue_data["fields"]["customfield_mitre_technique"] = mitre_technique
-            
+        }
+        
+        # Add custom fields if available
+        if mitre_technique:
+            issue_data["fields"]["customfield_mitre_technique"] = mitre_technique
+        return issue_data
+    
+    def _post_issue(self, issue_data: Dict[str, Any]) -> Tuple[Optional[str], bool]:
+        """
+        Create an issue from a request body
+        
+        Returns:
+            (issue key or None, whether the failure was Jira being
+            unavailable rather than Jira rejecting the issue)
+        """
+        try:
             response = self.session.post(
                 f"{self.jira_url}/rest/api/2/issue",
-                data=json.dumps(issue_data)
+                data=json_codec.dumps(issue_data)
             )
             
             if response.status_code == 201:
-                issue_key = response.json()["key"]
+                issue_key = json_codec.loads(response.content)["key"]
                 self.logger.info(f"Created Jira ticket: {issue_key}")
-                return issue_key
+                return issue_key, False
             else:
                 self.logger.error(f"Failed to create Jira ticket: {response.status_code} - {response.text}")
-                return None
+                return None, response.status_code >= 500 or response.status_code == 429
                 
+        except requests.RequestException as e:
+            self.logger.error(f"Error creating Jira ticket: {str(e)}")
+            return None, True
         except Exception as e:
             self.logger.error(f"Error creating Jira ticket: {str(e)}")
-            return None
+            return None, False
+    
+    def create_incident(self, incident: Incident, comment: Optional[str] = None) -> Optional[str]:
+        """
+        Create a security incident ticket from an Incident record
+        
+        If Jira is unavailable (circuit open, connection error, timeout,
+        5xx or 429) and a spool is configured, the issue and comment are
+        spooled for replay_spool and `incident.spooled` is set.
+        
+        Args:
+            incident: Incident to create; its key is set on success
+            comment: Optional comment added once the issue exists
+            
+        Returns:
+            Jira ticket key (e.g., SEC-123) or None if failed or spooled
+        """
+        issue_data = self._issue_body(incident.summary, incident.description, incident.severity,
+                                      incident.mitre_technique, incident.source_ip, incident.affected_user,
+                                      incident.enrichment)
+        incident.key, unavailable = self._post_issue(issue_data)
+        
+        if incident.key:
+            if comment:
+                self.add_comment(incident.key, comment)
+        elif unavailable and self.spool is not None:
+            self.spool.append(issue_data, comment)
+            incident.spooled = True
+            self.logger.warning(f"Jira unavailable, incident spooled to {self.spool.path}")
+        return incident.key
+    
+    def replay_spool(self) -> Dict[str, int]:
+        """
+        Create the incidents spooled while Jira was unavailable
+        
+        Stops at the first incident Jira still cannot take; incidents Jira
+        rejects are moved aside to the spool's .rejected file.
+        
+        Returns:
+            Counts of created, rejected and remaining incidents
+        """
+        if self.spool is None:
+            return {"created": 0, "rejected": 0, "remaining": 0}
+        
+        def create(entry: Dict[str, Any]) -> Optional[bool]:
+            issue_key, unavailable = self._post_issue(entry["issue"])
+            if self.metrics:
+                self.metrics.observe_replay("created" if issue_key else "unavailable" if unavailable else "rejected")
+            if issue_key:
+                if entry.get("comment"):
+                    self.add_comment(issue_key, entry["comment"])
+                return True
+            return False if unavailable else None
+        
+        counts = self.spool.replay(create)
+        self.logger.info(f"Spool replay: {counts}")
+        return counts
     
     def update_incident_status(self, issue_key: str, status: str, comment: str = "") -> bool:
         """
@@ -144,13 +308,7 @@ This ticket was automatically created by the SOC monitoring system.
             if response.status_code != 200:
                 return False
             
-            transitions = response.json()["transitions"]
-            target_transition = None
-            
-            for transition in transitions:
-                if status.lower() in transition["to"]["name"].lower():
-                    target_transition = transition["id"]
-                    break
+            target_transition = find_transition(json_codec.loads(response.content)["transitions"], status)
             
             if not target_transition:
                 self.logger.error(f"Status '{status}' not found in available transitions")
@@ -168,10 +326,12 @@ This ticket was automatically created by the SOC monitoring system.
             
             response = self.session.post(
                 f"{self.jira_url}/rest/api/2/issue/{issue_key}/transitions",
-                data=json.dumps(transition_data)
+                data=json_codec.dumps(transition_data)
             )
             
             if response.status_code == 204:
+                if self.cache:
+                    self.cache.invalidate(issue_key)
                 self.logger.info(f"Updated {issue_key} status to {status}")
                 return True
             else:
@@ -182,6 +342,100 @@ This ticket was automatically created by the SOC monitoring system.
             self.logger.error(f"Error updating incident status: {str(e)}")
             return False
     
+    def update_incidents_status_bulk(self,
+                                     issue_keys: List[str],
+                                     status: str,
+                                     comment: str = "",
+                                     concurrency: int = BULK_CONCURRENCY) -> Dict[str, Dict[str, Any]]:
+        """
+        Update the status of many incidents
+
+        Current states are looked up with a few JQL searches, issues are
+        grouped by (status, issue type), and the available transitions are
+        fetched once per group instead of once per issue. The transitions
+        then run concurrently. Issues already in the target status count as
+        successful and are left unchanged.
+
+        Args:
+            issue_keys: Jira ticket keys
+            status: New status (e.g., "Resolved")
+            comment: Optional comment added with each transition
+            concurrency: Maximum transitions in flight
+
+        Returns:
+            Issue key -> {"success": bool, "from": previous status,
+            "seconds": transition time, "error": message or None}
+        """
+        started = time.monotonic()
+        results: Dict[str, Dict[str, Any]] = {
+            key: {"success": False, "from": None, "seconds": 0.0, "error": "Issue not found"}
+            for key in issue_keys}
+
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for issue in self._lookup_states(list(results)):
+            fields = issue.get("fields") or {}
+            state = ((fields.get("status") or {}).get("name", ""), (fields.get("issuetype") or {}).get("name", ""))
+            if issue["key"] not in results:
+                continue
+            results[issue["key"]].update({"from": state[0], "error": None})
+            if state[0].lower() == status.lower():
+                results[issue["key"]]["success"] = True
+            else:
+                groups.setdefault(state, []).append(issue["key"])
+
+        jobs = []
+        for state, keys in groups.items():
+            target_transition = None
+            try:
+                response = self.session.get(f"{self.jira_url}/rest/api/2/issue/{keys[0]}/transitions")
+                if response.status_code == 200:
+                    target_transition = find_transition(json_codec.loads(response.content)["transitions"], status)
+            except Exception as e:
+                self.logger.error(f"Error getting transitions for {keys[0]}: {str(e)}")
+            if not target_transition:
+                self.logger.error(f"Status '{status}' not reachable from '{state[0]}' for {len(keys)} issues")
+                for key in keys:
+                    results[key]["error"] = f"Status '{status}' not found in available transitions"
+                continue
+
+            transition_data = {"transition": {"id": target_transition}}
+            if comment:
+                transition_data["update"] = {"comment": [{"add": {"body": comment}}]}
+            body = json_codec.dumps(transition_data)
+            jobs.extend((key, body) for key in keys)
+
+        def transition(job):
+            key, body = job
+            job_started = time.monotonic()
+            try:
+                response = self.session.post(f"{self.jira_url}/rest/api/2/issue/{key}/transitions", data=body)
+                error = None if response.status_code == 204 else f"HTTP {response.status_code}"
+            except Exception as e:
+                error = str(e)
+            return key, error, time.monotonic() - job_started
+
+        if jobs:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(jobs)))) as executor:
+                for key, error, seconds in executor.map(transition, jobs):
+                    results[key].update({"success": error is None, "seconds": seconds, "error": error})
+                    if self.cache:
+                        self.cache.invalidate(key)
+
+        updated = sum(1 for result in results.values() if result["success"])
+        self.logger.info(f"Updated {updated}/{len(results)} incidents to {status} "
+                         f"in {time.monotonic() - started:.2f}s")
+        return results
+
+    def _lookup_states(self, issue_keys: List[str]) -> Iterator[Dict[str, Any]]:
+        """Yield issues with their status and issue type, looked up in chunks"""
+        for start in range(0, len(issue_keys), BULK_LOOKUP_KEYS):
+            chunk = issue_keys[start:start + BULK_LOOKUP_KEYS]
+            page = self.search_issues(f"key in ({','.join(chunk)})", 0, len(chunk),
+                                      ["status", "issuetype"], validate_query="warn")
+            if page is not None:
+                yield from page.get("issues", [])
+
     def add_comment(self, issue_key: str, comment: str) -> bool:
         """
         Add comment to Jira ticket
@@ -198,10 +452,12 @@ This ticket was automatically created by the SOC monitoring system.
             
             response = self.session.post(
                 f"{self.jira_url}/rest/api/2/issue/{issue_key}/comment",
-                data=json.dumps(comment_data)
+                data=json_codec.dumps(comment_data)
             )
             
             if response.status_code == 201:
+                if self.cache:
+                    self.cache.invalidate(issue_key)
                 self.logger.info(f"Added comment to {issue_key}")
                 return True
             else:
@@ -212,21 +468,70 @@ This ticket was automatically created by the SOC monitoring system.
             self.logger.error(f"Error adding comment: {str(e)}")
             return False
     
-    def get_incident_details(self, issue_key: str) -> Optional[Dict[str, Any]]:
+    def get_incident_details(self,
+                             issue_key: str,
+                             fields: Optional[List[str]] = None,
+                             expand: Optional[List[str]] = None) -> Optional[IncidentDetails]:
         """
         Get incident details from Jira
+
+        With a cache configured, a recently validated response is returned
+        without a request; an older one is revalidated with a conditional
+        GET (or, if Jira sent no ETag/Last-Modified, by fetching only the
+        "updated" field) and reused if the issue has not changed.
         
         Args:
             issue_key: Jira ticket key
+            fields: Fields to fetch (every field if None). INCIDENT_DETAIL_FIELDS
+                covers what the SOC scripts read; status polling only
+                needs ["status"]. With a cache, "updated" is always
+                fetched too.
+            expand: Sections to expand (e.g., ["changelog", "renderedFields"])
             
         Returns:
-            Incident details dictionary or None if failed
+            Incident details or None if failed
         """
         try:
-            response = self.session.get(f"{self.jira_url}/rest/api/2/issue/{issue_key}")
-            
-            if response.status_code == 200:
-                return response.json()
+            params = {}
+            if fields:
+                # Revalidation without ETag/Last-Modified compares "updated",
+                # so cached responses must carry it
+                if self.cache and "updated" not in fields:
+                    params["fields"] = ",".join(list(fields) + ["updated"])
+                else:
+                    params["fields"] = ",".join(fields)
+            if expand:
+                params["expand"] = ",".join(expand)
+
+            entry = None
+            headers = {}
+            if self.cache:
+                cache_key = (issue_key, tuple(sorted(fields or [])), tuple(sorted(expand or [])))
+                entry = self.cache.lookup(cache_key)
+                if entry is not None:
+                    if self.cache.is_fresh(entry):
+                        self.cache.record_hit()
+                        return entry.value
+                    headers = entry.validators()
+                    if not headers and self._unchanged_since(issue_key, entry.updated):
+                        self.cache.mark_validated(entry)
+                        return entry.value
+
+            response = self.session.get(f"{self.jira_url}/rest/api/2/issue/{issue_key}",
+                                        params=params, headers=headers)
+
+            if response.status_code == 304 and entry is not None:
+                self.cache.mark_validated(entry)
+                return entry.value
+            elif response.status_code == 200:
+                details = IncidentDetails(json_codec.loads(response.content))
+                if self.cache:
+                    self.cache.record_miss()
+                    self.cache.store(cache_key, CacheEntry(details,
+                                                           response.headers.get("ETag"),
+                                                           response.headers.get("Last-Modified"),
+                                                           details.updated))
+                return details
             else:
                 self.logger.error(f"Failed to get incident details: {response.status_code}")
                 return None
@@ -235,6 +540,101 @@ This ticket was automatically created by the SOC monitoring system.
             self.logger.error(f"Error getting incident details: {str(e)}")
             return None
 
+    def _unchanged_since(self, issue_key: str, updated: Optional[str]) -> bool:
+        """Check whether an issue's "updated" timestamp still matches a cached value"""
+        if not updated:
+            return False
+        response = self.session.get(f"{self.jira_url}/rest/api/2/issue/{issue_key}",
+                                    params={"fields": "updated"})
+        return (response.status_code == 200
+                and (json_codec.loads(response.content).get("fields") or {}).get("updated") == updated)
+
+    def search_issues(self,
+                      jql: str,
+                      start_at: int = 0,
+                      max_results: int = 100,
+                      fields: Optional[List[str]] = None,
+                      validate_query: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Run one page of a JQL search
+
+        Args:
+            jql: JQL query
+            start_at: Index of the first issue to return
+            max_results: Maximum issues to return
+            fields: Fields to include (all navigable fields if None)
+            validate_query: JQL validation mode ("warn" skips unknown issue
+                keys instead of failing the search)
+
+        Returns:
+            Search response with "issues" and "total", or None if failed
+        """
+        try:
+            search_data = {
+                "jql": jql,
+                "startAt": start_at,
+                "maxResults": max_results
+            }
+            if fields:
+                search_data["fields"] = fields
+            if validate_query:
+                search_data["validateQuery"] = validate_query
+
+            response = self.session.post(
+                f"{self.jira_url}/rest/api/2/search",
+                data=json_codec.dumps(search_data)
+            )
+
+            if response.status_code == 200:
+                return json_codec.loads(response.content)
+            else:
+                self.logger.error(f"Failed to search issues: {response.status_code} - {response.text}")
+                return None
+
+        except Exception as e:
+            self.logger.error(f"Error searching issues: {str(e)}")
+            return None
+
+    def iter_incidents(self,
+                       jql: str,
+                       fields: Optional[List[str]] = None,
+                       page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all issues matching a JQL query, one page in memory at a time
+
+        The next page is requested in the background while the current
+        page is being consumed. Iteration stops early (and logs the error)
+        if a page request fails.
+
+        Args:
+            jql: JQL query
+            fields: Fields to include (all navigable fields if None)
+            page_size: Issues fetched per request
+
+        Returns:
+            Iterator of issue dictionaries
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(self.search_issues, jql, 0, page_size, fields)
+            start_at = 0
+
+            while future is not None:
+                page = future.result()
+                if page is None:
+                    return
+
+                issues = page.get("issues", [])
+                start_at += len(issues)
+                future = None
+                if issues and start_at < page.get("total", 0):
+                    future = executor.submit(self.search_issues, jql, start_at, page_size, fields)
+
+                yield from issues
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
 def main():
     """Example usage of Jira integration"""
     
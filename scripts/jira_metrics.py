@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Jira Client Metrics for SOC Project
+Per-endpoint latency histograms and request counters exported in Prometheus text format
+"""
+
+import fcntl
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Metric families: name -> (type, help)
+FAMILIES = {
+    "jira_requests_total": ("counter", "Jira REST requests by endpoint and status code"),
+    "jira_request_duration_seconds": ("histogram", "Jira REST request latency"),
+    "jira_request_bytes_sent_total": ("counter", "Request body bytes sent to Jira"),
+    "jira_response_bytes_received_total": ("counter", "Response body bytes received from Jira"),
+    "jira_spool_replays_total": ("counter", "Spooled incidents re-sent to Jira by outcome")
+}
+
+# Path segments replaced so each endpoint is one label value
+ENDPOINT_PATTERNS = [
+    (re.compile(r"/issue/[A-Za-z][A-Za-z0-9_]*-\d+"), "/issue/{key}"),
+    (re.compile(r"/(issue|comment|worklog|attachment)/\d+(?=/|$)"), r"/\1/{id}")
+]
+
+SAMPLE_LINE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$")
+LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+LABEL_ESCAPE = re.compile(r'[\\"\n]')
+LABEL_UNESCAPE = re.compile(r'\\(.)')
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def endpoint_template(url: str) -> str:
+    """
+    Reduce a request URL to its endpoint (e.g., /rest/api/2/issue/{key}/transitions)
+
+    Args:
+        url: Request URL
+
+    Returns:
+        URL path with issue keys and numeric IDs replaced
+    """
+    path = urlparse(url).path
+    for pattern, replacement in ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+def escape_label_value(value: str) -> str:
+    """Escape backslash, double quote and newline in a label value"""
+    return LABEL_ESCAPE.sub(lambda match: "\\n" if match.group() == "\n" else "\\" + match.group(), value)
+
+
+def unescape_label_value(value: str) -> str:
+    """Undo escape_label_value()"""
+    return LABEL_UNESCAPE.sub(lambda match: "\n" if match.group(1) == "n" else match.group(1), value)
+
+
+def format_value(value: float) -> str:
+    """Format a sample value the way Prometheus writes it"""
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+class JiraMetrics:
+    """
+    In-process metrics registry for Jira calls
+
+    Every value is a counter (histogram buckets, sums and counts
+    included), so textfile exports from short-lived processes can be
+    summed into one file.
+    """
+
+    def __init__(self):
+        self._samples: Dict[Tuple[str, Labels], float] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, name: str, labels: Labels, value: float):
+        key = (name, labels)
+        self._samples[key] = self._samples.get(key, 0) + value
+
+    def observe(self,
+                method: str,
+                url: str,
+                status: str,
+                seconds: float,
+                sent: int = 0,
+                received: int = 0):
+        """
+        Record one Jira request
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            status: Status code, or "error" if no response was received
+            seconds: Request latency
+            sent: Request body bytes
+            received: Response body bytes
+        """
+        labels = (("method", method.upper()), ("endpoint", endpoint_template(url)))
+        with self._lock:
+            self._add("jira_requests_total", labels + (("status", str(status)),), 1)
+            for bound in LATENCY_BUCKETS:
+                if seconds <= bound:
+                    self._add("jira_request_duration_seconds_bucket", labels + (("le", format_value(bound)),), 1)
+            self._add("jira_request_duration_seconds_bucket", labels + (("le", "+Inf"),), 1)
+            self._add("jira_request_duration_seconds_sum", labels, seconds)
+            self._add("jira_request_duration_seconds_count", labels, 1)
+            self._add("jira_request_bytes_sent_total", labels, sent)
+            self._add("jira_response_bytes_received_total", labels, received)
+
+    def observe_replay(self, outcome: str):
+        """
+        Record one spooled incident re-sent to Jira
+
+        The client does not re-send requests itself; a spool replay is the
+        only retry of a failed request.
+
+        Args:
+            outcome: "created", "rejected", or "unavailable" if Jira still
+                could not take it
+        """
+        with self._lock:
+            self._add("jira_spool_replays_total", (("outcome", outcome),), 1)
+
+    def render(self) -> str:
+        """
+        Render every sample in Prometheus text exposition format
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            samples = dict(self._samples)
+        return render_samples(samples)
+
+    def write_textfile(self, path: str):
+        """
+        Add this process's samples into a node_exporter textfile
+
+        The file is locked, merged with the samples already in it and
+        replaced atomically; the registry is then reset so a later call
+        does not add the same requests twice.
+
+        Args:
+            path: .prom file in the textfile collector directory
+        """
+        with self._lock:
+            samples = self._samples
+            self._samples = {}
+
+        with open(path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            merged = parse_samples(path) if os.path.exists(path) else {}
+            for key, value in samples.items():
+                merged[key] = merged.get(key, 0) + value
+
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                handle.write(render_samples(merged))
+            os.replace(tmp_path, path)
+
+    def serve(self, port: int, address: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serve /metrics from a background thread
+
+        Args:
+            port: Port to listen on (0 picks a free port)
+            address: Address to bind
+
+        Returns:
+            Running HTTP server
+        """
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((address, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def sample_order(item):
+    """Sort samples by name and labels, with histogram buckets in numeric order"""
+    (name, labels), _value = item
+    return name, tuple((label, float(value) if label == "le" else 0.0, value) for label, value in labels)
+
+
+def render_samples(samples: Dict[Tuple[str, Labels], float]) -> str:
+    """Render samples grouped by family with HELP and TYPE lines"""
+    lines = []
+    for family, (metric_type, help_text) in FAMILIES.items():
+        family_samples = [(key, value) for key, value in samples.items()
+                          if key[0] == family or key[0].rsplit("_", 1)[0] == family]
+        if not family_samples:
+            continue
+        lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} {metric_type}")
+        for (name, labels), value in sorted(family_samples, key=sample_order):
+            label_text = ",".join(f'{label}="{escape_label_value(label_value)}"' for label, label_value in labels)
+            lines.append(f"{name}{{{label_text}}} {format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def parse_samples(path: str) -> Dict[Tuple[str, Labels], float]:
+    """Read samples back from a file written by render_samples()"""
+    samples = {}
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            match = SAMPLE_LINE.match(line.strip())
+            if match:
+                name, label_text, value = match.groups()
+                labels = tuple((label, unescape_label_value(label_value))
+                               for label, label_value in LABEL.findall(label_text or ""))
+                samples[(name, labels)] = float(value)
+    return samples
+
+
+def body_size(body) -> int:
+    """Size in bytes of a request body given as str or bytes"""
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    return len(body) if isinstance(body, bytes) else 0
+
+
+class InstrumentedSession(requests.Session):
+    """requests.Session that records every request in a JiraMetrics registry"""
+
+    def __init__(self, metrics: JiraMetrics):
+        super().__init__()
+        self.metrics = metrics
+
+    def request(self, method, url, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except Exception:
+            self.metrics.observe(method, url, "error", time.perf_counter() - started,
+                                 sent=body_size(kwargs.get("data")))
+            raise
+
+        self.metrics.observe(method, url, response.status_code, time.perf_counter() - started,
+                             sent=body_size(response.request.body),
+                             received=len(response.content))
+        return response
+
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+JSON Codec for SOC Project
+Pluggable JSON encoder/decoder using orjson or msgspec when installed, stdlib json otherwise
+"""
+
+import json
+import os
+from typing import Any, Callable, Optional
+
+# Backends in order of preference
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+class JSONCodec:
+    """
+    One JSON backend behind a common interface
+
+    dumps returns compact UTF-8 bytes, loads accepts bytes or str, and
+    invalid documents raise ValueError whatever the backend.
+    """
+
+    __slots__ = ("name", "dumps", "loads", "dumps_pretty")
+
+    def __init__(self,
+                 name: str,
+                 dumps: Callable[[Any], bytes],
+                 loads: Callable[[Any], Any],
+                 dumps_pretty: Callable[[Any], str]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+        self.dumps_pretty = dumps_pretty
+
+    def __repr__(self) -> str:
+        return f"JSONCodec({self.name!r})"
+
+
+def load_codec(name: str) -> JSONCodec:
+    """
+    Build the codec for one backend
+
+    Args:
+        name: One of BACKENDS
+
+    Returns:
+        Codec for the backend
+
+    Raises:
+        ImportError: If the backend package is not installed
+    """
+    if name == "orjson":
+        import orjson
+
+        options = orjson.OPT_NON_STR_KEYS
+        pretty_options = options | orjson.OPT_INDENT_2
+        # orjson.JSONDecodeError is already a ValueError
+        return JSONCodec(name,
+                         lambda obj: orjson.dumps(obj, option=options),
+                         orjson.loads,
+                         lambda obj: orjson.dumps(obj, option=pretty_options).decode("utf-8"))
+
+    if name == "msgspec":
+        import msgspec
+
+        encoder = msgspec.json.Encoder()
+        decoder = msgspec.json.Decoder()
+
+        def loads(data: Any) -> Any:
+            try:
+                return decoder.decode(data)
+            except msgspec.DecodeError as e:
+                raise ValueError(str(e)) from e
+
+        return JSONCodec(name,
+                         encoder.encode,
+                         loads,
+                         lambda obj: msgspec.json.format(encoder.encode(obj), indent=2).decode("utf-8"))
+
+    if name == "json":
+        encoder = json.JSONEncoder(separators=(",", ":"))
+        return JSONCodec(name,
+                         lambda obj: encoder.encode(obj).encode("utf-8"),
+                         json.loads,
+                         lambda obj: json.dumps(obj, indent=2))
+
+    raise ValueError(f"Unknown JSON backend: {name} (expected one of {', '.join(BACKENDS)})")
+
+
+def select_codec(preferred: Optional[str] = None) -> JSONCodec:
+    """
+    Pick the JSON backend
+
+    Args:
+        preferred: Backend to use; defaults to the SOC_JSON_BACKEND
+            environment variable, then the first installed of BACKENDS
+
+    Returns:
+        Codec for the chosen backend (stdlib json if the preferred one is
+        not installed)
+    """
+    preferred = preferred or os.getenv("SOC_JSON_BACKEND")
+    for name in ((preferred,) if preferred else BACKENDS):
+        try:
+            return load_codec(name)
+        except ImportError:
+            continue
+    return load_codec("json")
+
+
+CODEC = select_codec()
+BACKEND = CODEC.name
+
+# Module-level shortcuts for the selected backend
+dumps = CODEC.dumps
+loads = CODEC.loads
+dumps_pretty = CODEC.dumps_pretty
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Cloud Log Sources for SOC Project
+Streams raw log records from AWS, Azure and GCP audit log exports for forwarding to Splunk
+"""
+
+import gzip
+import itertools
+import logging
+import os
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from event_normalizer import FieldNormalizer
+import json_codec
+
+# Fields every source maps its records onto, as used by the detection rules
+COMMON_FIELDS = ("cloud", "event_type", "action", "outcome", "user", "src_ip", "service", "region")
+
+
+def get_path(record: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    """
+    Look up a nested value by key path
+
+    Args:
+        record: Raw log record
+        path: Keys to follow from the top of the record
+
+    Returns:
+        Value at the path or None if any key is missing
+    """
+    value = record
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+        if value is None:
+            return None
+    return value
+
+
+class LogSource:
+    """
+    Base class for forwarder log sources
+
+    Subclasses implement read_from() as a generator of raw records so the
+    forwarder never has to hold a full export in memory. Each record is
+    paired with the position just after it, which the forwarder commits
+    to its checkpoint store once the record has been delivered.
+
+    field_map maps each common field to candidate key paths in the raw
+    record; the first path with a value wins. The mapping is compiled into
+    extractor functions on first use rather than interpreted per event.
+    """
+
+    name = "source"
+    sourcetype = "_json"
+    cloud = None
+    field_map: Dict[str, Tuple[Tuple[str, ...], ...]] = {}
+    auth_actions: frozenset = frozenset()
+    _normalizer: Optional[FieldNormalizer] = None
+
+    @property
+    def normalizer(self) -> FieldNormalizer:
+        """Compiled extractor cache for this source's field map"""
+        if self._normalizer is None:
+            self._normalizer = FieldNormalizer(self.field_map)
+        return self._normalizer
+
+    def read(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield raw log records from the start of the source
+
+        Returns:
+            Iterator of record dictionaries
+        """
+        for _position, record in self.read_from(None):
+            yield record
+
+    def read_from(self, checkpoint: Optional[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Yield records after a checkpoint together with their positions
+
+        Args:
+            checkpoint: Position returned with a previously delivered record,
+                or None to read from the start
+
+        Returns:
+            Iterator of (position, record) tuples
+        """
+        raise NotImplementedError
+
+    def event_id(self, record: Dict[str, Any]) -> Optional[str]:
+        """
+        Extract the unique event ID from a record
+
+        Args:
+            record: Raw log record
+
+        Returns:
+            Event ID or None if the source has no IDs
+        """
+        return None
+
+    def event_time(self, record: Dict[str, Any]) -> Any:
+        """
+        Extract the event timestamp from a record
+
+        Args:
+            record: Raw log record
+
+        Returns:
+            ISO-8601 timestamp string, epoch seconds, or None if unknown
+        """
+        return None
+
+    def outcome(self, record: Dict[str, Any]) -> str:
+        """
+        Classify a record as a success or failure
+
+        Args:
+            record: Raw log record
+
+        Returns:
+            "success" or "failure"
+        """
+        return "success"
+
+    def normalize(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Map a raw record onto the common event schema
+
+        Args:
+            record: Raw log record
+
+        Returns:
+            Dictionary of common fields that have a value
+        """
+        fields = self.normalizer.extract(record)
+        fields["cloud"] = self.cloud
+        fields["outcome"] = self.outcome(record)
+        fields["event_type"] = self.event_type(fields)
+        return fields
+
+    def event_type(self, fields: Dict[str, Any]) -> Optional[str]:
+        """
+        Derive the detection-facing event type from normalized fields
+
+        Args:
+            fields: Normalized fields including action and outcome
+
+        Returns:
+            authentication_success/authentication_failure for sign-in
+            actions, otherwise the action name
+        """
+        action = fields.get("action")
+        if action in self.auth_actions:
+            return f"authentication_{fields['outcome']}"
+        return action
+
+
+def list_log_files(path: str, suffixes: tuple = (".json.gz", ".json")) -> List[str]:
+    """
+    List log export files under a path in a stable order
+
+    Args:
+        path: File or directory path
+        suffixes: File name suffixes to include
+
+    Returns:
+        Sorted list of file paths
+    """
+    if os.path.isfile(path):
+        return [path]
+
+    files = []
+    for root, _dirs, names in os.walk(path):
+        for name in names:
+            if name.endswith(suffixes):
+                files.append(os.path.join(root, name))
+    return sorted(files)
+
+
+def unwrap_document(document: Any, container_key: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Get the records of a document-style export
+
+    Args:
+        document: Parsed export document
+        container_key: Key of the record array in the document
+
+    Returns:
+        List of records
+    """
+    if isinstance(document, list):
+        return document
+    if container_key and container_key in document:
+        return document[container_key]
+    return [document]
+
+
+def iter_records(file_path: str, container_key: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of a plain or gzip-compressed export file
+
+    Handles both a single JSON document holding a record array under
+    container_key and newline-delimited JSON with one record per line.
+    Newline-delimited files are decoded a line at a time; a document is
+    only read whole when its first line is not valid JSON on its own
+    (i.e., it is pretty-printed) or it is the only line in the file.
+
+    Args:
+        file_path: Path to a .json or .json.gz file
+        container_key: Key of the record array in document-style files
+
+    Returns:
+        Iterator of records
+    """
+    opener = gzip.open if file_path.endswith(".gz") else open
+    with opener(file_path, "rb") as handle:
+        lines = (line for line in handle if line.strip())
+        first = next(lines, None)
+        if first is None:
+            return
+
+        try:
+            document = json_codec.loads(first)
+        except ValueError:
+            data = first + handle.read()
+            try:
+                document = json_codec.loads(data)
+            except ValueError:
+                for line in data.splitlines():
+                    if line.strip():
+                        yield json_codec.loads(line)
+                return
+            yield from unwrap_document(document, container_key)
+            return
+
+        second = next(lines, None)
+        if second is None:
+            yield from unwrap_document(document, container_key)
+            return
+
+        yield document
+        yield json_codec.loads(second)
+        for line in lines:
+            yield json_codec.loads(line)
+
+
+def resume_offset(records: Iterator[Dict[str, Any]], checkpoint: Dict[str, Any], event_id) -> Tuple[int, int]:
+    """
+    Find where to resume inside a partially forwarded file
+
+    The stored offset is trusted only if the record before it still has
+    the stored event ID. Otherwise the file changed since the checkpoint
+    was written and the last delivered event is searched for by ID.
+
+    Records are consumed only as far as needed, so when the returned
+    index equals the number consumed, forwarding continues from the same
+    iterator. Otherwise the resume point lies behind the records already
+    consumed and the file has to be read again.
+
+    Args:
+        records: Iterator over the records of the cursor file
+        checkpoint: Stored position for the source
+        event_id: Callable extracting an event ID from a record
+
+    Returns:
+        (index of the first record still to forward, records consumed)
+    """
+    offset = checkpoint.get("offset", 0)
+    last_event_id = checkpoint.get("last_event_id")
+    consumed = 0
+    if not last_event_id:
+        for _record in itertools.islice(records, max(offset, 0)):
+            consumed += 1
+        return consumed, consumed
+
+    first_match = None
+    for record in records:
+        consumed += 1
+        if event_id(record) == last_event_id:
+            if consumed >= offset:
+                return consumed, consumed
+            if first_match is None:
+                first_match = consumed
+        elif consumed == offset and first_match is not None:
+            return first_match, consumed
+
+    if first_match is not None:
+        return first_match, consumed
+
+    logging.getLogger(__name__).warning(
+        f"Last event {last_event_id} not found in {checkpoint.get('cursor')}, rereading file")
+    return 0, consumed
+
+
+class FileLogSource(LogSource):
+    """
+    Reads cloud log export files from a local directory
+
+    Files are read one at a time in name order; all three clouds name
+    their export objects so that this is delivery-time order.
+    """
+
+    container_key: Optional[str] = None
+
+    def __init__(self, path: str, name: Optional[str] = None):
+        """
+        Initialize file source
+
+        Args:
+            path: Export file or directory of files
+            name: Source name used for checkpoints (defaults to the class name)
+        """
+        self.path = path
+        if name:
+            self.name = name
+
+    def read_from(self, checkpoint: Optional[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        cursor = checkpoint.get("cursor") if checkpoint else None
+
+        for file_path in list_log_files(self.path):
+            # Files sort in delivery order, so anything before the cursor
+            # file has already been forwarded in full
+            if cursor and file_path < cursor:
+                continue
+
+            records = iter_records(file_path, self.container_key)
+            start = 0
+            if cursor and file_path == cursor:
+                start, consumed = resume_offset(records, checkpoint, self.event_id)
+                if consumed != start:
+                    records.close()
+                    records = itertools.islice(iter_records(file_path, self.container_key), start, None)
+
+            for offset, record in enumerate(records, start):
+                position = {
+                    "cursor": file_path,
+                    "offset": offset + 1,
+                    "last_event_id": self.event_id(record)
+                }
+                yield position, record
+
+
+class CloudTrailFileSource(FileLogSource):
+    """
+    Reads AWS CloudTrail log files as delivered to S3
+
+    Each file is a JSON document of the form {"Records": [...]}, usually
+    gzip-compressed.
+    """
+
+    name = "aws_cloudtrail"
+    sourcetype = "aws:cloudtrail"
+    cloud = "aws"
+    container_key = "Records"
+    field_map = {
+        "action": (("eventName",),),
+        "user": (("userIdentity", "userName"), ("userIdentity", "arn"), ("userIdentity", "principalId")),
+        "src_ip": (("sourceIPAddress",),),
+        "service": (("eventSource",),),
+        "region": (("awsRegion",),)
+    }
+    auth_actions = frozenset({"ConsoleLogin", "AssumeRoleWithSAML", "AssumeRoleWithWebIdentity"})
+
+    def event_id(self, record: Dict[str, Any]) -> Optional[str]:
+        return record.get("eventID")
+
+    def event_time(self, record: Dict[str, Any]) -> Any:
+        return record.get("eventTime")
+
+    def outcome(self, record: Dict[str, Any]) -> str:
+        if record.get("errorCode"):
+            return "failure"
+        if get_path(record, ("responseElements", "ConsoleLogin")) == "Failure":
+            return "failure"
+        return "success"
+
+
+class AzureActivityFileSource(FileLogSource):
+    """
+    Reads Azure Activity Log exports from a storage account container
+
+    Diagnostic settings write hourly PT1H.json blobs as newline-delimited
+    records; older exports wrap them in {"records": [...]}.
+    """
+
+    name = "azure_activity"
+    sourcetype = "azure:monitor:activity"
+    cloud = "azure"
+    container_key = "records"
+    field_map = {
+        "action": (("operationName",),),
+        "user": (("identity", "claims", "http://schemas.xmlsoap.org/ws/2005/05/identity/claims/upn"),
+                 ("identity", "claims", "name"), ("caller",)),
+        "src_ip": (("callerIpAddress",),),
+        "service": (("category",),),
+        "region": (("location",),)
+    }
+    auth_actions = frozenset({"Sign-in activity"})
+
+    def event_id(self, record: Dict[str, Any]) -> Optional[str]:
+        return get_path(record, ("properties", "eventDataId")) or record.get("correlationId")
+
+    def event_time(self, record: Dict[str, Any]) -> Any:
+        return record.get("time")
+
+    def outcome(self, record: Dict[str, Any]) -> str:
+        result = str(record.get("resultType", "")).lower()
+        # Sign-in records use "0" for success and an error code otherwise
+        if result in ("failure", "failed") or (result.isdigit() and result != "0"):
+            return "failure"
+        return "success"
+
+
+class GCPAuditFileSource(FileLogSource):
+    """
+    Reads GCP Cloud Audit Log exports from a Cloud Storage sink
+
+    Sinks write newline-delimited LogEntry records in hourly files.
+    """
+
+    name = "gcp_audit"
+    sourcetype = "google:gcp:pubsub:audit"
+    cloud = "gcp"
+    field_map = {
+        "action": (("protoPayload", "methodName"),),
+        "user": (("protoPayload", "authenticationInfo", "principalEmail"),),
+        "src_ip": (("protoPayload", "requestMetadata", "callerIp"),),
+        "service": (("protoPayload", "serviceName"),),
+        "region": (("resource", "labels", "location"), ("resource", "labels", "region"),
+                   ("resource", "labels", "zone"))
+    }
+    auth_actions = frozenset({"google.login.LoginService.loginSuccess", "google.login.LoginService.loginFailure"})
+
+    def event_id(self, record: Dict[str, Any]) -> Optional[str]:
+        return record.get("insertId")
+
+    def event_time(self, record: Dict[str, Any]) -> Any:
+        return record.get("timestamp")
+
+    def outcome(self, record: Dict[str, Any]) -> str:
+        if get_path(record, ("protoPayload", "status", "code")):
+            return "failure"
+        if get_path(record, ("protoPayload", "methodName")) == "google.login.LoginService.loginFailure":
+            return "failure"
+        return "success"
@@ -6,26 +6,41 @@ This script is called by Splunk when security alerts are triggered
 
 import sys
 import os
-import json
-import logging
-from datetime import datetime
 
-# Add the scripts directory to Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+# Splunk starts a fresh interpreter per alert, so logging, requests and the
+# Jira client are imported only once an alert actually needs them
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'scripts')
+
+# Inside the zipapp bundle (__file__ is archive.pyz/__main__.py) the project
+# modules are already on sys.path[0]; from source, append the scripts
+# directory so it is searched last
+if not os.path.isfile(os.path.dirname(__file__)) and SCRIPTS_DIR not in sys.path:
+    sys.path.append(SCRIPTS_DIR)
 
 try:
-    from jira_integration import JiraIntegration
-except ImportError:
-    print("Error: Could not import JiraIntegration. Make sure jira_integration.py is in the scripts directory.")
+    import json_codec
+    from alert_records import Alert, Incident
+except ImportError as e:
+    print(f"Error: Could not import {e.name}. Make sure {e.name}.py is in the scripts directory.")
     sys.exit(1)
 
+def load_jira_integration():
+    """Import JiraIntegration from the bundle or the scripts directory"""
+    try:
+        from jira_integration import JiraIntegration
+    except ImportError:
+        print("Error: Could not import JiraIntegration. Make sure jira_integration.py is in the scripts directory.")
+        sys.exit(1)
+    return JiraIntegration
+
 def setup_logging():
     """Setup logging for the alert action"""
+    import logging
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler('/opt/splunk/var/log/splunk/jira_alert_action.log'),
+            logging.FileHandler(os.getenv("JIRA_ALERT_ACTION_LOG", '/opt/splunk/var/log/splunk/jira_alert_action.log')),
             logging.StreamHandler()
         ]
     )
@@ -44,9 +59,9 @@ def parse_alert_data():
         if line:
             try:
                 # Parse JSON data from Splunk
-                data = json.loads(line)
+                data = json_codec.loads(line)
                 alert_data.update(data)
-            except json.JSONDecodeError:
+            except ValueError:
                 # Handle non-JSON lines
                 if '=' in line:
                     key, value = line.split('=', 1)
@@ -54,9 +69,18 @@ def parse_alert_data():
     
     return alert_data
 
-def determine_severity(alert_data):
+def alert_search_text(alert_data):
+    """
+    Lower-cased JSON text of an alert, searched for severity and MITRE keywords
+    """
+    return json_codec.dumps(alert_data).decode("utf-8").lower()
+
+def determine_severity(alert_data, alert_text=None, ioc_matches=None):
     """
     Determine incident severity based on alert data
+
+    alert_text is alert_search_text(alert_data), when the caller already has it;
+    ioc_matches (from ioc_matcher) raise the severity to that of the worst match
     """
     # Check for severity indicators in the alert
     severity_indicators = {
@@ -66,18 +90,25 @@ def determine_severity(alert_data):
         "Low": ["low", "info", "notice"]
     }
     
-    alert_text = json.dumps(alert_data).lower()
+    if alert_text is None:
+        alert_text = alert_search_text(alert_data)
     
-    for severity, indicators in severity_indicators.items():
-        for indicator in indicators:
-            if indicator in alert_text:
-                return severity
+    severity = "Medium"  # Default severity
+    for candidate, indicators in severity_indicators.items():
+        if any(indicator in alert_text for indicator in indicators):
+            severity = candidate
+            break
     
-    return "Medium"  # Default severity
+    if ioc_matches:
+        from ioc_matcher import highest_severity
+        severity = highest_severity(severity, ioc_matches)
+    return severity
 
-def extract_mitre_technique(alert_data):
+def extract_mitre_technique(alert_data, alert_text=None):
     """
     Extract MITRE ATT&CK technique from alert data
+
+    alert_text is alert_search_text(alert_data), when the caller already has it
     """
     # Common MITRE technique mappings
     technique_mappings = {
@@ -89,7 +120,8 @@ def extract_mitre_technique(alert_data):
         "defense evasion": "T1070"
     }
     
-    alert_text = json.dumps(alert_data).lower()
+    if alert_text is None:
+        alert_text = alert_search_text(alert_data)
     
     for keyword, technique in technique_mappings.items():
         if keyword in alert_text:
@@ -97,11 +129,20 @@ def extract_mitre_technique(alert_data):
     
     return None
 
-def create_jira_ticket(alert_data):
+def create_jira_ticket(alert):
     """
-    Create Jira ticket from alert data
+    Create Jira ticket from an Alert (or a parsed alert dictionary)
     """
+    if not isinstance(alert, Alert):
+        alert = Alert.from_dict(alert)
+    alert_data = alert.raw
     logger = setup_logging()
+    JiraIntegration = load_jira_integration()
+    metrics_file = os.getenv("JIRA_METRICS_TEXTFILE")
+    metrics = None
+    if metrics_file:
+        from jira_metrics import JiraMetrics
+        metrics = JiraMetrics()
     
     try:
         # Get Jira configuration from environment or alert data
@@ -114,40 +155,69 @@ def create_jira_ticket(alert_data):
             logger.error("Missing Jira configuration. Please set JIRA_URL, JIRA_USERNAME, and JIRA_API_TOKEN")
             return None
         
+        # Shared circuit breaker and local spool, so alerts fail fast and
+        # are kept while Jira is down
+        breaker = None
+        spool = None
+        if os.getenv("JIRA_BREAKER_STATE"):
+            from jira_breaker import CircuitBreaker
+            breaker = CircuitBreaker(os.getenv("JIRA_BREAKER_STATE"))
+        if os.getenv("JIRA_SPOOL"):
+            from incident_spool import IncidentSpool
+            spool = IncidentSpool(os.getenv("JIRA_SPOOL"))
+        
         # Initialize Jira integration
-        jira = JiraIntegration(jira_url, username, api_token, project_key)
+        jira = JiraIntegration(jira_url, username, api_token, project_key, metrics=metrics,
+                               breaker=breaker, spool=spool)
         
-        # Extract alert information
-        summary = alert_data.get("summary", "Security Alert Detected")
-        description = alert_data.get("description", "A security alert was triggered by the SOC monitoring system.")
-        severity = determine_severity(alert_data)
-        mitre_technique = extract_mitre_technique(alert_data)
-        source_ip = alert_data.get("src_ip") or alert_data.get("source_ip")
-        affected_user = alert_data.get("user") or alert_data.get("affected_user")
+        # Threat-intel matches of the alert's IPs, domains and hashes
+        ioc_matches = []
+        if os.getenv("SOC_IOC_DB"):
+            try:
+                from ioc_matcher import IOCIndex
+                ioc_matches = IOCIndex.open(os.getenv("SOC_IOC_DB")).match_alert(alert_data)
+            except Exception as e:
+                # Matching only adds context; a bad snapshot must not cost the ticket
+                logger.warning(f"IOC matching failed, continuing without matches: {str(e)}")
         
-        # Create the Jira ticket
-        issue_key = jira.create_security_incident(
-            summary=summary,
-            description=description,
-            severity=severity,
-            mitre_technique=mitre_technique,
-            source_ip=source_ip,
-            affected_user=affected_user
-        )
+        # Serialize the alert once for both keyword searches
+        alert_text = alert_search_text(alert_data)
+        incident = Incident.from_alert(alert,
+                                       severity=determine_severity(alert_data, alert_text, ioc_matches),
+                                       mitre_technique=extract_mitre_technique(alert_data, alert_text))
+
+        # GeoIP/ASN context for the source IP, from local databases
+        if incident.source_ip and os.getenv("SOC_GEOIP_DB"):
+            try:
+                from ip_enrichment import IPEnricher
+                enricher = IPEnricher.from_env()
+                if enricher:
+                    enricher.enrich_incident(incident)
+            except Exception as e:
+                # Enrichment only adds context; a bad database must not cost the ticket
+                logger.warning(f"IP enrichment failed, continuing without it: {str(e)}")
         
-        if issue_key:
-            logger.info(f"Successfully created Jira ticket: {issue_key}")
-            
-            # Add additional context as comment
-            context_comment = f"""
+        # Additional context, added as a comment once the ticket exists
+        from datetime import datetime
+        context_comment = f"""
 **Alert Context:**
 - Alert Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
 - Alert Source: Splunk SOC Monitoring
-- Raw Alert Data: {json.dumps(alert_data, indent=2)}
+- Raw Alert Data: {json_codec.dumps_pretty(alert_data)}
 """
-            jira.add_comment(issue_key, context_comment)
-            
+        if ioc_matches:
+            from ioc_matcher import describe_matches
+            context_comment += describe_matches(ioc_matches)
+        
+        # Create the Jira ticket
+        issue_key = jira.create_incident(incident, context_comment)
+        
+        if issue_key:
+            logger.info(f"Successfully created Jira ticket: {issue_key}")
             return issue_key
+        elif incident.spooled:
+            logger.warning("Jira unavailable, incident spooled for replay")
+            return None
         else:
             logger.error("Failed to create Jira ticket")
             return None
@@ -155,6 +225,9 @@ def create_jira_ticket(alert_data):
     except Exception as e:
         logger.error(f"Error creating Jira ticket: {str(e)}")
         return None
+    finally:
+        if metrics:
+            metrics.write_textfile(metrics_file)
 
 def main():
     """
@@ -168,7 +241,7 @@ def main():
         sys.exit(1)
     
     # Create Jira ticket
-    issue_key = create_jira_ticket(alert_data)
+    issue_key = create_jira_ticket(Alert.from_dict(alert_data))
     
     if issue_key:
         print(f"Jira ticket created: {issue_key}")
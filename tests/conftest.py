@@ -0,0 +1,12 @@
+"""
+Shared test setup for SOC Project
+Puts the scripts directory on sys.path, as the alert scripts do
+"""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
+
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
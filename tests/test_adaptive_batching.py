@@ -0,0 +1,111 @@
+"""Tests for scripts/adaptive_batching.py"""
+
+import threading
+
+from adaptive_batching import CONNECTION_ERROR, AIMDController
+
+
+def controller(**options):
+    settings = dict(min_batch_events=10, max_batch_events=100, min_batch_bytes=1000, max_batch_bytes=10000,
+                    min_concurrency=1, max_concurrency=4, target_latency=1.0, event_step=10, byte_step=1000,
+                    window=5, max_error_rate=0.2)
+    settings.update(options)
+    return AIMDController(**settings)
+
+
+def test_healthy_requests_grow_batches_up_to_the_limits():
+    aimd = controller()
+    aimd.record(0.1, 1000, 200)
+    assert aimd.limits() == (20, 2000)
+
+    for _ in range(50):
+        aimd.record(0.1, 1000, 200)
+    assert aimd.limits() == (100, 10000)
+
+
+def test_slow_requests_and_connection_errors_halve_batches_down_to_the_minimum():
+    aimd = controller(min_concurrency=1, max_concurrency=1)
+    for _ in range(9):
+        aimd.record(0.1, 1000, 200)
+    assert aimd.limits() == (100, 10000)
+
+    aimd.record(5.0, 10000, 200)
+    assert aimd.limits() == (50, 5000)
+    aimd.record(0.1, 1000, CONNECTION_ERROR)
+    assert aimd.limits() == (25, 2500)
+    for _ in range(5):
+        aimd.record(5.0, 1000, 200)
+    assert aimd.limits() == (10, 1000)
+
+
+def test_rejected_batch_shrinks_below_the_refused_size():
+    aimd = controller()
+    for _ in range(9):
+        aimd.record(0.1, 1000, 200)
+    concurrency = aimd.metrics()["concurrency"]
+
+    aimd.record(0.1, 8000, 413)
+    assert aimd.limits() == (50, 4000)
+    assert aimd.metrics()["concurrency"] == concurrency
+
+
+def test_concurrency_grows_after_a_healthy_window_up_to_the_maximum():
+    aimd = controller()
+    for _ in range(4):
+        aimd.record(0.1, 1000, 200)
+    assert aimd.metrics()["concurrency"] == 1
+    aimd.record(0.1, 1000, 200)
+    assert aimd.metrics()["concurrency"] == 2
+
+    for _ in range(100):
+        aimd.record(0.1, 1000, 200)
+    assert aimd.metrics()["concurrency"] == 4
+    assert aimd.metrics()["concurrency_increases_total"] == 3
+
+
+def test_errors_cut_concurrency_once_per_round_of_requests():
+    aimd = controller()
+    for _ in range(15):
+        aimd.record(0.1, 1000, 200)
+    assert aimd.metrics()["concurrency"] == 4
+
+    # One error in a window of five is within max_error_rate and cuts nothing
+    aimd.record(0.1, 1000, 503)
+    metrics = aimd.metrics()
+    assert (metrics["concurrency"], metrics["decreases_total"]) == (4, 0)
+
+    aimd.record(0.1, 1000, 503)
+    metrics = aimd.metrics()
+    assert (metrics["concurrency"], metrics["decreases_total"]) == (2, 1)
+
+    # The next cut waits until the two requests in flight have completed
+    aimd.record(0.1, 1000, 503)
+    assert aimd.metrics()["concurrency"] == 2
+    aimd.record(0.1, 1000, 503)
+    metrics = aimd.metrics()
+    assert (metrics["concurrency"], metrics["decreases_total"]) == (1, 2)
+
+    # Concurrency never drops below the minimum
+    for _ in range(10):
+        aimd.record(0.1, 1000, 503)
+    assert aimd.metrics()["concurrency"] == 1
+
+
+def test_acquire_waits_for_a_free_slot():
+    aimd = controller()
+    aimd.acquire()
+    acquired = threading.Event()
+
+    def second_request():
+        aimd.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=second_request, daemon=True)
+    thread.start()
+    assert not acquired.wait(0.1)
+    assert aimd.metrics()["active_requests"] == 1
+
+    aimd.release()
+    assert acquired.wait(5)
+    thread.join(5)
+    assert aimd.metrics()["active_requests"] == 1
@@ -0,0 +1,48 @@
+"""Tests for scripts/alert_records.py"""
+
+import pytest
+
+from alert_records import DEFAULT_DESCRIPTION, DEFAULT_SUMMARY, Alert, Incident
+
+
+@pytest.mark.parametrize("data, source_ip", [
+    ({"src_ip": "203.0.113.7", "source_ip": "198.51.100.9"}, "203.0.113.7"),
+    ({"source_ip": "198.51.100.9"}, "198.51.100.9"),
+    ({"src_ip": "", "source_ip": "198.51.100.9"}, "198.51.100.9"),
+    ({"src_ip": None, "source_ip": "198.51.100.9"}, "198.51.100.9"),
+    ({"src_ip": "", "source_ip": ""}, None),
+    ({}, None)
+])
+def test_source_ip_prefers_src_ip(data, source_ip):
+    assert Alert.from_dict(data).source_ip == source_ip
+
+
+@pytest.mark.parametrize("data, affected_user", [
+    ({"user": "alice", "affected_user": "bob"}, "alice"),
+    ({"affected_user": "bob"}, "bob"),
+    ({"user": "", "affected_user": "bob"}, "bob"),
+    ({"user": None}, None),
+    ({}, None)
+])
+def test_affected_user_prefers_user(data, affected_user):
+    assert Alert.from_dict(data).affected_user == affected_user
+
+
+def test_from_dict_fills_defaults_and_keeps_the_raw_alert():
+    data = {"summary": "", "host": "web-01", "search_name": "Brute Force", "dest_host": "db-01"}
+    alert = Alert.from_dict(data)
+
+    assert (alert.summary, alert.description) == (DEFAULT_SUMMARY, DEFAULT_DESCRIPTION)
+    assert (alert.host, alert.search_name) == ("web-01", "Brute Force")
+    assert alert.raw is data
+
+
+def test_incident_carries_the_normalized_fields():
+    alert = Alert.from_dict({"summary": "Brute force", "description": "Many failed logins",
+                             "source_ip": "203.0.113.7", "user": "alice"})
+    incident = Incident.from_alert(alert, "High", "T1110")
+
+    assert (incident.summary, incident.description, incident.severity, incident.mitre_technique) == (
+        "Brute force", "Many failed logins", "High", "T1110")
+    assert (incident.source_ip, incident.affected_user) == ("203.0.113.7", "alice")
+    assert incident.key is None and not incident.spooled and incident.enrichment is None
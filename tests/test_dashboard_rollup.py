@@ -0,0 +1,76 @@
+"""Tests for scripts/dashboard_rollup.py"""
+
+import random
+
+from dashboard_rollup import ALL, DIMENSIONS, IncidentRollup, to_epoch
+
+BASE = 1767225600.0  # 2026-01-01T00:00:00Z
+
+
+def incident(key, minute=0, severity="High", status="Open", technique="T1110", source_ip="203.0.113.7"):
+    return {"issue_key": key, "created_time": BASE + minute * 60 + 5, "severity": severity, "status": status,
+            "mitre_technique": technique, "source_ip": source_ip}
+
+
+def table(rollup):
+    return set(rollup.conn.execute("SELECT dimension, minute, value, count FROM rollup_counts"))
+
+
+def test_reapplying_an_incident_changes_nothing(tmp_path):
+    rollup = IncidentRollup(str(tmp_path / "rollup.db"))
+    first = [incident("SEC-1"), incident("SEC-2", severity="Low")]
+
+    assert rollup.apply(first) == 2
+    before = table(rollup)
+    assert rollup.apply(first) == 0
+    assert table(rollup) == before
+    assert rollup.counts("severity", BASE, BASE + 60) == [{"severity": "High", "count": 1},
+                                                          {"severity": "Low", "count": 1}]
+
+
+def test_updates_move_counts_instead_of_adding_them(tmp_path):
+    rollup = IncidentRollup(str(tmp_path / "rollup.db"))
+    rollup.apply([incident("SEC-1"), incident("SEC-2")])
+
+    assert rollup.apply([incident("SEC-1", status="Resolved"), incident("SEC-2", source_ip=None)]) == 2
+    assert rollup.counts("status", BASE, BASE + 60) == [{"status": "Open", "count": 1},
+                                                        {"status": "Resolved", "count": 1}]
+    assert rollup.counts("source_ip", BASE, BASE + 60) == [{"source_ip": "203.0.113.7", "count": 1}]
+
+    # A changed creation time moves every bucket to the new minute
+    rollup.apply([incident("SEC-1", minute=90, status="Resolved")])
+    assert rollup.timechart(BASE, BASE + 7200, span="1h") == [{"_time": BASE, "count": 1},
+                                                             {"_time": BASE + 3600, "count": 1}]
+    # Buckets that drop to zero are removed rather than kept at 0
+    assert not rollup.conn.execute("SELECT 1 FROM rollup_counts WHERE count <= 0").fetchall()
+
+
+def test_incidents_without_a_key_or_creation_time_are_skipped(tmp_path):
+    rollup = IncidentRollup(str(tmp_path / "rollup.db"))
+
+    assert rollup.apply([dict(incident("SEC-1"), issue_key=None),
+                         dict(incident("SEC-2"), created_time="not a date")]) == 0
+    assert table(rollup) == set()
+    assert to_epoch("2026-01-01T00:00:00.000+0000") == BASE
+
+
+def test_incremental_apply_matches_a_rollup_of_the_final_states(tmp_path):
+    rng = random.Random(7)
+    incremental = IncidentRollup(str(tmp_path / "incremental.db"))
+    final = {}
+    for _ in range(30):
+        batch = [incident(f"SEC-{rng.randint(1, 40)}", minute=rng.randint(0, 5),
+                          severity=rng.choice(["Critical", "High", "Low", None]),
+                          status=rng.choice(["Open", "In Progress", "Resolved"]),
+                          technique=rng.choice(["T1110", "T1003", ""]),
+                          source_ip=rng.choice(["203.0.113.7", "198.51.100.9", None]))
+                 for _ in range(10)]
+        incremental.apply(batch)
+        final.update((item["issue_key"], item) for item in batch)
+
+    rebuilt = IncidentRollup(str(tmp_path / "rebuilt.db"))
+    rebuilt.apply(final.values())
+    assert table(incremental) == table(rebuilt)
+    assert sum(row[3] for row in table(rebuilt) if row[0] == ALL) == len(final)
+    for dimension in DIMENSIONS:
+        assert incremental.counts(dimension, BASE, BASE + 3600) == rebuilt.counts(dimension, BASE, BASE + 3600)
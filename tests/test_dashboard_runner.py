@@ -0,0 +1,90 @@
+"""Tests for scripts/dashboard_runner.py"""
+
+import logging
+
+from dashboard_runner import SplunkSearchExecutor, plan_searches
+
+
+class StubResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class StubSession:
+    """Answers job creation and job status like the Splunk REST API"""
+
+    def __init__(self, event_count):
+        self.event_count = event_count
+        self.posted = []
+
+    def post(self, url, data=None, timeout=None):
+        self.posted.append(data)
+        return StubResponse({"sid": "1700000000.1"})
+
+    def get(self, url, params=None, timeout=None):
+        return StubResponse({"entry": [{"content": {"eventCount": self.event_count}}]})
+
+
+def test_shared_event_base_keeps_only_referenced_fields():
+    plans = plan_searches([
+        {"search": "index=jira_incidents | stats count by severity"},
+        {"search": 'index=jira_incidents status!="Resolved" | stats count by status'},
+        {"search": "index=jira_incidents | timechart span=1h count"}
+    ])
+
+    assert len(plans) == 1
+    assert plans[0].base == "index=jira_incidents | fields _time count severity status"
+
+
+def test_free_text_post_process_keeps_raw():
+    plans = plan_searches([
+        {"search": "index=a | stats count by x"},
+        {"search": "index=a error | stats count by y"}
+    ])
+
+    assert plans[0].base.endswith("| fields _raw _time count x y")
+
+
+def test_wildcard_post_process_keeps_every_field():
+    plans = plan_searches([
+        {"search": "index=a | stats count by x"},
+        {"search": "index=a | table *"}
+    ])
+
+    assert plans[0].base == "index=a"
+
+
+def test_aggregating_base_gets_no_field_list():
+    plans = plan_searches([
+        {"search": "index=a | stats count by x | sort -count"},
+        {"search": "index=a | stats count by x | head 5"}
+    ])
+
+    assert plans[0].base == "index=a | stats count by x"
+
+
+def test_base_search_sets_max_count_and_logs_truncation(caplog):
+    executor = SplunkSearchExecutor("https://splunk.example.com:8089", "token", max_results=1000)
+    executor.session = StubSession(event_count=2500)
+
+    with caplog.at_level(logging.WARNING):
+        executor.run_base("index=jira_incidents | fields _time severity", "-24h", "now")
+
+    assert executor.session.posted[0]["max_count"] == 1000
+    assert "truncated" in caplog.text
+
+
+def test_complete_base_search_logs_nothing(caplog):
+    executor = SplunkSearchExecutor("https://splunk.example.com:8089", "token", max_results=1000)
+    executor.session = StubSession(event_count=999)
+
+    with caplog.at_level(logging.WARNING):
+        executor.run_base("index=jira_incidents | fields _time severity", "-24h", "now")
+
+    assert caplog.text == ""
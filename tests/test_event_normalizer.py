@@ -0,0 +1,91 @@
+"""Tests for scripts/event_normalizer.py"""
+
+from collections import OrderedDict
+
+import pytest
+
+from event_normalizer import FieldNormalizer, compile_extractor
+
+FIELD_MAP = {
+    "src_ip": (("src_ip",), ("data", "srcip"), ("network", "source", "ip")),
+    "user": (("user",), ("data", "dstuser"), ("actor", "name")),
+    "action": (("action",),),
+    "allowed": (("outcome", "allowed"),),
+    "count": (("outcome", "count"), ("count",))
+}
+
+RECORDS = [
+    {},
+    {"src_ip": "10.0.0.1", "data": {"srcip": "10.0.0.2"}},
+    {"src_ip": None, "data": {"srcip": "10.0.0.2"}, "network": {"source": {"ip": "10.0.0.3"}}},
+    {"data": {"srcip": None}, "network": {"source": {"ip": "10.0.0.3"}}},
+    # Missing and non-dict intermediates
+    {"data": None, "network": {"source": None}, "actor": {}},
+    {"data": "10.0.0.2", "network": ["10.0.0.3"], "actor": 7, "outcome": True},
+    {"data": {"srcip": {"nested": 1}}, "network": {"source": "10.0.0.3"}},
+    {"data": OrderedDict(srcip="10.0.0.2"), "network": {"source": {"ip": "10.0.0.3"}}},
+    # Falsy values are kept and stop the search
+    {"src_ip": "", "data": {"srcip": "10.0.0.2"}, "user": "", "action": 0},
+    {"user": False, "actor": {"name": "alice"}, "outcome": {"allowed": False, "count": 0}, "count": 5},
+    {"outcome": {"count": None}, "count": 0},
+    {"actor": {"name": "alice"}, "data": {"dstuser": "bob"}, "unmapped": {"user": "eve"}}
+]
+
+
+def walk(record, field_map):
+    """Reference extraction: walk every candidate path through the record"""
+    fields = {}
+    for field, paths in field_map.items():
+        for path in paths:
+            value = record
+            for key in path:
+                # Only plain dicts are descended into, as in the generated code
+                value = value.get(key) if type(value) is dict else None
+            if value is not None:
+                fields[field] = value
+                break
+    return fields
+
+
+@pytest.mark.parametrize("record", RECORDS)
+def test_extractors_match_walking_the_mapping(record):
+    expected = walk(record, FIELD_MAP)
+
+    assert compile_extractor(FIELD_MAP)(record) == expected
+    assert compile_extractor(FIELD_MAP, tuple(record))(record) == expected
+    assert FieldNormalizer(FIELD_MAP).extract(record) == expected
+
+
+def test_falsy_values_are_extracted():
+    fields = compile_extractor(FIELD_MAP)(RECORDS[9])
+
+    assert fields == {"user": False, "allowed": False, "count": 0}
+    assert compile_extractor(FIELD_MAP)({"outcome": {"count": None}, "count": 0})["count"] == 0
+
+
+def test_first_matching_path_wins():
+    record = {"src_ip": "10.0.0.1", "data": {"srcip": "10.0.0.2"}, "network": {"source": {"ip": "10.0.0.3"}}}
+
+    assert compile_extractor(FIELD_MAP)(record)["src_ip"] == "10.0.0.1"
+    del record["src_ip"]
+    assert compile_extractor(FIELD_MAP, tuple(record))(record)["src_ip"] == "10.0.0.2"
+
+
+def test_shape_leaves_out_paths_of_absent_keys():
+    extractor = compile_extractor(FIELD_MAP, ("actor",))
+
+    # Keys outside the shape are not read even if the record has them
+    assert extractor({"actor": {"name": "alice"}, "user": "bob"}) == {"user": "alice"}
+    assert compile_extractor(FIELD_MAP, ("unmapped",))({"unmapped": 1}) == {}
+
+
+def test_shapes_past_max_shapes_use_the_generic_extractor():
+    normalizer = FieldNormalizer(FIELD_MAP, max_shapes=2)
+    records = [{"src_ip": "10.0.0.1"}, {"user": "alice"}, {"action": "login", "user": "bob"},
+               {"data": {"srcip": "10.0.0.2"}, "count": 3}]
+
+    for record in records + records:
+        assert normalizer.extract(record) == walk(record, FIELD_MAP)
+
+    assert normalizer.metrics() == {"shapes": 2, "hits": 2, "misses": 6}
+    assert normalizer._extractor_for(tuple(records[3])) is normalizer.generic
@@ -0,0 +1,83 @@
+"""Tests for scripts/forwarder_buffer.py"""
+
+import os
+import threading
+
+from forwarder_buffer import SEGMENT_SUFFIX, SpillQueue
+
+
+def batch(seq, size=100):
+    return (bytes([seq % 256]) * size, "wazuh", {"offset": seq * size}, seq)
+
+
+def drain(queue):
+    batches = []
+    while True:
+        item = queue.get(block=False)
+        if item is None:
+            return batches
+        batches.append(item)
+
+
+def segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX))
+
+
+def test_order_is_kept_across_spill_and_restore(tmp_path):
+    queue = SpillQueue(str(tmp_path), max_memory_bytes=300, segment_bytes=400)
+    for seq in range(10):
+        queue.put(batch(seq))
+    metrics = queue.metrics()
+    assert metrics["memory_batches"] == 3
+    assert metrics["disk_batches"] == 7
+    assert len(segments(tmp_path)) > 1
+
+    # Memory frees up while batches are still on disk; new batches must
+    # queue behind them rather than jump ahead in memory
+    assert [item[3] for item in (queue.get(), queue.get())] == [0, 1]
+    queue.put(batch(10))
+    assert queue.metrics()["disk_batches"] == 8
+
+    restored = drain(queue)
+    assert [item[3] for item in restored] == list(range(2, 11))
+    assert restored[5] == batch(7)
+    assert len(segments(tmp_path)) == 1
+    queue.cleanup()
+    assert segments(tmp_path) == []
+
+
+def test_put_blocks_while_memory_and_disk_are_full(tmp_path):
+    queue = SpillQueue(str(tmp_path), max_memory_bytes=100, max_disk_bytes=400)
+    queue.put(batch(0))
+    queue.put(batch(1))
+    queue.put(batch(2))
+
+    writer = threading.Thread(target=queue.put, args=(batch(3),), daemon=True)
+    writer.start()
+    writer.join(timeout=0.2)
+    assert writer.is_alive()
+
+    assert queue.get()[3] == 0
+    assert queue.get()[3] == 1
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+    assert [item[3] for item in drain(queue)] == [2, 3]
+    assert queue.metrics()["blocked_seconds"] > 0
+
+
+def test_get_returns_none_once_closed_and_drained(tmp_path):
+    queue = SpillQueue(str(tmp_path))
+    queue.put(batch(0))
+    queue.close()
+
+    assert queue.get()[3] == 0
+    assert queue.get() is None
+
+
+def test_leftover_segments_are_discarded_on_start(tmp_path):
+    stale = tmp_path / ("segment-000000000007" + SEGMENT_SUFFIX)
+    stale.write_bytes(b"left over from a previous run")
+
+    queue = SpillQueue(str(tmp_path))
+    assert not stale.exists()
+    assert queue.get(block=False) is None
@@ -0,0 +1,54 @@
+"""Tests for scripts/forwarder_checkpoint.py"""
+
+from forwarder_checkpoint import CheckpointStore, CheckpointTracker
+
+
+def position(offset):
+    return {"cursor": None, "offset": offset, "last_event_id": f"event-{offset}"}
+
+
+def committed_offset(store):
+    checkpoint = store.get("wazuh")
+    return checkpoint["offset"] if checkpoint else None
+
+
+def test_out_of_order_batches_commit_in_order(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"))
+    tracker = CheckpointTracker(store, "wazuh")
+    seqs = [tracker.register() for _ in range(3)]
+
+    tracker.complete(seqs[2], position(300), True)
+    tracker.complete(seqs[1], position(200), True)
+    assert committed_offset(store) is None
+
+    tracker.complete(seqs[0], position(100), True)
+    assert committed_offset(store) == 300
+
+
+def test_failed_batch_holds_the_checkpoint_back(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"))
+    tracker = CheckpointTracker(store, "wazuh")
+    seqs = [tracker.register() for _ in range(3)]
+
+    tracker.complete(seqs[0], position(100), True)
+    tracker.complete(seqs[1], position(200), False)
+    tracker.complete(seqs[2], position(300), True)
+
+    assert committed_offset(store) == 100
+
+
+def test_committed_position_survives_a_restart(tmp_path):
+    path = str(tmp_path / "checkpoints.json")
+    tracker = CheckpointTracker(CheckpointStore(path), "wazuh")
+    tracker.complete(tracker.register(), position(100), True)
+
+    reloaded = CheckpointStore(path).get("wazuh")
+    assert reloaded["offset"] == 100
+    assert reloaded["last_event_id"] == "event-100"
+
+
+def test_unreadable_checkpoint_file_starts_fresh(tmp_path):
+    path = tmp_path / "checkpoints.json"
+    path.write_text("{not json")
+
+    assert CheckpointStore(str(path)).get("wazuh") is None
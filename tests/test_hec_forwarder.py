@@ -0,0 +1,78 @@
+"""Tests for scripts/hec_forwarder.py"""
+
+import json
+
+import pytest
+
+from fake_hec_server import FakeHECServer
+from hec_forwarder import HECSender
+
+
+@pytest.fixture
+def start_server():
+    started = []
+
+    def start(**options):
+        server = FakeHECServer(("127.0.0.1", 0), **options)
+        server.start()
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.shutdown()
+        server.server_close()
+
+
+def batch(count):
+    events = [{"event": {"seq": seq, "message": "x" * 40}, "sourcetype": "_json"} for seq in range(count)]
+    return events, b"\n".join(json.dumps(event).encode("utf-8") for event in events)
+
+
+def test_oversized_batch_is_split_until_hec_accepts_it(start_server):
+    events, payload = batch(8)
+    server = start_server(max_content_length=len(payload) // 3)
+    sender = HECSender(server.url, "test-token", max_retries=0)
+
+    assert sender.send(payload)
+    assert server.events == events
+    # 8 events -> 4 batches of 2 accepted
+    assert server.requests == 4
+
+
+def test_single_event_over_the_limit_is_rejected(start_server):
+    _events, payload = batch(2)
+    server = start_server(max_content_length=len(payload) // 3)
+    sender = HECSender(server.url, "test-token", max_retries=0)
+
+    assert not sender.send(payload)
+    assert server.events == []
+
+
+def test_send_waits_for_the_indexer_ack(start_server):
+    events, payload = batch(3)
+    server = start_server(use_ack=True, ack_polls=2)
+    sender = HECSender(server.url, "test-token", max_retries=0)
+
+    assert sender.send(payload)
+    assert server.events == events
+    assert server.ack_queries == {0: 3}
+
+
+def test_send_fails_when_the_ack_never_arrives(start_server):
+    _events, payload = batch(3)
+    server = start_server(use_ack=True, ack_polls=1000)
+    sender = HECSender(server.url, "test-token", max_retries=0, ack_timeout=0.5)
+
+    assert not sender.send(payload)
+    assert server.ack_queries[0] >= 2
+
+
+def test_split_batches_each_wait_for_their_ack(start_server):
+    events, payload = batch(4)
+    server = start_server(use_ack=True, ack_polls=1, max_content_length=len(payload) * 2 // 3)
+    sender = HECSender(server.url, "test-token", max_retries=0)
+
+    assert sender.send(payload)
+    assert server.events == events
+    assert server.ack_queries == {0: 2, 1: 2}
@@ -0,0 +1,96 @@
+"""Tests for scripts/incident_dispatcher.py"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from alert_records import Incident
+from incident_dispatcher import IncidentDispatcher
+
+SEVERITIES = ["Critical", "High", "Medium", "Low"]
+
+
+class StubJira:
+    """Records created incidents in order, after a short delay"""
+
+    def __init__(self, delay=0.001):
+        self.delay = delay
+        self.created = []
+        self._lock = threading.Lock()
+
+    def create_incident(self, incident, comment=None):
+        time.sleep(self.delay)
+        with self._lock:
+            self.created.append(incident)
+            incident.key = f"SEC-{len(self.created)}"
+        return incident.key
+
+
+def incidents(count):
+    return [Incident(f"alert {number}", "test", severity=SEVERITIES[number % len(SEVERITIES)])
+            for number in range(count)]
+
+
+@pytest.mark.parametrize("workers", [4, 5, 8])
+def test_close_with_queued_incidents_stops_every_worker(workers):
+    jira = StubJira()
+    dispatcher = IncidentDispatcher(jira, workers=workers)
+    futures = [dispatcher.submit(incident) for incident in incidents(120)]
+
+    closer = threading.Thread(target=dispatcher.close, daemon=True)
+    closer.start()
+    closer.join(timeout=10)
+
+    assert not closer.is_alive(), "close() did not return"
+    assert not any(thread.is_alive() for thread in dispatcher._threads)
+    assert all(future.done() and future.result() for future in futures)
+    assert len(jira.created) == 120
+
+
+def test_context_manager_drains_queue():
+    jira = StubJira(delay=0)
+    with IncidentDispatcher(jira, workers=4) as dispatcher:
+        for incident in incidents(40):
+            dispatcher.submit(incident)
+    assert dispatcher.stats()["created"] == 40
+    with pytest.raises(RuntimeError):
+        dispatcher.submit(incidents(1)[0])
+
+
+def test_critical_goes_before_queued_low():
+    jira = StubJira(delay=0.01)
+    dispatcher = IncidentDispatcher(jira, workers=2, reservations={}, aging=30.0)
+    for number in range(10):
+        dispatcher.submit(Incident(f"low {number}", "test", severity="Low"))
+    dispatcher.submit(Incident("critical", "test", severity="Critical"))
+    dispatcher.close()
+
+    # Two Low incidents may already be running when the Critical one arrives
+    assert [incident.summary for incident in jira.created].index("critical") <= 2
+
+
+def test_reservations_must_leave_a_shared_worker():
+    with pytest.raises(ValueError):
+        IncidentDispatcher(StubJira(), workers=3, reservations={"Critical": 2, "High": 1})
+
+
+def test_cancelled_incidents_are_not_counted_as_failed():
+    jira = StubJira(delay=0.05)
+    dispatcher = IncidentDispatcher(jira, workers=2, reservations={})
+    futures = [dispatcher.submit(incident) for incident in incidents(10)]
+    assert all(future.cancel() for future in futures[5:])
+    dispatcher.close()
+
+    stats = dispatcher.stats()
+    assert (stats["created"], stats["failed"], stats["cancelled"]) == (5, 0, 5)
+    assert len(jira.created) == 5
+
+
+def test_importing_the_dispatcher_does_not_load_the_jira_client():
+    script = "import sys, incident_dispatcher; sys.exit('jira_integration' in sys.modules)"
+    env = dict(os.environ, PYTHONPATH=os.path.join(os.path.dirname(__file__), "..", "scripts"))
+    assert subprocess.run([sys.executable, "-c", script], env=env).returncode == 0
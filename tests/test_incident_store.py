@@ -0,0 +1,85 @@
+"""Tests for scripts/incident_store.py"""
+
+import time
+
+import pytest
+
+from fake_jira_server import FakeJiraServer, jira_timestamp
+from incident_store import IncidentStore
+from jira_integration import JiraIntegration
+
+
+class ChangingJira(JiraIntegration):
+    """Calls change(server, page) after each search page"""
+
+    def __init__(self, server, change=None):
+        super().__init__(server.url, "test", "test-token", "SEC")
+        self.server = server
+        self.change = change
+        self.pages = []
+
+    def search_issues(self, jql, start_at=0, max_results=100, fields=None, validate_query=None):
+        page = super().search_issues(jql, start_at, max_results, fields, validate_query)
+        self.pages.append((jql, start_at, max_results))
+        if self.change:
+            with self.server.lock:
+                self.change(self.server, start_at, page)
+        return page
+
+
+def touch_once(key):
+    """Update `key` once, right after the first page"""
+    def change(server, start_at, page):
+        if not getattr(server, "touched", False):
+            server.touched = True
+            server.touch(key)
+    return change
+
+
+@pytest.fixture
+def server():
+    server = FakeJiraServer(("127.0.0.1", 0))
+    server.start()
+    base = time.time() - 600
+    for index in range(6):
+        reference, _errors = server.create_issue({"project": {"key": "SEC"}, "summary": f"Alert {index}",
+                                                  "issuetype": {"name": "Security Incident"}})
+        server.issues[reference["key"]]["fields"]["updated"] = jira_timestamp(base + index * 10)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_mirrors_every_issue(server, tmp_path):
+    store = IncidentStore(str(tmp_path / "incidents.db"))
+    synced = store.sync(ChangingJira(server), page_size=2)
+
+    assert sorted(incident["issue_key"] for incident in synced) == [f"SEC-{n}" for n in range(1, 7)]
+    assert store.cursor() == pytest.approx(time.time() - 550, abs=5)
+
+
+def test_issue_updated_mid_sync_does_not_hide_the_next_page(server, tmp_path):
+    store = IncidentStore(str(tmp_path / "incidents.db"))
+    # SEC-1 moves to the end after the first page, shifting SEC-3 to offset 1
+    store.sync(ChangingJira(server, touch_once("SEC-1")), page_size=2)
+
+    assert all(store.get(f"SEC-{n}") is not None for n in range(1, 7))
+    assert store.get("SEC-1")["updated_time"] > store.get("SEC-6")["updated_time"]
+
+
+
+def test_sync_gives_up_after_max_passes(server, tmp_path):
+    store = IncidentStore(str(tmp_path / "incidents.db"))
+    store.sync(ChangingJira(server), page_size=2)
+
+    def touch_first_of_pass(server, start_at, page):
+        # Automation keeps updating whichever issue each pass reads first
+        if start_at == 0 and page["issues"]:
+            server.touch(page["issues"][0]["key"])
+
+    jira = ChangingJira(server, touch_first_of_pass)
+    store.sync(jira, page_size=2, max_passes=3)
+
+    assert sum(1 for _jql, start_at, _size in jira.pages if start_at == 0) == 3
+    # The cursor goes back to where a fourth pass would have started
+    assert store.cursor() < max(incident["updated_time"] for incident in store.iter_incidents())
@@ -0,0 +1,85 @@
+"""Tests for scripts/incident_templates.py"""
+
+import re
+
+import pytest
+
+from incident_templates import DEFAULT_TEMPLATE, SEVERITIES, IncidentTemplates
+
+DETECTION_TIME = "2026-01-02 03:04:05 UTC"
+
+# The default template in the other syntaxes
+TEMPLATE_SOURCES = {
+    "template": DEFAULT_TEMPLATE,
+    "format": re.sub(r"\$(\w+)", r"{\1}", DEFAULT_TEMPLATE),
+    "jinja": re.sub(r"\$(\w+)", r"{{ \1 }}", DEFAULT_TEMPLATE)
+}
+
+DETAILS = [
+    {},
+    {"mitre_technique": "T1110"},
+    {"source_ip": "203.0.113.7", "affected_user": "alice"},
+    {"mitre_technique": "T1003", "source_ip": "2001:db8::1", "affected_user": "svc_backup"}
+]
+
+
+def baseline_description(description, severity, mitre_technique=None, source_ip=None, affected_user=None):
+    """Description as create_security_incident built it before templates"""
+    full_description = f"""
+{description}
+
+**Security Details:**
+- Severity: {severity}
+- Detection Time: {DETECTION_TIME}
+"""
+
+    if mitre_technique:
+        full_description += f"- MITRE ATT&CK Technique: {mitre_technique}\n"
+    if source_ip:
+        full_description += f"- Source IP: {source_ip}\n"
+    if affected_user:
+        full_description += f"- Affected User: {affected_user}\n"
+
+    full_description += f"""
+**Response Actions Required:**
+- [ ] Investigate the incident
+- [ ] Determine root cause
+- [ ] Implement remediation
+- [ ] Update detection rules if needed
+- [ ] Document lessons learned
+
+**Automated Response:**
+This ticket was automatically created by the SOC monitoring system.
+"""
+    return full_description
+
+
+def fixed_templates(syntax):
+    if syntax == "jinja":
+        pytest.importorskip("jinja2")
+    templates = IncidentTemplates({"*": TEMPLATE_SOURCES[syntax]}, syntax=syntax)
+    templates.clock.now = lambda: DETECTION_TIME
+    return templates
+
+
+@pytest.mark.parametrize("syntax", sorted(TEMPLATE_SOURCES))
+@pytest.mark.parametrize("severity", SEVERITIES + ("Informational", "50% $1 {x}"))
+def test_default_template_matches_the_baseline_description(syntax, severity):
+    templates = fixed_templates(syntax)
+
+    for details in DETAILS:
+        description = "Multiple failed logins (100%) from $HOST {ssh}"
+        assert templates.render(description, severity, **details) == baseline_description(description, severity,
+                                                                                           **details)
+
+
+def test_unknown_severities_share_one_compiled_template():
+    templates = fixed_templates("template")
+    for number in range(100):
+        templates.render("Port scan", f"Severity {number}")
+    for severity in SEVERITIES:
+        templates.render("Port scan", severity)
+
+    assert sorted(templates._compiled, key=str) == sorted(
+        [("Security Incident", severity) for severity in SEVERITIES] + [("Security Incident", None)], key=str)
+    assert "- Severity: Severity 7\n" in templates.render("Port scan", "Severity 7")
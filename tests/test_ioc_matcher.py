@@ -0,0 +1,127 @@
+"""Tests for scripts/ioc_matcher.py"""
+
+import json
+import os
+
+import pytest
+
+from ioc_matcher import IOCFeeds, IOCIndex, build_snapshot, fingerprint, load_feed
+
+SHA256 = "a" * 64
+
+CSV_FEED = """# indicator,type,severity,description
+indicator,type,severity,description
+203.0.113.7,ip,Critical,C2 server
+evil.example.com,,,Phishing domain
+2001:DB8::1,ip,Low,Scanner
+""" + SHA256.upper() + """,hash,High,Dropper
+not an indicator,,,
+"""
+
+STIX_BUNDLE = {
+    "type": "bundle",
+    "objects": [
+        {"type": "indicator", "name": "Tor exit", "x_soc_severity": "Medium",
+         "pattern": "[ipv4-addr:value = '198.51.100.9'] OR [url:value = 'https://bad.example.net/login']"},
+        {"type": "indicator", "name": "Expired", "valid_until": "2000-01-01T00:00:00Z",
+         "pattern": "[ipv4-addr:value = '198.51.100.10']"},
+        {"type": "indicator", "name": "Revoked", "revoked": True,
+         "pattern": "[domain-name:value = 'revoked.example.org']"},
+        {"type": "malware", "name": "Not an indicator"}
+    ]
+}
+
+
+def write_feeds(directory):
+    (directory / "feed.csv").write_text(CSV_FEED)
+    (directory / "stix.json").write_text(json.dumps(STIX_BUNDLE))
+
+
+def test_snapshot_round_trip(tmp_path):
+    write_feeds(tmp_path)
+    indicators = load_feed(str(tmp_path / "feed.csv")) + load_feed(str(tmp_path / "stix.json"))
+    snapshot_path = tmp_path / "ioc.snapshot"
+    snapshot_path.write_bytes(build_snapshot(indicators))
+
+    index = IOCIndex.open(str(snapshot_path))
+    assert len(index) == 6
+    assert index.lookup("203.0.113.7")["severity"] == "Critical"
+    assert index.lookup("2001:db8:0:0::1")["description"] == "Scanner"
+    assert index.lookup(SHA256)["type"] == "hash"
+    assert index.lookup("198.51.100.9")["feed"] == "stix.json"
+    assert index.lookup("evil.example.com")["severity"] == "High"
+    # A listed domain covers its subdomains and URLs on it
+    assert index.lookup("mail.evil.example.com")["value"] == "evil.example.com"
+    assert index.lookup("https://bad.example.net/other")["value"] == "bad.example.net"
+    assert index.lookup("example.com") is None
+    assert index.lookup("198.51.100.10") is None
+    assert index.lookup("revoked.example.org") is None
+
+
+def test_duplicates_keep_the_highest_severity():
+    index = IOCIndex(build_snapshot([
+        {"type": "ip", "value": "192.0.2.1", "severity": "Low", "feed": "a.csv", "description": ""},
+        {"type": "ip", "value": "192.0.2.1", "severity": "Critical", "feed": "b.csv", "description": ""}
+    ]))
+
+    assert len(index) == 1
+    assert index.lookup("192.0.2.1")["severity"] == "Critical"
+
+
+def test_bloom_filter_rejects_absent_indicators():
+    listed = [{"type": "ip", "value": f"10.1.{n // 256}.{n % 256}", "severity": "High", "feed": "a.csv",
+               "description": ""} for n in range(1000)]
+    index = IOCIndex(build_snapshot(listed, error_rate=0.001))
+
+    assert all(index.bloom.might_contain(*fingerprint("ip", indicator["value"])) for indicator in listed)
+    false_positives = sum(index.bloom.might_contain(*fingerprint("ip", f"10.2.{n // 256}.{n % 256}"))
+                          for n in range(10000))
+    assert false_positives < 50
+
+
+def test_match_alert_reads_indicator_fields(tmp_path):
+    write_feeds(tmp_path)
+    index = IOCIndex(build_snapshot(load_feed(str(tmp_path / "feed.csv"))))
+
+    matches = index.match_alert({"src_ip": "203.0.113.7", "dest_host": "www.evil.example.com", "user": "alice"})
+    assert sorted(match["field"] for match in matches) == ["dest_host", "src_ip"]
+
+
+def test_feeds_reload_only_when_changed(tmp_path):
+    write_feeds(tmp_path)
+    feeds = IOCFeeds([str(tmp_path)])
+    assert feeds.reload()
+    assert len(feeds.index) == 6
+    assert not feeds.reload()
+
+    with open(tmp_path / "feed.csv", "a") as handle:
+        handle.write("192.0.2.55,ip,Medium,New scanner\n")
+    assert feeds.reload()
+    assert feeds.index.lookup("192.0.2.55")["severity"] == "Medium"
+    assert feeds.index.lookup("198.51.100.9") is not None
+
+    os.remove(tmp_path / "stix.json")
+    assert feeds.reload()
+    assert feeds.index.lookup("198.51.100.9") is None
+    assert len(feeds.index) == 5
+
+
+def test_unparseable_feed_keeps_its_previous_indicators(tmp_path):
+    write_feeds(tmp_path)
+    feeds = IOCFeeds([str(tmp_path)])
+    feeds.reload()
+
+    (tmp_path / "stix.json").write_text("{truncated")
+    feeds.reload()
+    assert feeds.index.lookup("198.51.100.9") is not None
+
+
+def test_truncated_snapshot_is_rejected_when_opened(tmp_path):
+    write_feeds(tmp_path)
+    snapshot = build_snapshot(load_feed(str(tmp_path / "feed.csv")))
+    path = tmp_path / "ioc.snapshot"
+
+    for length in (1, 27, 28, 40, 101, len(snapshot) - 1):
+        path.write_bytes(snapshot[:length])
+        with pytest.raises(ValueError):
+            IOCIndex.open(str(path))
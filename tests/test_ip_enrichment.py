@@ -0,0 +1,207 @@
+"""Tests for scripts/ip_enrichment.py"""
+
+import ipaddress
+import os
+import struct
+
+import pytest
+
+from alert_records import Incident
+from ip_enrichment import GEOIP_DB_ENV, METADATA_MARKER, IPEnricher, MMDBReader, enrichment_fields
+
+LONG_ORGANIZATION = "Example Autonomous System Organization, Inc."
+
+# Unsigned integer type -> MaxMind DB type number
+UINT_TYPES = {"uint16": 5, "uint32": 6, "uint64": 9}
+
+
+def encode(value, pointers=None):
+    """Encode a value in the MaxMind DB data section format"""
+    pointers = pointers or {}
+    if isinstance(value, tuple):
+        # (unsigned type, number); libmaxminddb checks the metadata types
+        kind, number = UINT_TYPES[value[0]], value[1]
+        data = number.to_bytes((number.bit_length() + 7) // 8, "big")
+        return (bytes([len(data), kind - 7]) if kind > 7 else bytes([(kind << 5) | len(data)])) + data
+    if isinstance(value, str) and value in pointers:
+        return bytes([0x20 | (pointers[value] >> 8), pointers[value] & 0xFF])
+    if isinstance(value, bool):
+        return bytes([int(value), 14 - 7])
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+        if len(data) >= 29:
+            return bytes([(2 << 5) | 29, len(data) - 29]) + data
+        return bytes([(2 << 5) | len(data)]) + data
+    if isinstance(value, float):
+        return bytes([(3 << 5) | 8]) + struct.pack(">d", value)
+    if isinstance(value, int):
+        data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+        if value >= 1 << 32:
+            return bytes([len(data), 9 - 7]) + data
+        return bytes([(6 << 5) | len(data)]) + data
+    if isinstance(value, list):
+        return bytes([len(value), 11 - 7]) + b"".join(encode(item, pointers) for item in value)
+    return bytes([(7 << 5) | len(value)]) + b"".join(
+        encode(key, pointers) + encode(item, pointers) for key, item in value.items())
+
+
+def write_mmdb(path, networks, record_size=24, ip_version=6, drop_metadata=()):
+    """Write a MaxMind DB with one record per network, optionally without some metadata keys"""
+    # "en" is stored once up front and referenced through pointers
+    data = encode("en")
+    pointers = {"en": 0}
+    offsets = []
+    for _network, record in networks:
+        offsets.append(len(data))
+        data += encode(record, pointers)
+
+    nodes = [[None, None]]
+    for (network, _record), offset in zip(networks, offsets):
+        network = ipaddress.ip_network(network)
+        depth = 128 if ip_version == 6 else 32
+        prefix = network.prefixlen + (96 if network.version == 4 and ip_version == 6 else 0)
+        bits = int(network.network_address)
+        node = 0
+        for position in range(prefix):
+            bit = (bits >> (depth - 1 - position)) & 1
+            if position == prefix - 1:
+                nodes[node][bit] = ("data", offset)
+            else:
+                if nodes[node][bit] is None:
+                    nodes.append([None, None])
+                    nodes[node][bit] = ("node", len(nodes) - 1)
+                node = nodes[node][bit][1]
+
+    node_count = len(nodes)
+
+    def record_value(record):
+        if record is None:
+            return node_count
+        kind, value = record
+        return value if kind == "node" else node_count + 16 + value
+
+    tree = b""
+    for left, right in nodes:
+        left, right = record_value(left), record_value(right)
+        if record_size == 28:
+            middle = ((left >> 24) << 4) | (right >> 24)
+            tree += (left & 0xFFFFFF).to_bytes(3, "big") + bytes([middle]) + (right & 0xFFFFFF).to_bytes(3, "big")
+        else:
+            tree += left.to_bytes(record_size // 8, "big") + right.to_bytes(record_size // 8, "big")
+
+    metadata = {"binary_format_major_version": ("uint16", 2), "binary_format_minor_version": ("uint16", 0),
+                "build_epoch": ("uint64", 1700000000), "database_type": "Test-City",
+                "description": {"en": "Test database"}, "ip_version": ("uint16", ip_version),
+                "languages": ["en"], "node_count": ("uint32", node_count), "record_size": ("uint16", record_size)}
+    for key in drop_metadata:
+        del metadata[key]
+    with open(path, "wb") as handle:
+        handle.write(tree + b"\0" * 16 + data + METADATA_MARKER + encode(metadata))
+
+
+def city(iso_code, country, name, latitude, longitude):
+    return {"city": {"names": {"en": name}}, "country": {"iso_code": iso_code, "names": {"en": country}},
+            "location": {"latitude": latitude, "longitude": longitude}}
+
+
+NETWORKS = [
+    ("8.8.8.0/24", city("US", "United States", "Mountain View", 37.386, -122.0838)),
+    ("81.2.69.128/26", city("GB", "United Kingdom", "London", 51.5142, -0.0931)),
+    ("2001:db8::/32", city("DE", "Germany", "Berlin", 52.52, 13.4)),
+    ("198.51.100.0/24", {"autonomous_system_number": 64500, "autonomous_system_organization": LONG_ORGANIZATION,
+                         "anycast": True, "counts": [1, 70000, 1 << 40]})
+]
+
+
+@pytest.mark.parametrize("record_size", [24, 28, 32])
+def test_reader_decodes_records(tmp_path, record_size):
+    path = str(tmp_path / f"city{record_size}.mmdb")
+    write_mmdb(path, NETWORKS, record_size)
+    reader = MMDBReader(path)
+    try:
+        assert reader.metadata["database_type"] == "Test-City"
+        assert reader.metadata["description"] == {"en": "Test database"}
+        assert reader.get("8.8.8.8") == NETWORKS[0][1]
+        assert reader.get("81.2.69.160")["city"]["names"]["en"] == "London"
+        assert reader.get("2001:db8:1234::1")["country"]["iso_code"] == "DE"
+        assert reader.get("198.51.100.20") == NETWORKS[3][1]
+        assert reader.get("81.2.69.100") is None
+        assert reader.get("2001:db9::1") is None
+    finally:
+        reader.close()
+
+
+def test_reader_handles_ipv4_only_databases(tmp_path):
+    path = str(tmp_path / "ipv4.mmdb")
+    write_mmdb(path, NETWORKS[:2], ip_version=4)
+    reader = MMDBReader(path)
+    try:
+        assert reader.get("8.8.8.8")["country"]["iso_code"] == "US"
+        assert reader.get("2001:db8::1") is None
+    finally:
+        reader.close()
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / "not.mmdb"
+    path.write_bytes(b"\0" * 64)
+
+    with pytest.raises(ValueError):
+        MMDBReader(str(path))
+
+
+@pytest.mark.parametrize("key", ["node_count", "record_size", "ip_version"])
+def test_reader_rejects_incomplete_metadata(tmp_path, key):
+    path = str(tmp_path / "incomplete.mmdb")
+    write_mmdb(path, NETWORKS, drop_metadata=[key])
+
+    with pytest.raises(ValueError, match=key):
+        MMDBReader(path)
+
+
+def test_reader_rejects_truncated_metadata(tmp_path):
+    path = tmp_path / "truncated.mmdb"
+    write_mmdb(str(path), NETWORKS)
+    path.write_bytes(path.read_bytes()[:-40])
+
+    with pytest.raises(ValueError):
+        MMDBReader(str(path))
+
+
+def test_csv_database_needs_a_network_column(tmp_path):
+    path = tmp_path / "asn.csv"
+    path.write_text("cidr,asn\n8.8.8.0/24,15169\n")
+
+    with pytest.raises(ValueError):
+        IPEnricher([str(path)])
+
+
+def test_from_env_without_paths_is_none(monkeypatch):
+    monkeypatch.setenv(GEOIP_DB_ENV, os.pathsep)
+    assert IPEnricher.from_env() is None
+
+
+def test_enrichment_fields_flatten_geoip_and_asn_records():
+    assert enrichment_fields(NETWORKS[0][1]) == {"country_code": "US", "country": "United States",
+                                                 "city": "Mountain View", "latitude": 37.386,
+                                                 "longitude": -122.0838}
+    assert enrichment_fields(NETWORKS[3][1]) == {"asn": 64500, "as_org": LONG_ORGANIZATION}
+    assert enrichment_fields({"asn": "AS13335", "latitude": "n/a"}) == {"asn": 13335}
+
+
+def test_enricher_merges_databases_into_the_incident(tmp_path):
+    city_path = str(tmp_path / "city.mmdb")
+    asn_path = tmp_path / "asn.csv"
+    write_mmdb(city_path, NETWORKS[:3])
+    asn_path.write_text("network,autonomous_system_number,autonomous_system_organization\n"
+                        "8.8.8.0/24,15169,Google LLC\n")
+    enricher = IPEnricher([city_path, str(asn_path)])
+    try:
+        incident = Incident("Brute force", "Many failed logins", source_ip="8.8.8.8")
+        fields = enricher.enrich_incident(incident)
+        assert incident.enrichment == fields
+        assert fields["city"] == "Mountain View"
+        assert fields["asn"] == 15169
+        assert fields["as_org"] == "Google LLC"
+    finally:
+        enricher.close()
@@ -0,0 +1,107 @@
+"""Tests for scripts/jira_breaker.py"""
+
+import pytest
+import requests
+
+import jira_breaker
+from fake_jira_server import FakeJiraServer
+from jira_breaker import CLOSED, HALF_OPEN, OPEN, BreakerAdapter, CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1700000000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(jira_breaker.time, "time", clock)
+    return clock
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.status()["state"] == CLOSED
+
+    breaker.record_failure()
+    assert breaker.status()["state"] == OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_probes_close_the_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0, probe_successes=2)
+    breaker.record_failure()
+
+    clock.now += 31
+    assert breaker.allow()
+    assert breaker.status()["state"] == HALF_OPEN
+    # One probe at a time
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.status() == CircuitBreaker.initial_state()
+
+
+def test_failed_probe_opens_the_circuit_again(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    clock.now += 31
+    assert breaker.allow()
+
+    breaker.record_failure()
+    status = breaker.status()
+    assert status["state"] == OPEN
+    assert status["opened_at"] == clock.now
+    assert not breaker.allow()
+
+
+def test_abandoned_probe_lets_another_caller_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0, probe_timeout=15.0)
+    breaker.record_failure()
+    clock.now += 31
+    assert breaker.allow()
+
+    clock.now += 16
+    assert breaker.allow()
+
+
+def test_state_file_is_shared(clock, tmp_path):
+    state_path = str(tmp_path / "breaker.json")
+    first = CircuitBreaker(state_path, failure_threshold=2)
+    second = CircuitBreaker(state_path, failure_threshold=2)
+
+    first.record_failure()
+    second.record_failure()
+
+    assert first.status()["state"] == OPEN
+    assert not second.allow()
+
+
+def test_rate_limited_responses_count_as_failures():
+    server = FakeJiraServer(("127.0.0.1", 0), rate_limit_rate=1.0)
+    server.start()
+    try:
+        breaker = CircuitBreaker(failure_threshold=2)
+        session = requests.Session()
+        session.auth = ("test", "test-token")
+        session.mount("http://", BreakerAdapter(breaker))
+
+        for _ in range(2):
+            assert session.get(f"{server.url}/rest/api/2/myself").status_code == 429
+        assert breaker.status()["state"] == OPEN
+        with pytest.raises(CircuitOpenError):
+            session.get(f"{server.url}/rest/api/2/myself")
+    finally:
+        server.shutdown()
+        server.server_close()
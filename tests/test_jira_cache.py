@@ -0,0 +1,76 @@
+"""Tests for scripts/jira_cache.py and its use in get_incident_details"""
+
+import threading
+
+import pytest
+
+from fake_jira_server import FakeJiraServer
+from jira_cache import IssueCache
+from jira_integration import JiraIntegration
+
+
+@pytest.fixture
+def server():
+    server = FakeJiraServer(("127.0.0.1", 0))
+    server.start()
+    server.create_issue({"project": {"key": "SEC"}, "summary": "Brute force",
+                         "issuetype": {"name": "Security Incident"}})
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def jira_without_validators(server, cache):
+    """Client for a Jira that sends no ETag or Last-Modified"""
+    def drop_validators(response, *args, **kwargs):
+        response.headers.pop("ETag", None)
+
+    jira = JiraIntegration(server.url, "test", "test-token", "SEC", cache=cache)
+    jira.session.hooks["response"].append(drop_validators)
+    return jira
+
+
+def test_projected_fields_revalidate_by_updated_timestamp(server):
+    cache = IssueCache(fresh_ttl=0.0)
+    jira = jira_without_validators(server, cache)
+
+    first = jira.get_incident_details("SEC-1", fields=["status"])
+    assert first.status == "Open"
+    assert first.updated is not None
+
+    assert jira.get_incident_details("SEC-1", fields=["status"]) is first
+    assert cache.metrics() == {"entries": 1, "hits": 0, "revalidated": 1, "misses": 1}
+
+    with server.lock:
+        server.touch("SEC-1")
+    assert jira.get_incident_details("SEC-1", fields=["status"]) is not first
+    assert cache.metrics()["misses"] == 2
+
+
+def test_fresh_entries_are_served_without_a_request(server):
+    cache = IssueCache(fresh_ttl=60.0)
+    jira = JiraIntegration(server.url, "test", "test-token", "SEC", cache=cache)
+    jira.get_incident_details("SEC-1")
+    requests_before = server.requests
+
+    jira.get_incident_details("SEC-1")
+    assert server.requests == requests_before
+    assert cache.metrics()["hits"] == 1
+
+
+def test_counters_are_exact_under_concurrency():
+    cache = IssueCache()
+
+    def count():
+        for _ in range(5000):
+            cache.record_hit()
+            cache.record_miss()
+
+    threads = [threading.Thread(target=count) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.metrics()["hits"] == 40000
+    assert cache.metrics()["misses"] == 40000
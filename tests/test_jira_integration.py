@@ -0,0 +1,107 @@
+"""Tests for scripts/jira_integration.py against the Jira stand-in"""
+
+import threading
+import time
+
+import pytest
+
+from fake_jira_server import FakeJiraServer
+from jira_integration import JiraIntegration
+
+ISSUES = 25
+
+
+@pytest.fixture
+def server():
+    server = FakeJiraServer(("127.0.0.1", 0))
+    server.start()
+    for number in range(ISSUES):
+        server.create_issue({"project": {"key": "SEC"}, "summary": f"Port scan #{number}",
+                             "issuetype": {"name": "Security Incident"}})
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def jira(server):
+    return JiraIntegration(server.url, "test", "test-token", "SEC")
+
+
+def prefetch_workers():
+    return [thread for thread in threading.enumerate() if thread.name.startswith("ThreadPoolExecutor")]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_iter_incidents_walks_every_page(jira):
+    keys = [issue["key"] for issue in jira.iter_incidents("project = SEC ORDER BY created ASC", ["summary"], 10)]
+
+    assert keys == [f"SEC-{number}" for number in range(1, ISSUES + 1)]
+
+
+def test_stopping_early_shuts_down_the_prefetch_worker(server, jira):
+    server.latency = 0.05
+    before = prefetch_workers()
+    incidents = jira.iter_incidents("project = SEC", ["summary"], 10)
+
+    next(incidents)
+    assert len(prefetch_workers()) == len(before) + 1
+    incidents.close()
+
+    assert wait_for(lambda: prefetch_workers() == before)
+    # The prefetched page is cancelled or finishes; nothing after it is requested
+    time.sleep(0.2)
+    assert server.requests <= 2
+
+
+def test_failed_page_ends_the_walk(server, jira):
+    search_issues = jira.search_issues
+
+    def fail_third_page(jql, start_at=0, *args, **kwargs):
+        if start_at >= 20:
+            server.unavailable = True
+        return search_issues(jql, start_at, *args, **kwargs)
+
+    jira.search_issues = fail_third_page
+    issues = list(jira.iter_incidents("project = SEC ORDER BY created ASC", ["summary"], 10))
+
+    assert [issue["key"] for issue in issues] == [f"SEC-{number}" for number in range(1, 21)]
+    assert wait_for(lambda: not prefetch_workers())
+
+
+def test_bulk_update_reports_each_key(server, jira):
+    with server.lock:
+        server.issues["SEC-2"]["fields"]["status"] = {"name": "Resolved"}
+        server.touch("SEC-2")
+    server.latency = 0.02
+
+    results = jira.update_incidents_status_bulk(["SEC-1", "SEC-2", "SEC-3", "SEC-404"], "Resolved",
+                                                comment="Closed by bulk update")
+
+    for key in ("SEC-1", "SEC-3"):
+        assert results[key]["success"]
+        assert results[key]["from"] == "Open"
+        assert results[key]["error"] is None
+        assert results[key]["seconds"] >= 0.02
+        assert server.issues[key]["fields"]["status"]["name"] == "Resolved"
+        assert server.issues[key]["fields"]["comment"]["total"] == 1
+    assert results["SEC-2"] == {"success": True, "from": "Resolved", "seconds": 0.0, "error": None}
+    assert server.issues["SEC-2"]["fields"]["comment"]["total"] == 0
+    assert results["SEC-404"] == {"success": False, "from": None, "seconds": 0.0, "error": "Issue not found"}
+
+
+def test_bulk_update_without_a_valid_transition_changes_nothing(server, jira):
+    results = jira.update_incidents_status_bulk(["SEC-1", "SEC-2"], "Escalated")
+
+    for key in ("SEC-1", "SEC-2"):
+        assert results[key] == {"success": False, "from": "Open", "seconds": 0.0,
+                                "error": "Status 'Escalated' not found in available transitions"}
+        assert server.issues[key]["fields"]["status"]["name"] == "Open"
+    # One state lookup and one transitions request for the (Open, Security Incident) group
+    assert server.requests == 2
@@ -0,0 +1,74 @@
+"""Tests for scripts/jira_metrics.py"""
+
+import multiprocessing
+
+import pytest
+
+from fake_jira_server import FakeJiraServer
+from incident_spool import IncidentSpool
+from jira_integration import JiraIntegration
+from jira_metrics import JiraMetrics, parse_samples, render_samples
+
+ENDPOINT = (("method", "GET"), ("endpoint", "/rest/api/2/issue/{key}"))
+
+
+@pytest.fixture
+def server():
+    server = FakeJiraServer(("127.0.0.1", 0))
+    server.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_label_values_are_escaped_and_read_back(tmp_path):
+    labels = (("endpoint", 'C:\\logs\\"quoted"\nnext} line, {x}'), ("method", "GET"))
+    path = tmp_path / "jira.prom"
+    path.write_text(render_samples({("jira_requests_total", labels): 3}))
+
+    assert len(path.read_text().splitlines()) == 3
+    assert 'endpoint="C:\\\\logs\\\\\\"quoted\\"\\nnext} line, {x}"' in path.read_text()
+    assert parse_samples(str(path)) == {("jira_requests_total", labels): 3.0}
+
+
+def write_requests(path, requests, writes):
+    metrics = JiraMetrics()
+    for _ in range(writes):
+        for _ in range(requests):
+            metrics.observe("GET", "https://jira.example.com/rest/api/2/issue/SEC-1", 200, 0.2, received=100)
+        metrics.write_textfile(path)
+
+
+def test_textfiles_from_several_processes_are_summed(tmp_path):
+    path = str(tmp_path / "jira.prom")
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=write_requests, args=(path, 25, 4)) for _ in range(6)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+    samples = parse_samples(path)
+    assert samples[("jira_requests_total", ENDPOINT + (("status", "200"),))] == 600
+    assert ("jira_request_duration_seconds_bucket", ENDPOINT + (("le", "0.1"),)) not in samples
+    assert samples[("jira_request_duration_seconds_bucket", ENDPOINT + (("le", "0.25"),))] == 600
+    assert samples[("jira_request_duration_seconds_count", ENDPOINT)] == 600
+    assert samples[("jira_response_bytes_received_total", ENDPOINT)] == 60000
+    assert samples[("jira_request_duration_seconds_sum", ENDPOINT)] == pytest.approx(120.0)
+
+
+def test_spool_replays_are_counted_by_outcome(server, tmp_path):
+    metrics = JiraMetrics()
+    spool = IncidentSpool(str(tmp_path / "jira_incidents.jsonl"))
+    jira = JiraIntegration(server.url, "test", "test-token", "SEC", metrics=metrics, spool=spool)
+    spool.append({"fields": {"project": {"key": "SEC"}, "summary": "Brute force",
+                             "issuetype": {"name": "Security Incident"}}})
+    spool.append({"fields": {"project": {"key": "SEC"}}})
+
+    assert jira.replay_spool() == {"created": 1, "rejected": 1, "remaining": 0}
+    path = str(tmp_path / "jira.prom")
+    metrics.write_textfile(path)
+    samples = parse_samples(path)
+    assert samples[("jira_spool_replays_total", (("outcome", "created"),))] == 1
+    assert samples[("jira_spool_replays_total", (("outcome", "rejected"),))] == 1
@@ -0,0 +1,77 @@
+"""Tests for scripts/json_codec.py"""
+
+import importlib
+import sys
+
+import pytest
+
+import json_codec
+from json_codec import BACKENDS, load_codec, select_codec
+
+DOCUMENT = {"key": "SEC-1", "labels": ["soc-automated"], "count": 3, "score": 0.5, "open": True,
+            "description": "café – \U0001F512", "resolution": None}
+
+
+def installed_backends():
+    backends = []
+    for name in BACKENDS:
+        try:
+            load_codec(name)
+        except ImportError:
+            continue
+        backends.append(name)
+    return backends
+
+
+@pytest.fixture
+def without_fast_backends(monkeypatch):
+    # A None entry makes the import raise ImportError
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    monkeypatch.delenv("SOC_JSON_BACKEND", raising=False)
+
+
+def test_falls_back_to_stdlib_json_without_orjson_and_msgspec(without_fast_backends):
+    assert select_codec().name == "json"
+    with pytest.raises(ImportError):
+        load_codec("orjson")
+
+
+@pytest.mark.parametrize("preferred", ["orjson", "msgspec"])
+def test_missing_preferred_backend_falls_back_to_stdlib_json(without_fast_backends, monkeypatch, preferred):
+    assert select_codec(preferred).name == "json"
+    monkeypatch.setenv("SOC_JSON_BACKEND", preferred)
+    assert select_codec().name == "json"
+
+
+def test_module_shortcuts_use_the_fallback(without_fast_backends, monkeypatch):
+    try:
+        reloaded = importlib.reload(json_codec)
+        assert reloaded.BACKEND == "json"
+        assert reloaded.loads(reloaded.dumps(DOCUMENT)) == DOCUMENT
+    finally:
+        # Put the real backends back before restoring the module
+        monkeypatch.undo()
+        importlib.reload(json_codec)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        load_codec("simdjson")
+
+
+@pytest.mark.parametrize("name", installed_backends())
+def test_backends_agree(name):
+    codec = load_codec(name)
+    reference = load_codec("json")
+
+    encoded = codec.dumps(DOCUMENT)
+    assert isinstance(encoded, bytes)
+    assert codec.dumps({"a": [1, 2], "b": {"c": None}}) == b'{"a":[1,2],"b":{"c":null}}'
+    assert reference.loads(encoded) == DOCUMENT
+    assert codec.loads(encoded.decode("utf-8")) == DOCUMENT
+    assert codec.loads(reference.dumps(DOCUMENT)) == DOCUMENT
+    assert reference.loads(codec.dumps_pretty(DOCUMENT)) == DOCUMENT
+    assert "\n  " in codec.dumps_pretty(DOCUMENT)
+    with pytest.raises(ValueError):
+        codec.loads(b'{"truncated": ')
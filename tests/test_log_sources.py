@@ -0,0 +1,136 @@
+"""Tests for scripts/log_sources.py"""
+
+import gzip
+import json
+
+from log_sources import AzureActivityFileSource, CloudTrailFileSource, GCPAuditFileSource, iter_records
+
+RECORDS = [{"insertId": f"id{seq}", "timestamp": f"2026-01-01T00:00:{seq:02d}Z"} for seq in range(10)]
+
+
+def write_ndjson(path, records):
+    with gzip.open(path, "wb") as handle:
+        for record in records:
+            handle.write(json.dumps(record).encode("utf-8") + b"\n")
+
+
+def test_ndjson_is_decoded_a_line_at_a_time(tmp_path, monkeypatch):
+    path = str(tmp_path / "audit.json.gz")
+    write_ndjson(path, RECORDS)
+
+    def read_whole(*args):
+        raise AssertionError("newline-delimited files must not be read whole")
+
+    monkeypatch.setattr(gzip.GzipFile, "read", read_whole)
+
+    records = iter_records(path, None)
+    assert next(records) == RECORDS[0]
+    assert list(records) == RECORDS[1:]
+
+
+def test_document_exports_are_unwrapped(tmp_path):
+    one_line = tmp_path / "one_line.json"
+    one_line.write_text(json.dumps({"Records": RECORDS[:3]}))
+    indented = tmp_path / "indented.json"
+    indented.write_text(json.dumps({"Records": RECORDS[:3]}, indent=2))
+    single = tmp_path / "single.json"
+    single.write_text(json.dumps(RECORDS[0]) + "\n")
+
+    assert list(iter_records(str(one_line), "Records")) == RECORDS[:3]
+    assert list(iter_records(str(indented), "Records")) == RECORDS[:3]
+    assert list(iter_records(str(single), "Records")) == RECORDS[:1]
+    assert list(iter_records(str(tmp_path / "one_line.json"), None)) == [{"Records": RECORDS[:3]}]
+
+
+def test_read_from_resumes_after_the_last_delivered_event(tmp_path):
+    path = str(tmp_path / "audit.json.gz")
+    write_ndjson(path, RECORDS)
+    source = GCPAuditFileSource(str(tmp_path))
+
+    resumed = list(source.read_from({"cursor": path, "offset": 4, "last_event_id": "id3"}))
+    assert [record for _position, record in resumed] == RECORDS[4:]
+    assert resumed[0][0] == {"cursor": path, "offset": 5, "last_event_id": "id4"}
+
+
+def test_read_from_finds_the_last_event_in_a_changed_file(tmp_path):
+    path = str(tmp_path / "audit.json.gz")
+    write_ndjson(path, RECORDS)
+    source = GCPAuditFileSource(str(tmp_path))
+
+    # Offset past the event (records were removed before it) and before it
+    for offset in (8, 2):
+        resumed = list(source.read_from({"cursor": path, "offset": offset, "last_event_id": "id3"}))
+        assert [record for _position, record in resumed] == RECORDS[4:]
+        assert resumed[0][0]["offset"] == 5
+
+    # An unknown event rereads the whole file
+    resumed = list(source.read_from({"cursor": path, "offset": 4, "last_event_id": "gone"}))
+    assert [record for _position, record in resumed] == RECORDS
+
+
+def test_read_from_skips_files_before_the_cursor(tmp_path):
+    first, second = str(tmp_path / "1.json"), str(tmp_path / "2.json")
+    with open(first, "w") as handle:
+        json.dump({"Records": [{"eventID": "a"}, {"eventID": "b"}]}, handle)
+    with open(second, "w") as handle:
+        json.dump({"Records": [{"eventID": "c"}]}, handle)
+    source = CloudTrailFileSource(str(tmp_path))
+
+    resumed = list(source.read_from({"cursor": first, "offset": 1, "last_event_id": "a"}))
+    assert [record["eventID"] for _position, record in resumed] == ["b", "c"]
+
+
+AZURE_SIGN_IN = {
+    "time": "2026-01-01T00:00:00Z", "operationName": "Sign-in activity", "category": "SignInLogs",
+    "resultType": "50126", "callerIpAddress": "203.0.113.7", "location": "westeurope",
+    "identity": {"claims": {"http://schemas.xmlsoap.org/ws/2005/05/identity/claims/upn": "alice@example.com",
+                            "name": "Alice"}},
+    "caller": "alice-object-id", "properties": {"eventDataId": "azure-1"}
+}
+
+GCP_SIGN_IN = {
+    "insertId": "gcp-1", "timestamp": "2026-01-01T00:00:00Z",
+    "protoPayload": {"methodName": "google.login.LoginService.loginFailure", "serviceName": "login.googleapis.com",
+                     "authenticationInfo": {"principalEmail": "bob@example.com"},
+                     "requestMetadata": {"callerIp": "198.51.100.9"}},
+    "resource": {"type": "audited_resource", "labels": {"zone": "us-central1-a"}}
+}
+
+
+def test_azure_records_map_onto_the_common_fields():
+    source = AzureActivityFileSource("unused")
+
+    assert source.normalize(AZURE_SIGN_IN) == {
+        "cloud": "azure", "event_type": "authentication_failure", "action": "Sign-in activity",
+        "outcome": "failure", "user": "alice@example.com", "src_ip": "203.0.113.7", "service": "SignInLogs",
+        "region": "westeurope"}
+    assert source.event_id(AZURE_SIGN_IN) == "azure-1"
+
+    # Without a UPN claim the name claim, then the caller, is the user
+    activity = {"operationName": "Microsoft.Compute/virtualMachines/delete", "resultType": "Success",
+                "caller": "ops@example.com", "identity": {"claims": {}}, "correlationId": "corr-1"}
+    fields = source.normalize(activity)
+    assert (fields["user"], fields["outcome"], fields["event_type"]) == (
+        "ops@example.com", "success", "Microsoft.Compute/virtualMachines/delete")
+    assert "src_ip" not in fields
+    assert source.event_id(activity) == "corr-1"
+    assert source.normalize(dict(AZURE_SIGN_IN, resultType="0"))["event_type"] == "authentication_success"
+    assert source.outcome({"resultType": "Failed"}) == "failure"
+
+
+def test_gcp_records_map_onto_the_common_fields():
+    source = GCPAuditFileSource("unused")
+
+    assert source.normalize(GCP_SIGN_IN) == {
+        "cloud": "gcp", "event_type": "authentication_failure", "action": "google.login.LoginService.loginFailure",
+        "outcome": "failure", "user": "bob@example.com", "src_ip": "198.51.100.9",
+        "service": "login.googleapis.com", "region": "us-central1-a"}
+
+    # location and region labels win over the zone; a status code is a failure
+    denied = {"protoPayload": {"methodName": "storage.objects.get", "status": {"code": 7}},
+              "resource": {"labels": {"location": "europe-west1", "zone": "europe-west1-b"}}}
+    fields = source.normalize(denied)
+    assert (fields["region"], fields["outcome"], fields["event_type"]) == (
+        "europe-west1", "failure", "storage.objects.get")
+    assert "user" not in fields
+    assert source.outcome({"protoPayload": {"status": {"code": 0}}}) == "success"
@@ -4,28 +4,35 @@ Wazuh Active Response Script for Jira Integration
 Creates Jira tickets when Wazuh detects security threats
 """
 
-import argparse
 import sys
 import os
-import logging
-from datetime import datetime
 
-# Add the scripts directory to Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'scripts'))
+# Wazuh starts a fresh interpreter per response, so argparse, logging,
+# requests and the Jira client are imported only where they are needed
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'scripts')
 
-try:
-    from jira_integration import JiraIntegration
-except ImportError:
-    print("Error: Could not import JiraIntegration. Make sure jira_integration.py is in the scripts directory.")
-    sys.exit(1)
+def load_jira_integration():
+    """Import JiraIntegration from the bundle or the scripts directory"""
+    # Inside the zipapp bundle (__file__ is archive.pyz/__main__.py) the
+    # module is already on sys.path[0]; from source, append the scripts
+    # directory so it is searched last
+    if not os.path.isfile(os.path.dirname(__file__)) and SCRIPTS_DIR not in sys.path:
+        sys.path.append(SCRIPTS_DIR)
+    try:
+        from jira_integration import JiraIntegration
+    except ImportError:
+        print("Error: Could not import JiraIntegration. Make sure jira_integration.py is in the scripts directory.")
+        sys.exit(1)
+    return JiraIntegration
 
 def setup_logging():
     """Setup logging for the Wazuh active response"""
+    import logging
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler('/var/ossec/logs/jira_active_response.log'),
+            logging.FileHandler(os.getenv("JIRA_ACTIVE_RESPONSE_LOG", '/var/ossec/logs/jira_active_response.log')),
             logging.StreamHandler()
         ]
     )
@@ -33,6 +40,7 @@ def setup_logging():
 
 def parse_arguments():
     """Parse command line arguments"""
+    import argparse
     parser = argparse.ArgumentParser(description='Create Jira ticket from Wazuh alert')
     
     parser.add_argument('--jira-url', required=True, help='Jira instance URL')
@@ -50,20 +58,44 @@ def parse_arguments():
 
 def main():
     """Main function"""
-    logger = setup_logging()
     args = parse_arguments()
+    logger = setup_logging()
+    JiraIntegration = load_jira_integration()
+    try:
+        from alert_records import Incident
+    except ImportError:
+        print("Error: Could not import alert_records. Make sure alert_records.py is in the scripts directory.")
+        sys.exit(1)
+    metrics_file = os.getenv("JIRA_METRICS_TEXTFILE")
+    metrics = None
+    if metrics_file:
+        from jira_metrics import JiraMetrics
+        metrics = JiraMetrics()
     
     try:
+        # Shared circuit breaker and local spool, so responses fail fast and
+        # incidents are kept while Jira is down
+        breaker = None
+        spool = None
+        if os.getenv("JIRA_BREAKER_STATE"):
+            from jira_breaker import CircuitBreaker
+            breaker = CircuitBreaker(os.getenv("JIRA_BREAKER_STATE"))
+        if os.getenv("JIRA_SPOOL"):
+            from incident_spool import IncidentSpool
+            spool = IncidentSpool(os.getenv("JIRA_SPOOL"))
+        
         # Initialize Jira integration
         jira = JiraIntegration(
             args.jira_url,
             args.username,
             args.api_token,
-            args.project_key
+            args.project_key,
+            metrics=metrics,
+            breaker=breaker,
+            spool=spool
         )
         
-        # Create Jira ticket
-        issue_key = jira.create_security_incident(
+        incident = Incident(
             summary=args.summary,
             description=args.description,
             severity=args.severity,
@@ -72,28 +104,58 @@ def main():
             affected_user=args.affected_user
         )
         
-        if issue_key:
-            logger.info(f"Successfully created Jira ticket: {issue_key}")
-            
-            # Add Wazuh context as comment
-            context_comment = f"""
+        # Threat-intel match of the source IP raises the severity
+        ioc_matches = []
+        if incident.source_ip and os.getenv("SOC_IOC_DB"):
+            try:
+                from ioc_matcher import IOCIndex, highest_severity
+                ioc_matches = IOCIndex.open(os.getenv("SOC_IOC_DB")).match_alert({"src_ip": incident.source_ip})
+                incident.severity = highest_severity(incident.severity, ioc_matches)
+            except Exception as e:
+                # Matching only adds context; a bad snapshot must not cost the ticket
+                logger.warning(f"IOC matching failed, continuing without matches: {str(e)}")
+
+        # GeoIP/ASN context for the source IP, from local databases
+        if incident.source_ip and os.getenv("SOC_GEOIP_DB"):
+            try:
+                from ip_enrichment import IPEnricher
+                enricher = IPEnricher.from_env()
+                if enricher:
+                    enricher.enrich_incident(incident)
+            except Exception as e:
+                # Enrichment only adds context; a bad database must not cost the ticket
+                logger.warning(f"IP enrichment failed, continuing without it: {str(e)}")
+        
+        # Wazuh context, added as a comment once the ticket exists
+        from datetime import datetime
+        context_comment = f"""
 **Wazuh Alert Context:**
 - Alert Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
 - Alert Source: Wazuh Endpoint Detection
-- Severity: {args.severity}
+- Severity: {incident.severity}
 """
-            
-            if args.mitre_technique:
-                context_comment += f"- MITRE ATT&CK Technique: {args.mitre_technique}\n"
-            if args.source_ip:
-                context_comment += f"- Source IP: {args.source_ip}\n"
-            if args.affected_user:
-                context_comment += f"- Affected User: {args.affected_user}\n"
-            
-            jira.add_comment(issue_key, context_comment)
-            
+        
+        if incident.mitre_technique:
+            context_comment += f"- MITRE ATT&CK Technique: {incident.mitre_technique}\n"
+        if incident.source_ip:
+            context_comment += f"- Source IP: {incident.source_ip}\n"
+        if incident.affected_user:
+            context_comment += f"- Affected User: {incident.affected_user}\n"
+        if ioc_matches:
+            from ioc_matcher import describe_matches
+            context_comment += describe_matches(ioc_matches)
+        
+        # Create Jira ticket
+        issue_key = jira.create_incident(incident, context_comment)
+        
+        if issue_key:
+            logger.info(f"Successfully created Jira ticket: {issue_key}")
             print(f"Jira ticket created: {issue_key}")
             sys.exit(0)
+        elif incident.spooled:
+            logger.warning("Jira unavailable, incident spooled for replay")
+            print("Jira unavailable, incident spooled for replay")
+            sys.exit(1)
         else:
             logger.error("Failed to create Jira ticket")
             print("Failed to create Jira ticket")
@@ -103,6 +165,9 @@ def main():
         logger.error(f"Error creating Jira ticket: {str(e)}")
         print(f"Error: {str(e)}")
         sys.exit(1)
+    finally:
+        if metrics:
+            metrics.write_textfile(metrics_file)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file